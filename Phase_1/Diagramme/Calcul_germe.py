@@ -1,14 +1,138 @@
+import numpy as np
+
+from .IndexSpatial import INDEX
+from .Mesures import Mesures
+
+# En dessous de ce nombre de requêtes, l'index spatial est plus rapide que
+# le passage par NumPy.
+SEUIL_INDEX = 16
+# Une tuile est subdivisée tant qu'elle garde plus de CANDIDATS_MAX germes
+# candidats et plus de TRAVAIL_MIN distances à calculer.
+CANDIDATS_MAX = 32
+TRAVAIL_MIN = 1 << 15
+
+
 class CalculerGerme:
-    def __init__(self, points):
+    # index=None : pas d'index spatial (ni sa conversion des germes en tuples),
+    # toutes les requêtes passent par le calcul par tuiles NumPy
+    def __init__(self, points, index="kdtree", taille_tuile=64, max_elements=1 << 22, mesures=None):
+        if index is not None and index not in INDEX:
+            raise ValueError(f"Index inconnu : {index} (choix : {', '.join(INDEX)})")
+        self.mesures = mesures if mesures is not None else Mesures()
         self.points = points
+        self.index = None
+        if index is not None:
+            with self.mesures.chrono("index"):
+                self.index = INDEX[index](points)
+        self.germes = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.taille_tuile = taille_tuile
+        # Nombre maximal de distances (tuile x germes candidats) en mémoire à la fois
+        self.max_elements = max_elements
+
+    def plus_proche(self, coin_x, coin_y) :
+        return int(self.plus_proches((coin_x,), (coin_y,))[0])
+
+    def plus_proches(self, xs, ys):
+        """Indice du germe le plus proche de chaque point (xs[k], ys[k])."""
+        xs = np.asarray(xs, dtype=np.float64).ravel()
+        ys = np.asarray(ys, dtype=np.float64).ravel()
+        res = np.zeros(len(xs), dtype=np.int32)
+        self.mesures.compter("requetes_plus_proche", len(xs))
+        if self.index is not None and len(xs) <= SEUIL_INDEX:
+            for k in range(len(xs)):
+                res[k] = self.index.plus_proche(float(xs[k]), float(ys[k]))
+            return res
+        bloc = self.taille_tuile * self.taille_tuile
+        for debut in range(0, len(xs), bloc):
+            fin = debut + bloc
+            res[debut:fin] = self._etiqueter_tuile(xs[debut:fin], ys[debut:fin])
+        return res
+
+    def etiqueter_grille(self, xmin, xmax, ymin, ymax, N):
+        """Étiquettes des N x N coins de la grille de Visualisation.
+
+        labels[j, i] est le germe le plus proche du coin
+        (xmin + longueur * i, ymin + hauteur * j) : les lignes suivent y.
+        """
+        longueur = (xmax - xmin) / N
+        hauteur = (ymax - ymin) / N
+        xs = xmin + longueur * np.arange(N, dtype=np.float64)
+        ys = ymin + hauteur * np.arange(N, dtype=np.float64)
+        return self.etiqueter_lignes(xs, ys)
+
+    def etiqueter_lignes(self, xs, ys, sortie=None):
+        """Étiquette le produit cartésien ys x xs (sortie[j, i] pour (xs[i], ys[j]))."""
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        if sortie is None:
+            sortie = np.empty((len(ys), len(xs)), dtype=np.int32)
+        with self.mesures.chrono("etiquetage"):
+            if len(self.germes) == 0:
+                sortie[...] = 0
+            elif len(xs) and len(ys):
+                self._etiqueter_bloc(xs, ys, sortie, np.arange(len(self.germes)))
+        self.mesures.compter("cases_etiquetees", sortie.size)
+        return sortie
+
+    def _etiqueter_bloc(self, xs, ys, sortie, candidats):
+        # Subdivision récursive du bloc : chaque moitié n'élague que parmi les
+        # candidats de son parent, jusqu'à obtenir peu de candidats par tuile.
+        candidats = self._elaguer(xs.min(), xs.max(), ys.min(), ys.max(), candidats)
+        pixels = len(xs) * len(ys)
+        # Un pixel seul ne se divise plus, même s'il garde beaucoup de
+        # candidats (germes confondus ou équidistants)
+        if pixels > self.taille_tuile**2 or (pixels > 1 and len(candidats) > CANDIDATS_MAX
+                                             and len(candidats) * pixels > TRAVAIL_MIN):
+            if len(xs) >= len(ys):
+                m = len(xs) // 2
+                self._etiqueter_bloc(xs[:m], ys, sortie[:, :m], candidats)
+                self._etiqueter_bloc(xs[m:], ys, sortie[:, m:], candidats)
+            else:
+                m = len(ys) // 2
+                self._etiqueter_bloc(xs, ys[:m], sortie[:m], candidats)
+                self._etiqueter_bloc(xs, ys[m:], sortie[m:], candidats)
+            return
+        self.mesures.compter("tuiles")
+        self.mesures.compter("distances_calculees", pixels * len(candidats))
+        sortie[...] = self._plus_proches_parmi(xs[np.newaxis, :], ys[:, np.newaxis], candidats)
+
+    def _etiqueter_tuile(self, qx, qy):
+        forme = np.broadcast_shapes(qx.shape, qy.shape)
+        if len(self.germes) == 0:
+            return np.zeros(forme, dtype=np.int32)
+        candidats = self._elaguer(qx.min(), qx.max(), qy.min(), qy.max(), np.arange(len(self.germes)))
+        return self._plus_proches_parmi(qx, qy, candidats)
+
+    def _elaguer(self, x_bas, x_haut, y_bas, y_haut, candidats):
+        # Un germe n'est candidat que si sa distance minimale à la boîte
+        # ne dépasse pas la plus petite distance maximale à cette boîte.
+        gx = self.germes[candidats, 0]
+        gy = self.germes[candidats, 1]
+        dx_min = np.maximum(np.maximum(x_bas - gx, gx - x_haut), 0)
+        dy_min = np.maximum(np.maximum(y_bas - gy, gy - y_haut), 0)
+        dx_max = np.maximum(np.abs(gx - x_bas), np.abs(gx - x_haut))
+        dy_max = np.maximum(np.abs(gy - y_bas), np.abs(gy - y_haut))
+        borne = (dx_max**2 + dy_max**2).min()
+        return candidats[dx_min**2 + dy_min**2 <= borne * (1 + 1e-9)]
 
-    def plus_proche(self, coin_x, coin_y) : 
-        res = 0
-        nb_PPP = len(self.points)
-        for i in range(nb_PPP) : 
-            xres = self.points[res][0]
-            yres = self.points[res][1]
-            xi = self.points[i][0]
-            yi = self.points[i][1]
-            if((coin_x-xres)**2+(coin_y-yres)**2>(coin_x-xi)**2+(coin_y-yi)**2) : res = i
-        return res
\ No newline at end of file
+    def _plus_proches_parmi(self, qx, qy, candidats):
+        # Les candidats sont parcourus par indices croissants et seule une
+        # distance strictement plus petite remplace la meilleure : à égalité,
+        # le premier germe l'emporte comme dans le parcours linéaire.
+        forme = np.broadcast_shapes(qx.shape, qy.shape)
+        gx, gy = self.germes[:, 0], self.germes[:, 1]
+        qx = qx[..., np.newaxis]
+        qy = qy[..., np.newaxis]
+        pixels = int(np.prod(forme))
+        pas = max(1, self.max_elements // max(1, pixels))
+        meilleur = np.zeros(forme, dtype=np.int32)
+        d_meilleur = np.full(forme, np.inf)
+        for k in range(0, len(candidats), pas):
+            sel = candidats[k:k + pas]
+            d = (qx - gx[sel])**2 + (qy - gy[sel])**2
+            arg = d.argmin(axis=-1)
+            d_min = np.take_along_axis(d, arg[..., np.newaxis], axis=-1)[..., 0]
+            mieux = d_min < d_meilleur
+            meilleur[mieux] = sel[arg[mieux]]
+            d_meilleur[mieux] = d_min[mieux]
+        return meilleur
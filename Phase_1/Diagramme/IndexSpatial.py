@@ -0,0 +1,180 @@
+from math import ceil, inf, sqrt
+
+# Les index comparent les distances au carré exactement comme le parcours
+# linéaire d'origine ((x-xi)**2+(y-yi)**2) et départagent les égalités par
+# le plus petit indice : le résultat est identique à celui de la boucle.
+
+
+def en_tuples(points):
+    # Un tableau NumPy est converti d'un bloc : l'accès élément par élément
+    # renverrait des scalaires NumPy, bien plus lents que des float.
+    if hasattr(points, "tolist"):
+        points = points.tolist()
+    return [(p[0], p[1]) for p in points]
+
+
+class ParcoursLineaire:
+    def __init__(self, points):
+        self.points = en_tuples(points)
+
+    def plus_proche(self, x, y):
+        res = 0
+        d_res = inf
+        for i, (xi, yi) in enumerate(self.points):
+            d = (x-xi)**2+(y-yi)**2
+            if d < d_res:
+                res, d_res = i, d
+        return res
+
+    def deux_plus_proches(self, x, y):
+        # (indice du plus proche, distance au carré, distance au carré du second)
+        res, d1, d2 = 0, inf, inf
+        for i, (xi, yi) in enumerate(self.points):
+            d = (x-xi)**2+(y-yi)**2
+            if d < d1:
+                res, d1, d2 = i, d, d1
+            elif d < d2:
+                d2 = d
+        return res, d1, d2
+
+
+class ArbreKD:
+    # Arbre stocké à plat : noeuds[k] = (indice du germe, axe, fils gauche, fils droit)
+    def __init__(self, points):
+        self.points = en_tuples(points)
+        self.noeuds = []
+        self.racine = self._construire(list(range(len(self.points))), 0)
+
+    def _construire(self, indices, profondeur):
+        if not indices:
+            return -1
+        axe = profondeur % 2
+        indices.sort(key=lambda i: (self.points[i][axe], i))
+        milieu = len(indices) // 2
+        k = len(self.noeuds)
+        self.noeuds.append(None)
+        gauche = self._construire(indices[:milieu], profondeur + 1)
+        droite = self._construire(indices[milieu + 1:], profondeur + 1)
+        self.noeuds[k] = (indices[milieu], axe, gauche, droite)
+        return k
+
+    def plus_proche(self, x, y):
+        if self.racine < 0:
+            return 0
+        q = (x, y)
+        meilleur = [0, inf]
+        pile = [self.racine]
+        while pile:
+            k = pile.pop()
+            i, axe, gauche, droite = self.noeuds[k]
+            xi, yi = self.points[i]
+            d = (x-xi)**2+(y-yi)**2
+            if d < meilleur[1] or (d == meilleur[1] and i < meilleur[0]):
+                meilleur[0], meilleur[1] = i, d
+            ecart = q[axe] - self.points[i][axe]
+            proche, loin = (gauche, droite) if ecart < 0 else (droite, gauche)
+            # Le sous-arbre éloigné n'est visité que s'il peut contenir un germe
+            # aussi proche (égalité comprise, pour le départage par indice).
+            if loin >= 0 and ecart * ecart <= meilleur[1]:
+                pile.append(loin)
+            if proche >= 0:
+                pile.append(proche)
+        return meilleur[0]
+
+    def deux_plus_proches(self, x, y):
+        q = (x, y)
+        res, d1, d2 = 0, inf, inf
+        pile = [self.racine] if self.racine >= 0 else []
+        while pile:
+            i, axe, gauche, droite = self.noeuds[pile.pop()]
+            xi, yi = self.points[i]
+            d = (x-xi)**2+(y-yi)**2
+            if d < d1 or (d == d1 and i < res):
+                res, d1, d2 = i, d, d1
+            elif d < d2:
+                d2 = d
+            ecart = q[axe] - self.points[i][axe]
+            proche, loin = (gauche, droite) if ecart < 0 else (droite, gauche)
+            if loin >= 0 and ecart * ecart <= d2:
+                pile.append(loin)
+            if proche >= 0:
+                pile.append(proche)
+        return res, d1, d2
+
+
+class GrilleUniforme:
+    # Grille de seaux d'environ un germe par case en moyenne
+    def __init__(self, points):
+        self.points = en_tuples(points)
+        if not self.points:
+            self.nx = self.ny = 0
+            return
+        xs = [p[0] for p in self.points]
+        ys = [p[1] for p in self.points]
+        self.x0, self.y0 = min(xs), min(ys)
+        largeur = max(max(xs) - self.x0, max(ys) - self.y0) or 1.0
+        cote = max(1, ceil(sqrt(len(self.points))))
+        self.pas = largeur / cote
+        self.nx = int((max(xs) - self.x0) / self.pas) + 1
+        self.ny = int((max(ys) - self.y0) / self.pas) + 1
+        self.seaux = [[] for _ in range(self.nx * self.ny)]
+        for i, (xi, yi) in enumerate(self.points):
+            self.seaux[self._case(xi, self.x0, self.nx) * self.ny
+                       + self._case(yi, self.y0, self.ny)].append(i)
+
+    def _case(self, v, origine, n):
+        return min(n - 1, max(0, int((v - origine) / self.pas)))
+
+    def plus_proche(self, x, y):
+        return self._recherche(x, y, False)[0]
+
+    def deux_plus_proches(self, x, y):
+        return self._recherche(x, y, True)
+
+    def _recherche(self, x, y, second):
+        res, d1, d2 = 0, inf, inf
+        if not self.points:
+            return res, d1, d2
+        cx = self._case(x, self.x0, self.nx)
+        cy = self._case(y, self.y0, self.ny)
+        r = 0
+        while True:
+            for i in self._anneau(cx, cy, r):
+                xi, yi = self.points[i]
+                d = (x-xi)**2+(y-yi)**2
+                if d < d1 or (d == d1 and i < res):
+                    res, d1, d2 = i, d, d1
+                elif d < d2:
+                    d2 = d
+            # Distance minimale entre la requête et les cases hors du carré
+            # déjà exploré ; un côté collé au bord de la grille n'a plus rien
+            # au-delà.
+            ecarts = []
+            if cx - r > 0:
+                ecarts.append(x - (self.x0 + (cx - r) * self.pas))
+            if cx + r < self.nx - 1:
+                ecarts.append(self.x0 + (cx + r + 1) * self.pas - x)
+            if cy - r > 0:
+                ecarts.append(y - (self.y0 + (cy - r) * self.pas))
+            if cy + r < self.ny - 1:
+                ecarts.append(self.y0 + (cy + r + 1) * self.pas - y)
+            if not ecarts:
+                return res, d1, d2
+            ecart = max(0.0, min(ecarts) - self.pas * 1e-9)
+            if ecart * ecart > (d2 if second else d1):
+                return res, d1, d2
+            r += 1
+
+    def _anneau(self, cx, cy, r):
+        for gx in range(max(0, cx - r), min(self.nx, cx + r + 1)):
+            bord_x = gx == cx - r or gx == cx + r
+            for gy in range(max(0, cy - r), min(self.ny, cy + r + 1)):
+                if bord_x or gy == cy - r or gy == cy + r:
+                    yield from self.seaux[gx * self.ny + gy]
+
+
+INDEX = {
+    "kdtree": ArbreKD,
+    "grille": GrilleUniforme,
+    "lineaire": ParcoursLineaire,
+}
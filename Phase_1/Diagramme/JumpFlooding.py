@@ -0,0 +1,149 @@
+import numpy as np
+
+# Déplacements testés à chaque pas du jump flooding (les 8 voisins)
+VOISINS = [(dj, di) for dj in (-1, 0, 1) for di in (-1, 0, 1) if dj or di]
+
+
+def jump_flooding(germes, xs, ys):
+    """Étiquetage approché du produit ys x xs par jump flooding.
+
+    Chaque germe est déposé sur la case la plus proche puis les étiquettes
+    se propagent par pas de N/2, N/4, ..., 1 (plus un dernier pas de 1) :
+    O(P log P) pour P cases, quel que soit le nombre de germes.
+    """
+    germes = np.asarray(germes, dtype=np.float64).reshape(-1, 2)
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    H, W = len(ys), len(xs)
+    etiquettes = np.full((H, W), -1, dtype=np.int32)
+    if len(germes) == 0 or H == 0 or W == 0:
+        return np.zeros((H, W), dtype=np.int32)
+    gx, gy = germes[:, 0], germes[:, 1]
+
+    # Dépôt des germes : sur une même case, le plus proche (puis le plus
+    # petit indice) l'emporte.
+    i = _case(gx, xs)
+    j = _case(gy, ys)
+    d = (xs[i] - gx)**2 + (ys[j] - gy)**2
+    ordre = np.lexsort((np.arange(len(germes)), d))
+    cases = (j * W + i)[ordre]
+    _, premiers = np.unique(cases, return_index=True)
+    etiquettes.ravel()[cases[premiers]] = ordre[premiers]
+
+    X = xs[np.newaxis, :]
+    Y = ys[:, np.newaxis]
+    distances = np.where(etiquettes >= 0, (X - gx[etiquettes])**2 + (Y - gy[etiquettes])**2, np.inf)
+
+    pas = 1 << max(0, (max(H, W) - 1).bit_length() - 1)
+    sequence = []
+    while pas >= 1:
+        sequence.append(pas)
+        pas //= 2
+    for pas in sequence + [1]:
+        for dj, di in VOISINS:
+            voisin = _decaler(etiquettes, dj * pas, di * pas)
+            valide = voisin >= 0
+            d = np.where(valide, (X - gx[voisin])**2 + (Y - gy[voisin])**2, np.inf)
+            mieux = (d < distances) | ((d == distances) & valide & (voisin < etiquettes))
+            etiquettes = np.where(mieux, voisin, etiquettes)
+            distances = np.where(mieux, d, distances)
+    return etiquettes
+
+
+def corriger(etiquettes, xs, ys, calculateur):
+    """Recalcule exactement les cases mal étiquetées par le jump flooding.
+
+    Les erreurs apparaissent le long des frontières : on vérifie d'abord les
+    cases dont un voisin a une autre étiquette, ainsi que la case de chaque
+    germe absent de l'image, puis les voisins de chaque case corrigée,
+    jusqu'à ce que plus rien ne change. Renvoie le nombre de cases vérifiées.
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    verifiees = np.zeros(etiquettes.shape, dtype=bool)
+    a_verifier = _frontieres(etiquettes)
+    germes = calculateur.germes
+    absents = np.setdiff1d(np.arange(len(germes)), etiquettes)
+    a_verifier[_case(germes[absents, 1], ys), _case(germes[absents, 0], xs)] = True
+    while a_verifier.any():
+        jj, ii = np.nonzero(a_verifier)
+        # Regroupement par blocs pour que chaque lot de requêtes soit compact
+        ordre = np.lexsort((ii // 64, jj // 64))
+        jj, ii = jj[ordre], ii[ordre]
+        exactes = calculateur.plus_proches(xs[ii], ys[jj])
+        changees = exactes != etiquettes[jj, ii]
+        etiquettes[jj, ii] = exactes
+        verifiees[jj, ii] = True
+
+        modifiees = np.zeros(etiquettes.shape, dtype=bool)
+        modifiees[jj[changees], ii[changees]] = True
+        a_verifier = _dilater(modifiees) & ~verifiees
+    return int(verifiees.sum())
+
+
+def taux_erreur(etiquettes, reference):
+    return float(np.mean(etiquettes != reference)) if reference.size else 0.0
+
+
+class RenduJFA:
+    """Moteur de rendu approché, interchangeable avec CalculerGerme dans Visualisation."""
+
+    def __init__(self, calculateur, correction=False):
+        self.calculateur = calculateur
+        self.points = calculateur.points
+        self.correction = correction
+        self.verifiees = 0
+
+    def etiqueter_grille(self, xmin, xmax, ymin, ymax, N):
+        longueur = (xmax - xmin) / N
+        hauteur = (ymax - ymin) / N
+        xs = xmin + longueur * np.arange(N, dtype=np.float64)
+        ys = ymin + hauteur * np.arange(N, dtype=np.float64)
+        mesures = self.calculateur.mesures
+        with mesures.chrono("etiquetage"):
+            with mesures.chrono("jump_flooding"):
+                etiquettes = jump_flooding(self.calculateur.germes, xs, ys)
+            if self.correction:
+                with mesures.chrono("correction"):
+                    self.verifiees = corriger(etiquettes, xs, ys, self.calculateur)
+                mesures.compter("cases_verifiees", self.verifiees)
+        mesures.compter("cases_etiquetees", etiquettes.size)
+        return etiquettes
+
+
+def _case(v, grille):
+    if len(grille) == 1:
+        return np.zeros(len(v), dtype=np.int64)
+    pas = (grille[-1] - grille[0]) / (len(grille) - 1)
+    return np.clip(np.rint((v - grille[0]) / pas), 0, len(grille) - 1).astype(np.int64)
+
+
+def _decaler(tableau, dj, di):
+    # decale[j, i] = tableau[j + dj, i + di], -1 hors de la grille
+    H, W = tableau.shape
+    decale = np.full_like(tableau, -1)
+    if abs(dj) >= H or abs(di) >= W:
+        return decale
+    decale[max(0, -dj):H - max(0, dj), max(0, -di):W - max(0, di)] = \
+        tableau[max(0, dj):H - max(0, -dj), max(0, di):W - max(0, -di)]
+    return decale
+
+
+def _frontieres(etiquettes):
+    frontiere = np.zeros(etiquettes.shape, dtype=bool)
+    diff_lignes = etiquettes[1:] != etiquettes[:-1]
+    diff_colonnes = etiquettes[:, 1:] != etiquettes[:, :-1]
+    frontiere[1:] |= diff_lignes
+    frontiere[:-1] |= diff_lignes
+    frontiere[:, 1:] |= diff_colonnes
+    frontiere[:, :-1] |= diff_colonnes
+    return frontiere
+
+
+def _dilater(masque):
+    dilate = masque.copy()
+    dilate[1:] |= masque[:-1]
+    dilate[:-1] |= masque[1:]
+    dilate[:, 1:] |= masque[:, :-1]
+    dilate[:, :-1] |= masque[:, 1:]
+    return dilate
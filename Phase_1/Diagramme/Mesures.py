@@ -0,0 +1,62 @@
+from contextlib import contextmanager
+import cProfile
+import json
+import time
+import tracemalloc
+
+
+class Mesures:
+    """Chronomètres et compteurs alimentés par LirePoints, CalculerGerme et Visualisation.
+
+    Les durées d'un même nom s'additionnent ; en_dict() et exporter_json()
+    donnent l'ensemble des mesures d'une exécution.
+    """
+
+    def __init__(self):
+        self.durees = {}
+        self.appels = {}
+        self.compteurs = {}
+
+    @contextmanager
+    def chrono(self, nom):
+        tic = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durees[nom] = self.durees.get(nom, 0.0) + time.perf_counter() - tic
+            self.appels[nom] = self.appels.get(nom, 0) + 1
+
+    def compter(self, nom, n=1):
+        self.compteurs[nom] = self.compteurs.get(nom, 0) + n
+
+    def en_dict(self):
+        return {
+            "durees": dict(self.durees),
+            "appels": dict(self.appels),
+            "compteurs": dict(self.compteurs),
+        }
+
+    def exporter_json(self, chemin):
+        with open(chemin, 'w') as f:
+            json.dump(self.en_dict(), f, indent=2)
+
+
+@contextmanager
+def profiler(mesures, chemin_profil=None, memoire=False):
+    """Profilage optionnel de tout le bloc : cProfile vers chemin_profil
+    (lisible avec pstats) et, si memoire, pic d'allocation via tracemalloc."""
+    profil = cProfile.Profile() if chemin_profil else None
+    if memoire:
+        tracemalloc.start()
+    if profil:
+        profil.enable()
+    try:
+        yield
+    finally:
+        if profil:
+            profil.disable()
+            profil.dump_stats(chemin_profil)
+        if memoire:
+            _, pic = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            mesures.compter("memoire_pic_octets", pic)
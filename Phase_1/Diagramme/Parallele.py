@@ -0,0 +1,63 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+
+import numpy as np
+
+from .Calcul_germe import CalculerGerme
+
+# État de chaque processus de travail, rempli une seule fois par _initialiser
+_etat = {}
+
+
+def _initialiser(nom_germes, nb_germes, nom_sortie, N, xmin, xmax, ymin, ymax):
+    germes_shm = shared_memory.SharedMemory(name=nom_germes)
+    sortie_shm = shared_memory.SharedMemory(name=nom_sortie)
+    germes = np.ndarray((nb_germes, 2), dtype=np.float64, buffer=germes_shm.buf)
+    # Sans index : les germes restent la vue sur la mémoire partagée, sans
+    # copie en tuples Python dans chaque processus
+    # Les coordonnées sont calculées comme dans CalculerGerme.etiqueter_grille
+    # pour que chaque bande donne exactement les mêmes étiquettes.
+    longueur = (xmax - xmin) / N
+    hauteur = (ymax - ymin) / N
+    _etat.update(
+        germes_shm=germes_shm,
+        sortie_shm=sortie_shm,
+        calculateur=CalculerGerme(germes, index=None),
+        sortie=np.ndarray((N, N), dtype=np.int32, buffer=sortie_shm.buf),
+        xs=xmin + longueur * np.arange(N, dtype=np.float64),
+        ys=ymin + hauteur * np.arange(N, dtype=np.float64),
+    )
+
+
+def _etiqueter_bande(bande):
+    j0, j1 = bande
+    _etat["calculateur"].etiqueter_lignes(_etat["xs"], _etat["ys"][j0:j1], sortie=_etat["sortie"][j0:j1])
+
+
+def etiqueter_grille_parallele(points, xmin, xmax, ymin, ymax, N, workers=None, hauteur_bande=64):
+    """Même résultat que CalculerGerme.etiqueter_grille, réparti sur plusieurs processus.
+
+    La grille est découpée en bandes de lignes ; les germes et les étiquettes
+    sont en mémoire partagée, chaque processus écrit directement ses bandes.
+    """
+    workers = workers or os.cpu_count() or 1
+    germes = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 2)
+    if workers == 1 or N <= hauteur_bande:
+        return CalculerGerme(germes, index=None).etiqueter_grille(xmin, xmax, ymin, ymax, N)
+
+    germes_shm = shared_memory.SharedMemory(create=True, size=max(1, germes.nbytes))
+    sortie_shm = shared_memory.SharedMemory(create=True, size=max(1, N * N * 4))
+    try:
+        np.ndarray(germes.shape, dtype=np.float64, buffer=germes_shm.buf)[:] = germes
+        bandes = [(j, min(N, j + hauteur_bande)) for j in range(0, N, hauteur_bande)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_initialiser,
+                                 initargs=(germes_shm.name, len(germes), sortie_shm.name,
+                                           N, xmin, xmax, ymin, ymax)) as pool:
+            list(pool.map(_etiqueter_bande, bandes))
+        return np.ndarray((N, N), dtype=np.int32, buffer=sortie_shm.buf).copy()
+    finally:
+        germes_shm.close()
+        germes_shm.unlink()
+        sortie_shm.close()
+        sortie_shm.unlink()
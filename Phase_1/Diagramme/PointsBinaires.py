@@ -0,0 +1,60 @@
+import struct
+
+import numpy as np
+
+# Format binaire des fichiers de points (.vpts), petit-boutiste :
+#   octets 0-5   : b"VORPTS"
+#   octet  6     : version (1)
+#   octet  7     : b"d" (float64) ou b"f" (float32)
+#   octets 8-15  : nombre de points (uint64)
+#   puis x0, y0, x1, y1, ... sans séparateur
+# L'en-tête fait 16 octets pour que les coordonnées restent alignées, ce qui
+# permet de projeter le fichier en mémoire (np.memmap) sans copie.
+MAGIQUE = b"VORPTS"
+VERSION = 1
+ENTETE = struct.Struct("<6sBcQ")
+EXTENSION = ".vpts"
+TYPES = {b"d": np.dtype("<f8"), b"f": np.dtype("<f4")}
+
+
+def est_binaire(chemin):
+    with open(chemin, 'rb') as f:
+        return f.read(len(MAGIQUE)) == MAGIQUE
+
+
+def lire_entete(chemin):
+    with open(chemin, 'rb') as f:
+        entete = f.read(ENTETE.size)
+    if len(entete) < ENTETE.size:
+        raise ValueError(f"{chemin} : en-tête binaire tronqué")
+    magique, version, code, nb_points = ENTETE.unpack(entete)
+    if magique != MAGIQUE or version != VERSION or code not in TYPES:
+        raise ValueError(f"{chemin} : en-tête binaire invalide")
+    return TYPES[code], nb_points
+
+
+def lire_binaire(chemin):
+    """Projette le fichier en mémoire : tableau (n, 2) en lecture seule, sans copie."""
+    dtype, nb_points = lire_entete(chemin)
+    if nb_points == 0:
+        return np.empty((0, 2), dtype=dtype)
+    return np.memmap(chemin, dtype=dtype, mode='r', offset=ENTETE.size, shape=(nb_points, 2))
+
+
+def ecrire_binaire(blocs, chemin, dtype=np.float64):
+    """Écrit une suite de tableaux (n, 2) au format binaire, bloc par bloc."""
+    dtype = np.dtype(dtype).newbyteorder('<')
+    code = next((c for c, t in TYPES.items() if t == dtype), None)
+    if code is None:
+        raise ValueError(f"Type non supporté : {dtype} (float64 ou float32)")
+    nb_points = 0
+    with open(chemin, 'wb') as f:
+        f.write(ENTETE.pack(MAGIQUE, VERSION, code, 0))
+        for bloc in blocs:
+            bloc = np.ascontiguousarray(bloc, dtype=dtype).reshape(-1, 2)
+            f.write(bloc.tobytes())
+            nb_points += len(bloc)
+        # Le nombre de points n'est connu qu'à la fin du flux
+        f.seek(0)
+        f.write(ENTETE.pack(MAGIQUE, VERSION, code, nb_points))
+    return nb_points
@@ -0,0 +1,73 @@
+from math import inf, sqrt
+
+import numpy as np
+
+
+class RenduAdaptatif:
+    """Étiquetage de la grille par subdivision en quadtree.
+
+    Un bloc est rempli d'un seul coup quand ses quatre coins ont le même
+    germe et que le disque circonscrit au bloc ne peut atteindre aucun autre
+    germe ; sinon il est découpé en quatre. Le résultat est identique à
+    CalculerGerme.etiqueter_grille, avec bien moins de requêtes.
+    """
+
+    def __init__(self, calculateur):
+        self.calculateur = calculateur
+        self.points = calculateur.points
+        self.requetes = 0
+
+    def etiqueter_grille(self, xmin, xmax, ymin, ymax, N):
+        longueur = (xmax - xmin) / N
+        hauteur = (ymax - ymin) / N
+        # Mêmes coordonnées, au bit près, que CalculerGerme.etiqueter_grille
+        self.xs = (xmin + longueur * np.arange(N, dtype=np.float64)).tolist()
+        self.ys = (ymin + hauteur * np.arange(N, dtype=np.float64)).tolist()
+        self.etiquettes = np.full((N, N), -1, dtype=np.int32)
+        self.requetes = 0
+
+        mesures = self.calculateur.mesures
+        with mesures.chrono("etiquetage"):
+            pile = [(0, N, 0, N)] if N > 0 else []
+            while pile:
+                i0, i1, j0, j1 = pile.pop()
+                coins = {self._etiquette(i, j) for i in (i0, i1 - 1) for j in (j0, j1 - 1)}
+                if i1 - i0 <= 2 and j1 - j0 <= 2:
+                    # Tous les points du bloc sont des coins : déjà étiquetés
+                    continue
+                if len(coins) == 1 and self._bloc_interieur(coins.pop(), i0, i1, j0, j1):
+                    continue
+                im = (i0 + i1) // 2
+                jm = (j0 + j1) // 2
+                for a, b in ((i0, im), (im, i1)):
+                    for c, d in ((j0, jm), (jm, j1)):
+                        if a < b and c < d:
+                            pile.append((a, b, c, d))
+        mesures.compter("requetes_quadtree", self.requetes)
+        mesures.compter("cases_etiquetees", N * N)
+        return self.etiquettes
+
+    def _etiquette(self, i, j):
+        if self.etiquettes[j, i] < 0:
+            self.requetes += 1
+            self.etiquettes[j, i] = self.calculateur.index.plus_proche(self.xs[i], self.ys[j])
+        return self.etiquettes[j, i]
+
+    def _bloc_interieur(self, germe, i0, i1, j0, j1):
+        x_bas, x_haut = self.xs[i0], self.xs[i1 - 1]
+        y_bas, y_haut = self.ys[j0], self.ys[j1 - 1]
+        cx, cy = (x_bas + x_haut) / 2, (y_bas + y_haut) / 2
+        rayon = sqrt((x_haut - x_bas)**2 + (y_haut - y_bas)**2) / 2
+
+        self.requetes += 1
+        proche, d1, d2 = self.calculateur.index.deux_plus_proches(cx, cy)
+        if proche != germe:
+            return False
+        # Pour tout point p du disque : |p - t| >= d_t - rayon > d_s + rayon >= |p - s|.
+        # La marge absorbe les arrondis du calcul des distances en flottants.
+        if d2 < inf:
+            marge = 1e-9 * (abs(cx) + abs(cy) + rayon + sqrt(d2))
+            if sqrt(d2) - sqrt(d1) <= 2 * rayon + marge:
+                return False
+        self.etiquettes[j0:j1, i0:i1] = germe
+        return True
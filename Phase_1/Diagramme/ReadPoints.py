@@ -1,11 +1,85 @@
+from itertools import islice
+import warnings
+
+import numpy as np
+
+from .Mesures import Mesures
+from .PointsBinaires import est_binaire, lire_binaire
+
+TAILLE_BLOC = 1 << 16
+
 
 class LirePoints:
-    def __init__(self, chemin):
+    def __init__(self, chemin, taille_bloc=TAILLE_BLOC, mesures=None):
         self.chemin = chemin
+        self.taille_bloc = taille_bloc
+        self.mesures = mesures if mesures is not None else Mesures()
 
     def get_Points(self) :
         PPP = []
-        with open(self.chemin , 'r') as f:
-            for couple in f.readlines() :
-                PPP.append(tuple(map(float, couple.strip().split(','))))
-        return PPP
\ No newline at end of file
+        for bloc in self.lire_par_blocs():
+            PPP.extend(map(tuple, bloc.tolist()))
+        return PPP
+
+    def lire_par_blocs(self):
+        """Parcourt le fichier par blocs de taille_bloc lignes, chacun en tableau (n, 2)."""
+        if est_binaire(self.chemin):
+            tableau = lire_binaire(self.chemin)
+            for debut in range(0, len(tableau), self.taille_bloc):
+                with self.mesures.chrono("lecture"):
+                    bloc = np.asarray(tableau[debut:debut + self.taille_bloc], dtype=np.float64)
+                self._compter(bloc)
+                yield bloc
+            return
+        with open(self.chemin, 'r') as f:
+            while True:
+                with self.mesures.chrono("lecture"):
+                    lignes = list(islice(f, self.taille_bloc))
+                    bloc = self._analyser(lignes) if lignes else None
+                if bloc is None:
+                    return
+                if len(bloc):
+                    self._compter(bloc)
+                    yield bloc
+
+    def load_array(self):
+        """Charge tout le fichier dans un seul tableau contigu (n, 2).
+
+        Un fichier binaire (.vpts) est projeté en mémoire sans copie et garde
+        son type (float64 ou float32).
+        """
+        with self.mesures.chrono("lecture"):
+            tableau = lire_binaire(self.chemin) if est_binaire(self.chemin) else self._analyser(self.chemin)
+        self._compter(tableau)
+        return tableau
+
+    def _compter(self, bloc):
+        self.mesures.compter("blocs_lus")
+        self.mesures.compter("points_lus", len(bloc))
+
+    def _analyser(self, source):
+        # np.loadtxt lève ValueError sur une ligne non numérique, comme float() ;
+        # comments=None pour qu'une ligne commençant par '#' en soit une.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)  # fichier vide
+            tableau = np.loadtxt(source, delimiter=',', dtype=np.float64, ndmin=2, comments=None)
+        # loadtxt saute les lignes vides, que float('') refusait : une ligne
+        # manquante dans le tableau en trahit une.
+        nb_lignes = len(source) if isinstance(source, list) else _compter_lignes(source)
+        if len(tableau) != nb_lignes:
+            raise ValueError(f"{self.chemin} : ligne vide")
+        if tableau.size == 0:
+            return np.empty((0, 2), dtype=np.float64)
+        if tableau.shape[1] != 2:
+            raise ValueError(f"{self.chemin} : {tableau.shape[1]} coordonnées par ligne au lieu de 2")
+        return tableau
+
+
+def _compter_lignes(chemin):
+    nb_lignes = 0
+    dernier = b"\n"
+    with open(chemin, 'rb') as f:
+        while bloc := f.read(1 << 20):
+            nb_lignes += bloc.count(b"\n")
+            dernier = bloc[-1:]
+    return nb_lignes + (dernier != b"\n")
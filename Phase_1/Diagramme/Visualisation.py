@@ -1,11 +1,16 @@
-from matplotlib.pyplot import subplots, show
-from matplotlib.patches import Rectangle
+from matplotlib.colors import to_rgb
 from random import shuffle
-import time
+
+import numpy as np
+
+from .Mesures import Mesures
+
+MODES = ("image", "rectangles", "png")
 
 
 class Visualisation:
-    def __init__(self, xmin, xmax, ymin, ymax, N):
+    def __init__(self, xmin, xmax, ymin, ymax, N, mesures=None):
+        self.mesures = mesures if mesures is not None else Mesures()
         self.xmin = xmin
         self.xmax = xmax
         self.ymin = ymin
@@ -13,40 +18,108 @@ class Visualisation:
         self.N = N
 
         self.FC = [
-            'red', 'lightgoldenrodyellow', 'beige', 'firebrick', 'green', 
-            'blue', 'orange', 'cyan', 'brown', 'salmon', 'indigo', 
-            'magenta', 'turquoise', 'pink', 'lavender', 'fuchsia', 
+            'red', 'lightgoldenrodyellow', 'beige', 'firebrick', 'green',
+            'blue', 'orange', 'cyan', 'brown', 'salmon', 'indigo',
+            'magenta', 'turquoise', 'pink', 'lavender', 'fuchsia',
             'peru', 'oldlace', 'darkkhaki', 'peachpuff', 'tomato'
         ]
         shuffle(self.FC)
 
-    def dessiner(self, calculateur):
-        hauteur = (self.ymax - self.ymin) / self.N
-        longueur = (self.xmax - self.xmin) / self.N
+    def palette(self):
+        # Couleurs de self.FC en RGB 8 bits, suivies du noir des germes
+        couleurs = [to_rgb(c) for c in self.FC] + [(0, 0, 0)]
+        return np.round(np.array(couleurs) * 255).astype(np.uint8)
+
+    def image(self, calculateur):
+        """Image RGB (N, N, 3) de la grille, la ligne 0 correspondant à ymin."""
+        etiquettes = calculateur.etiqueter_grille(self.xmin, self.xmax, self.ymin, self.ymax, self.N)
+        return self.colorier(etiquettes, calculateur.points)
+
+    def colorier(self, etiquettes, points):
+        with self.mesures.chrono("coloriage"):
+            return self._colorier(etiquettes, points)
+
+    def _colorier(self, etiquettes, points):
+        palette = self.palette()
+        couleurs = etiquettes % len(self.FC)
+
+        # Chaque germe noircit la case de la grille qui le contient
+        germes = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        i = np.floor((germes[:, 0] - self.xmin) / ((self.xmax - self.xmin) / self.N)).astype(np.int64)
+        j = np.floor((germes[:, 1] - self.ymin) / ((self.ymax - self.ymin) / self.N)).astype(np.int64)
+        dedans = (i >= 0) & (i < self.N) & (j >= 0) & (j < self.N)
+        couleurs[j[dedans], i[dedans]] = len(self.FC)
+
+        return palette[couleurs]
+
+    def dessiner(self, calculateur, mode="image", fichier='resultats/phase1/voronoi.png', afficher=True):
+        if mode not in MODES:
+            raise ValueError(f"Mode inconnu : {mode} (choix : {', '.join(MODES)})")
+        if mode == "png":
+            self.exporter_png(calculateur, fichier)
+            return
+
+        from matplotlib.pyplot import subplots, show
 
         fig, ax = subplots(figsize=(10, 10))
         ax.set_xlim(self.xmin, self.xmax)
         ax.set_ylim(self.ymin, self.ymax)
 
-        tic = time.time()
-        
-        for i in range(self.N): 
+        with self.mesures.chrono("dessin"):
+            if mode == "rectangles":
+                self._dessiner_rectangles(ax, calculateur)
+            else:
+                ax.imshow(self.image(calculateur), origin='lower', interpolation='nearest',
+                          extent=(self.xmin, self.xmax, self.ymin, self.ymax))
+                self.mesures.compter("images")
+                ax.set_aspect('auto')
+
+        with self.mesures.chrono("sauvegarde"):
+            fig.savefig(fichier)
+        if afficher:
+            show()
+
+    def _dessiner_rectangles(self, ax, calculateur):
+        from matplotlib.patches import Rectangle
+
+        hauteur = (self.ymax - self.ymin) / self.N
+        longueur = (self.xmax - self.xmin) / self.N
+
+        etiquettes = calculateur.etiqueter_grille(self.xmin, self.xmax, self.ymin, self.ymax, self.N)
+
+        for i in range(self.N):
             coin_x = self.xmin + longueur * i
-            for j in range(self.N): 
+            for j in range(self.N):
                 coin_y = self.ymin + hauteur * j
-                
-                indice_proche = calculateur.plus_proche(coin_x, coin_y)
+
+                indice_proche = etiquettes[j, i]
                 couleur = self.FC[indice_proche % len(self.FC)]
-                
+
                 rect = Rectangle((coin_x, coin_y), longueur, hauteur, facecolor=couleur)
                 ax.add_patch(rect)
 
-        for P in calculateur.points: 
+        for P in calculateur.points:
             rect = Rectangle((P[0], P[1]), longueur, hauteur, facecolor='black')
             ax.add_patch(rect)
+        self.mesures.compter("patches", self.N * self.N + len(calculateur.points))
+
+    def exporter_png(self, calculateur, fichier, taille=1000):
+        """Écrit directement le PNG avec Pillow, sans figure matplotlib.
+
+        Chaque case de la grille devient un bloc de pixels pour que l'image
+        mesure environ taille x taille pixels. La durée totale (calcul et
+        écriture) est comptée sous "export_png".
+        """
+        with self.mesures.chrono("export_png"):
+            self.ecrire_png(self.image(calculateur), fichier, taille)
 
-        tac = time.time()
-        print(f"Temps de calcul et dessin : {tac - tic:.3f} secondes")
+    def ecrire_png(self, image, fichier, taille=1000):
+        from PIL import Image
 
-        fig.savefig('resultats/phase1/voronoi.png')
-        show()
\ No newline at end of file
+        with self.mesures.chrono("ecriture_png"):
+            pixels = np.flipud(image)
+            echelle = max(1, taille // self.N)
+            if echelle > 1:
+                pixels = pixels.repeat(echelle, axis=0).repeat(echelle, axis=1)
+            Image.fromarray(np.ascontiguousarray(pixels)).save(fichier)
+        self.mesures.compter("pixels_ecrits", pixels.shape[0] * pixels.shape[1])
@@ -0,0 +1,37 @@
+import argparse
+import time
+
+import numpy as np
+
+from Diagramme.Calcul_germe import CalculerGerme
+from Diagramme.JumpFlooding import RenduJFA, taux_erreur
+from Diagramme.Quadtree import RenduAdaptatif
+
+
+def mesurer(moteur, N):
+    tic = time.perf_counter()
+    etiquettes = moteur.etiqueter_grille(0, 20, 0, 20, N)
+    return etiquettes, time.perf_counter() - tic
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare les moteurs d'étiquetage de la grille")
+    parser.add_argument("--germes", nargs="+", type=int, default=[10, 100, 1000, 10000])
+    parser.add_argument("-N", nargs="+", type=int, default=[100, 500, 1000])
+    args = parser.parse_args()
+
+    print(f"{'Germes':>7} | {'N':>5} | {'Exact (s)':>9} | {'Quadtree (s)':>12} | "
+          f"{'JFA (s)':>8} | {'Erreur JFA':>10} | {'JFA corrigé (s)':>15} | {'Erreur':>7}")
+    for nb in args.germes:
+        calculateur = CalculerGerme(np.random.uniform(0, 20, (nb, 2)))
+        for N in args.N:
+            exact, t_exact = mesurer(calculateur, N)
+            _, t_quadtree = mesurer(RenduAdaptatif(calculateur), N)
+            jfa, t_jfa = mesurer(RenduJFA(calculateur), N)
+            corrige, t_corrige = mesurer(RenduJFA(calculateur, correction=True), N)
+            print(f"{nb:>7} | {N:>5} | {t_exact:>9.3f} | {t_quadtree:>12.3f} | {t_jfa:>8.3f} | "
+                  f"{taux_erreur(jfa, exact):>10.4%} | {t_corrige:>15.3f} | {taux_erreur(corrige, exact):>7.4%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import argparse
+import os
+
+import numpy as np
+
+from Diagramme.ReadPoints import LirePoints
+from Diagramme.PointsBinaires import EXTENSION, ecrire_binaire
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convertit un fichier de points x,y en fichier binaire " + EXTENSION)
+    parser.add_argument("source", help="fichier texte, une coordonnée x,y par ligne")
+    parser.add_argument("destination", nargs="?", help=f"fichier {EXTENSION} (par défaut : source avec l'extension {EXTENSION})")
+    parser.add_argument("--float32", action="store_true", help="stocke les coordonnées en simple précision")
+    args = parser.parse_args()
+
+    destination = args.destination or os.path.splitext(args.source)[0] + EXTENSION
+    dtype = np.float32 if args.float32 else np.float64
+    nb_points = ecrire_binaire(LirePoints(args.source).lire_par_blocs(), destination, dtype)
+    print(f"{nb_points} points écrits dans {destination}")
+
+
+if __name__ == "__main__":
+    main()
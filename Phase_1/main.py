@@ -1,9 +1,125 @@
+import argparse
+import json
+import os
+
+import numpy as np
+
 from Diagramme.ReadPoints import LirePoints
 from Diagramme.Calcul_germe import CalculerGerme
+from Diagramme.IndexSpatial import INDEX
+from Diagramme.Mesures import Mesures, profiler
 from Diagramme.Visualisation import Visualisation
 
-lecteur = LirePoints("data/Points.txt") 
-mes_points = lecteur.get_Points()
-calculateur = CalculerGerme(mes_points)
-visu = Visualisation(0, 20, 0, 20, 100)
-visu.dessiner(calculateur)
\ No newline at end of file
+MOTEURS = ("exact", "quadtree", "jfa", "jfa-corrige")
+
+
+def analyser_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Génère le diagramme de Voronoï de chaque fichier de points")
+    parser.add_argument("fichiers", nargs="*", default=["data/Points.txt"],
+                        help="fichiers de points (texte x,y ou binaire .vpts), data/Points.txt par défaut")
+    parser.add_argument("--bornes", nargs=4, type=float, metavar=("XMIN", "XMAX", "YMIN", "YMAX"),
+                        help="fenêtre de dessin (par défaut : boîte englobante des points avec une marge)")
+    parser.add_argument("--marge", type=float, default=0.05,
+                        help="marge des bornes automatiques, en proportion de l'étendue des points")
+    parser.add_argument("-N", type=int, default=100, help="nombre de cases par côté de la grille")
+    parser.add_argument("--sortie", default="resultats/phase1",
+                        help="dossier des images (une image <nom du fichier>.png par entrée) "
+                             "ou chemin .png s'il n'y a qu'une entrée")
+    parser.add_argument("--taille", type=int, default=1000, help="taille approximative de l'image en pixels")
+    parser.add_argument("--moteur", choices=MOTEURS, default="exact")
+    parser.add_argument("--index", choices=list(INDEX), default="kdtree",
+                        help="index spatial des requêtes ponctuelles du moteur quadtree")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processus de calcul pour le moteur exact (0 : un par cœur)")
+    parser.add_argument("--afficher", action="store_true",
+                        help="ouvre une fenêtre matplotlib au lieu d'écrire directement le PNG")
+    parser.add_argument("--mesures-json", metavar="FICHIER",
+                        help="écrit les durées et compteurs de chaque fichier traité en JSON")
+    parser.add_argument("--profil", metavar="FICHIER",
+                        help="profil cProfile de l'exécution complète (à lire avec pstats ou snakeviz)")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="mesure le pic d'allocation mémoire de chaque fichier (ralentit le calcul)")
+    args = parser.parse_args(argv)
+    if args.sortie.lower().endswith(".png") and len(args.fichiers) > 1:
+        parser.error("--sortie doit être un dossier quand plusieurs fichiers sont donnés")
+    return args
+
+
+def bornes_automatiques(points, marge):
+    if len(points) == 0:
+        return 0.0, 1.0, 0.0, 1.0
+    bas = points.min(axis=0)
+    haut = points.max(axis=0)
+    etendue = haut - bas
+    # Points alignés sur un axe : fenêtre d'une unité de part et d'autre
+    ecart = np.where(etendue > 0, etendue * marge, 1.0)
+    return bas[0] - ecart[0], haut[0] + ecart[0], bas[1] - ecart[1], haut[1] + ecart[1]
+
+
+def chemin_sortie(fichier, sortie):
+    if sortie.lower().endswith(".png"):
+        return sortie
+    nom = os.path.splitext(os.path.basename(fichier))[0]
+    return os.path.join(sortie, nom + ".png")
+
+
+def moteur(calculateur, nom):
+    if nom == "quadtree":
+        from Diagramme.Quadtree import RenduAdaptatif
+        return RenduAdaptatif(calculateur)
+    if nom.startswith("jfa"):
+        from Diagramme.JumpFlooding import RenduJFA
+        return RenduJFA(calculateur, correction=nom == "jfa-corrige")
+    return calculateur
+
+
+def traiter(fichier, args, mesures=None):
+    mesures = mesures if mesures is not None else Mesures()
+    points = LirePoints(fichier, mesures=mesures).load_array()
+
+    xmin, xmax, ymin, ymax = args.bornes or bornes_automatiques(points, args.marge)
+    visu = Visualisation(xmin, xmax, ymin, ymax, args.N, mesures=mesures)
+    sortie = chemin_sortie(fichier, args.sortie)
+    os.makedirs(os.path.dirname(sortie) or ".", exist_ok=True)
+
+    # Seul le quadtree interroge l'index point par point : les autres moteurs
+    # travaillent par tuiles et ne construisent aucun index.
+    calculateur = CalculerGerme(points, index=args.index if args.moteur == "quadtree" else None,
+                                mesures=mesures)
+
+    if args.afficher:
+        visu.dessiner(moteur(calculateur, args.moteur), fichier=sortie)
+        return sortie, len(points), mesures
+
+    if args.moteur == "exact" and args.workers != 1:
+        from Diagramme.Parallele import etiqueter_grille_parallele
+        with mesures.chrono("etiquetage"):
+            etiquettes = etiqueter_grille_parallele(points, xmin, xmax, ymin, ymax, args.N,
+                                                    workers=args.workers or None)
+        mesures.compter("cases_etiquetees", etiquettes.size)
+    else:
+        etiquettes = moteur(calculateur, args.moteur).etiqueter_grille(xmin, xmax, ymin, ymax, args.N)
+
+    image = visu.colorier(etiquettes, points)
+    visu.ecrire_png(image, sortie, taille=args.taille)
+    return sortie, len(points), mesures
+
+
+def main(argv=None):
+    args = analyser_arguments(argv)
+    resultats = {}
+    with profiler(Mesures(), args.profil):
+        for fichier in args.fichiers:
+            mesures = Mesures()
+            with profiler(mesures, memoire=args.tracemalloc):
+                sortie, nb_points, mesures = traiter(fichier, args, mesures)
+            details = ", ".join(f"{etape} {duree:.3f} s" for etape, duree in mesures.durees.items())
+            print(f"{fichier} ({nb_points} points) -> {sortie} : {details}")
+            resultats[fichier] = mesures.en_dict()
+    if args.mesures_json:
+        with open(args.mesures_json, 'w') as f:
+            json.dump(resultats, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
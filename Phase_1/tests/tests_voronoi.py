@@ -1,6 +1,18 @@
+import json
+import os
+import subprocess
+import sys
+
 import pytest
+from random import Random
 from Phase_1.Diagramme.Calcul_germe import CalculerGerme
 from Phase_1.Diagramme.ReadPoints import LirePoints
+from Phase_1.Diagramme.PointsBinaires import ecrire_binaire, est_binaire
+from Phase_1.Diagramme.Visualisation import Visualisation
+from Phase_1.Diagramme.Parallele import etiqueter_grille_parallele
+from Phase_1.Diagramme.Quadtree import RenduAdaptatif
+from Phase_1.Diagramme.JumpFlooding import RenduJFA, taux_erreur
+from Phase_1.Diagramme.Mesures import Mesures
 
 def test_should_return_list_of_tuples_given_valid_file(tmp_path):
     # Arrange
@@ -108,4 +120,338 @@ def test_should_return_first_index_given_duplicate_points():
     resultat = calculateur.plus_proche(x_cible, y_cible)
     
     # Assert
-    assert resultat == 0
\ No newline at end of file
+    assert resultat == 0
+
+@pytest.mark.parametrize("index", ["kdtree", "grille"])
+def test_should_match_linear_scan_given_spatial_index(index):
+    # Arrange
+    rng = Random(0)
+    points = [(rng.randint(0, 20), rng.randint(0, 20)) for _ in range(200)]
+    reference = CalculerGerme(points, index="lineaire")
+    calculateur = CalculerGerme(points, index=index)
+    cibles = [(rng.uniform(-5, 25), rng.uniform(-5, 25)) for _ in range(500)]
+    cibles += [(x, y) for x in range(-2, 23) for y in range(-2, 23)]
+
+    # Act
+    resultats = [calculateur.plus_proche(x, y) for x, y in cibles]
+
+    # Assert
+    assert resultats == [reference.plus_proche(x, y) for x, y in cibles]
+
+
+def test_should_raise_value_error_given_unknown_index():
+    # Act / Assert
+    with pytest.raises(ValueError):
+        CalculerGerme([(0, 0)], index="octree")
+
+
+def test_should_build_no_index_given_index_none():
+    # Arrange
+    rng = Random(4)
+    points = [(rng.uniform(0, 20), rng.uniform(0, 20)) for _ in range(100)]
+    reference = CalculerGerme(points, index="lineaire")
+    calculateur = CalculerGerme(points, index=None)
+
+    # Act
+    etiquettes = calculateur.etiqueter_grille(0, 20, 0, 20, 30)
+
+    # Assert
+    assert calculateur.index is None
+    assert "index" not in calculateur.mesures.durees
+    assert calculateur.plus_proche(3.5, 7.25) == reference.plus_proche(3.5, 7.25)
+    assert (etiquettes == reference.etiqueter_grille(0, 20, 0, 20, 30)).all()
+
+
+def test_should_label_grid_given_many_identical_seeds():
+    # Arrange
+    import numpy as np
+    calculateur = CalculerGerme(np.zeros((40000, 2)), index=None)
+
+    # Act
+    etiquettes = calculateur.etiqueter_grille(0, 1, 0, 1, 4)
+
+    # Assert
+    assert etiquettes.shape == (4, 4)
+    assert (etiquettes == 0).all()
+
+
+def test_should_match_plus_proche_given_whole_grid_labeling():
+    # Arrange
+    rng = Random(1)
+    points = [(rng.uniform(0, 20), rng.uniform(0, 20)) for _ in range(300)]
+    points += [(5, 5), (5, 5), (15, 5)]
+    calculateur = CalculerGerme(points, taille_tuile=16)
+    N = 60
+    pas = 20 / N
+
+    # Act
+    etiquettes = calculateur.etiqueter_grille(0, 20, 0, 20, N)
+
+    # Assert
+    assert etiquettes.shape == (N, N)
+    for j in range(N):
+        for i in range(N):
+            assert etiquettes[j, i] == calculateur.index.plus_proche(pas * i, pas * j)
+
+
+def test_should_return_first_index_given_batch_of_equidistant_targets():
+    # Arrange
+    calculateur = CalculerGerme([(0, 0), (10, 0)], max_elements=1)
+    xs = [5.0] * 100
+    ys = [float(k) for k in range(100)]
+
+    # Act
+    resultats = calculateur.plus_proches(xs, ys)
+
+    # Assert
+    assert resultats.tolist() == [0] * 100
+
+
+def test_should_color_each_cell_with_its_seed_given_raster_image():
+    # Arrange
+    points = [(2.5, 2.5), (17.5, 17.5)]
+    calculateur = CalculerGerme(points)
+    visu = Visualisation(0, 20, 0, 20, 10)
+    palette = visu.palette()
+
+    # Act
+    image = visu.image(calculateur)
+
+    # Assert
+    assert image.shape == (10, 10, 3)
+    assert (image[0, 0] == palette[0]).all()
+    assert (image[9, 9] == palette[1 % len(visu.FC)]).all()
+    assert (image[1, 1] == palette[-1]).all()
+    assert (image[8, 8] == palette[-1]).all()
+
+
+def test_should_write_png_without_figure_given_headless_mode(tmp_path, capsys):
+    # Arrange
+    from PIL import Image
+    calculateur = CalculerGerme([(2, 3), (15, 12), (8, 18)])
+    visu = Visualisation(0, 20, 0, 20, 50)
+    fichier = tmp_path / "voronoi.png"
+
+    # Act
+    visu.dessiner(calculateur, mode="png", fichier=fichier)
+
+    # Assert
+    with Image.open(fichier) as image:
+        assert image.size == (1000, 1000)
+    assert {"export_png", "ecriture_png"} <= set(visu.mesures.durees)
+    assert capsys.readouterr().out == ""
+
+
+def test_should_yield_fixed_size_chunks_given_streaming_reader(tmp_path):
+    # Arrange
+    tmp = tmp_path / "test_blocs.txt"
+    with open(tmp, 'w') as f:
+        f.write("\n".join(f"{k}, {-k / 2}" for k in range(10)))
+    lecteur = LirePoints(tmp, taille_bloc=4)
+
+    # Act
+    blocs = list(lecteur.lire_par_blocs())
+
+    # Assert
+    assert [bloc.shape for bloc in blocs] == [(4, 2), (4, 2), (2, 2)]
+    assert blocs[2].tolist() == [[8.0, -4.0], [9.0, -4.5]]
+
+
+def test_should_return_contiguous_array_given_valid_file(tmp_path):
+    # Arrange
+    tmp = tmp_path / "test_points.txt"
+    with open(tmp, 'w') as f:
+        f.write("10.5, 20.0 \n 0, 0 \n -5.2, 3.14")
+    lecteur = LirePoints(tmp)
+
+    # Act
+    tableau = lecteur.load_array()
+
+    # Assert
+    assert tableau.dtype == float
+    assert tableau.flags["C_CONTIGUOUS"]
+    assert tableau.tolist() == [[10.5, 20.0], [0.0, 0.0], [-5.2, 3.14]]
+
+
+@pytest.mark.parametrize("contenu", ["points \n Ce n'est pas un nombre \n Test", "1, 2\n3, 4, 5",
+                                     "1, 2\n\n3, 4\n", "1, 2\n   \n3, 4", "# x, y\n1, 2\n", "1, 2\n3, 4 # fin\n", "\n"])
+def test_should_raise_value_error_given_invalid_file_for_array_readers(tmp_path, contenu):
+    # Arrange
+    tmp = tmp_path / "test_invalide.txt"
+    with open(tmp, 'w') as f:
+        f.write(contenu)
+    lecteur = LirePoints(tmp)
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        lecteur.load_array()
+    with pytest.raises(ValueError):
+        list(lecteur.lire_par_blocs())
+
+
+def test_should_return_empty_array_given_empty_file(tmp_path):
+    # Arrange
+    tmp = tmp_path / "test_vide.txt"
+    tmp.write_text("")
+
+    # Act
+    tableau = LirePoints(tmp).load_array()
+
+    # Assert
+    assert tableau.shape == (0, 2)
+
+
+@pytest.mark.parametrize("dtype", ["float64", "float32"])
+def test_should_read_same_points_given_binary_file(tmp_path, dtype):
+    # Arrange
+    texte = tmp_path / "test_points.txt"
+    with open(texte, 'w') as f:
+        f.write("10.5, 20.0 \n 0, 0 \n -5.25, 3.5")
+    binaire = tmp_path / "test_points.vpts"
+    ecrire_binaire(LirePoints(texte, taille_bloc=2).lire_par_blocs(), binaire, dtype)
+
+    # Act
+    lecteur = LirePoints(binaire, taille_bloc=2)
+    tableau = lecteur.load_array()
+
+    # Assert
+    assert est_binaire(binaire) and not est_binaire(texte)
+    assert tableau.dtype == dtype
+    assert tableau.tolist() == [[10.5, 20.0], [0.0, 0.0], [-5.25, 3.5]]
+    assert lecteur.get_Points() == [(10.5, 20.0), (0.0, 0.0), (-5.25, 3.5)]
+    assert [len(bloc) for bloc in lecteur.lire_par_blocs()] == [2, 1]
+
+
+def test_should_match_single_process_labels_given_several_workers():
+    # Arrange
+    rng = Random(2)
+    points = [(rng.uniform(0, 20), rng.uniform(0, 20)) for _ in range(100)]
+    attendu = CalculerGerme(points).etiqueter_grille(0, 20, 0, 20, 90)
+
+    # Act
+    etiquettes = etiqueter_grille_parallele(points, 0, 20, 0, 20, 90, workers=2, hauteur_bande=16)
+
+    # Assert
+    assert (etiquettes == attendu).all()
+
+
+@pytest.mark.parametrize("index", ["kdtree", "grille", "lineaire"])
+def test_should_match_brute_force_grid_given_adaptive_renderer(index):
+    # Arrange
+    rng = Random(3)
+    points = [(rng.uniform(0, 20), rng.uniform(0, 20)) for _ in range(30)]
+    points += [(rng.randint(0, 20), rng.randint(0, 20)) for _ in range(10)]
+    calculateur = CalculerGerme(points, index=index)
+    rendu = RenduAdaptatif(calculateur)
+
+    # Act
+    etiquettes = rendu.etiqueter_grille(0, 20, 0, 20, 200)
+
+    # Assert
+    assert (etiquettes == calculateur.etiqueter_grille(0, 20, 0, 20, 200)).all()
+    assert rendu.requetes < 200 * 200 / 2
+
+
+def test_should_fill_whole_grid_given_single_seed():
+    # Arrange
+    rendu = RenduAdaptatif(CalculerGerme([(3, 4)]))
+
+    # Act
+    etiquettes = rendu.etiqueter_grille(0, 20, 0, 20, 64)
+
+    # Assert
+    assert (etiquettes == 0).all()
+    assert rendu.requetes == 5
+
+
+def test_should_mostly_match_exact_labels_given_jump_flooding():
+    # Arrange
+    rng = Random(4)
+    points = [(rng.uniform(0, 20), rng.uniform(0, 20)) for _ in range(200)]
+    calculateur = CalculerGerme(points)
+    exact = calculateur.etiqueter_grille(0, 20, 0, 20, 150)
+
+    # Act
+    etiquettes = RenduJFA(calculateur).etiqueter_grille(0, 20, 0, 20, 150)
+
+    # Assert
+    assert taux_erreur(etiquettes, exact) < 0.02
+
+
+def test_should_match_exact_labels_given_jump_flooding_with_correction():
+    # Arrange
+    rng = Random(5)
+    points = [(rng.uniform(0, 20), rng.uniform(0, 20)) for _ in range(500)]
+    points += [(1, 1), (1, 1), (1.01, 1)]
+    calculateur = CalculerGerme(points)
+    exact = calculateur.etiqueter_grille(0, 20, 0, 20, 100)
+
+    # Act
+    etiquettes = RenduJFA(calculateur, correction=True).etiqueter_grille(0, 20, 0, 20, 100)
+
+    # Assert
+    assert (etiquettes == exact).all()
+
+
+def test_should_write_one_png_per_input_without_pyplot_given_cli(tmp_path):
+    # Arrange
+    for nom in ("a", "b"):
+        with open(tmp_path / f"{nom}.txt", 'w') as f:
+            f.write("2,4\n5.3,4.5\n18,19\n12.5,13.7")
+    phase_1 = os.path.join(os.path.dirname(__file__), os.pardir)
+    code = ("import sys, main; main.main(sys.argv[1:]); "
+            "assert 'matplotlib.pyplot' not in sys.modules")
+
+    # Act
+    resultat = subprocess.run(
+        [sys.executable, "-c", code, str(tmp_path / "a.txt"), str(tmp_path / "b.txt"),
+         "-N", "40", "--moteur", "quadtree", "--sortie", str(tmp_path / "images")],
+        cwd=phase_1, capture_output=True, text=True)
+
+    # Assert
+    assert resultat.returncode == 0, resultat.stderr
+    assert sorted(os.listdir(tmp_path / "images")) == ["a.png", "b.png"]
+    assert "etiquetage" in resultat.stdout
+
+
+def test_should_count_each_stage_given_shared_measures(tmp_path):
+    # Arrange
+    tmp = tmp_path / "points.txt"
+    with open(tmp, 'w') as f:
+        f.write("2,4\n5.3,4.5\n18,19\n12.5,13.7")
+    mesures = Mesures()
+
+    # Act
+    points = LirePoints(tmp, mesures=mesures).load_array()
+    calculateur = CalculerGerme(points, mesures=mesures)
+    etiquettes = calculateur.etiqueter_grille(0, 20, 0, 20, 30)
+    Visualisation(0, 20, 0, 20, 30, mesures=mesures).colorier(etiquettes, points)
+
+    # Assert
+    assert mesures.compteurs["points_lus"] == 4
+    assert mesures.compteurs["cases_etiquetees"] == 900
+    assert mesures.compteurs["distances_calculees"] >= 900
+    assert {"lecture", "index", "etiquetage", "coloriage"} <= set(mesures.durees)
+
+
+def test_should_export_measures_and_profile_given_cli_options(tmp_path):
+    # Arrange
+    with open(tmp_path / "a.txt", 'w') as f:
+        f.write("2,4\n5.3,4.5\n18,19\n12.5,13.7")
+    phase_1 = os.path.join(os.path.dirname(__file__), os.pardir)
+
+    # Act
+    resultat = subprocess.run(
+        [sys.executable, "main.py", str(tmp_path / "a.txt"), "-N", "20",
+         "--sortie", str(tmp_path / "a.png"), "--mesures-json", str(tmp_path / "mesures.json"),
+         "--profil", str(tmp_path / "main.prof"), "--tracemalloc"],
+        cwd=phase_1, capture_output=True, text=True)
+
+    # Assert
+    assert resultat.returncode == 0, resultat.stderr
+    with open(tmp_path / "mesures.json") as f:
+        mesures = json.load(f)[str(tmp_path / "a.txt")]
+    assert mesures["compteurs"]["cases_etiquetees"] == 400
+    assert mesures["compteurs"]["memoire_pic_octets"] > 0
+    assert "ecriture_png" in mesures["durees"]
+    assert os.path.getsize(tmp_path / "main.prof") > 0
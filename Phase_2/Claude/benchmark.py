@@ -0,0 +1,127 @@
+import random
+import time
+from fractions import Fraction
+
+from voronoi import circumcircle, incircle, orientation, bowyer_watson, cercle_filtre, Triangulation
+
+# ─────────────────────────────────────────────
+# ANCIENS TESTS EN FLOTTANTS (référence)
+# ─────────────────────────────────────────────
+
+def dans_cercle_flottant(a, b, c, d):
+    """Critère de la version naïve : cercle recalculé, dist < r - 1e-10."""
+    cc = circumcircle(a, b, c)
+    if cc is None:
+        return False
+    return ((d[0] - cc[0])**2 + (d[1] - cc[1])**2) ** 0.5 < cc[2] - 1e-10
+
+def dans_cercle_cache(cx, cy, seuil, d):
+    dx, dy = d[0] - cx, d[1] - cy
+    return dx * dx + dy * dy < seuil
+
+def orientation_flottante(a, b, c):
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+def incircle_exact(a, b, c, d):
+    ax, ay, bx, by, cx, cy, dx, dy = map(Fraction, (*a, *b, *c, *d))
+    adx, ady, bdx, bdy, cdx, cdy = ax - dx, ay - dy, bx - dx, by - dy, cx - dx, cy - dy
+    return ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+            + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+            + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+
+
+# ─────────────────────────────────────────────
+# MESURES
+# ─────────────────────────────────────────────
+
+def chronometrer(fonction, quadruplets):
+    debut = time.perf_counter()
+    for q in quadruplets:
+        fonction(*q)
+    return time.perf_counter() - debut
+
+def quadruplets_aleatoires(n, rng):
+    quadruplets = []
+    while len(quadruplets) < n:
+        a, b, c, d = [(rng.uniform(0, 1000), rng.uniform(0, 1000)) for _ in range(4)]
+        if orientation_flottante(a, b, c) < 0:
+            b, c = c, b
+        quadruplets.append((a, b, c, d))
+    return quadruplets
+
+def quadruplets_cocirculaires(n, rng, decalage):
+    """Sommets d'une grille entière décalée : beaucoup de quadruplets cocirculaires."""
+    quadruplets = []
+    while len(quadruplets) < n:
+        a, b, c, d = [(decalage + rng.randrange(8), decalage + rng.randrange(8)) for _ in range(4)]
+        a, b, c, d = [(float(x), float(y)) for x, y in (a, b, c, d)]
+        o = orientation_flottante(a, b, c)
+        if o == 0:
+            continue
+        if o < 0:
+            b, c = c, b
+        quadruplets.append((a, b, c, d))
+    return quadruplets
+
+def benchmark():
+    rng = random.Random(0)
+    n = 200000
+
+    print("Coût par test sur des entrées aléatoires (chemin rapide)")
+    print(f"{'Test':<40} | {'ns / appel':<10}")
+    print("-" * 55)
+    quadruplets = quadruplets_aleatoires(n, rng)
+    triplets = [q[:3] for q in quadruplets]
+    # Cercles précalculés, comme dans la triangulation avant les prédicats exacts
+    cercles = []
+    for a, b, c, d in quadruplets:
+        cx, cy, r = circumcircle(a, b, c)
+        cercles.append((cx, cy, (r - 1e-10)**2, d))
+    # Test de cavité de la triangulation : cercle filtré, incircle près du cercle
+    triangulation = Triangulation()
+    filtres = []
+    for k, (a, b, c, d) in enumerate(quadruplets):
+        triangulation.points += [a, b, c]
+        triangulation.sommets.append((3 * k, 3 * k + 1, 3 * k + 2))
+        triangulation.cercles.append(cercle_filtre(a, b, c))
+        filtres.append((k, d))
+    for nom, fonction, donnees in (
+            ("dans le cercle, flottants (ancien)", dans_cercle_flottant, quadruplets),
+            ("dans le cercle mis en cache (ancien)", dans_cercle_cache, cercles),
+            ("incircle adaptatif", incircle, quadruplets),
+            ("cercle filtré + incircle (triangulation)", triangulation._dans_cercle, filtres),
+            ("orientation, flottants (ancien)", orientation_flottante, triplets),
+            ("orientation adaptative", orientation, triplets)):
+        duree = chronometrer(fonction, donnees)
+        print(f"{nom:<40} | {duree / n * 1e9:<10.0f}")
+
+    print()
+    print("Cas dégénérés : grille 8 x 8 décalée (points cocirculaires)")
+    print(f"{'Décalage':<10} | {'Erreurs flottantes':<18} | {'Erreurs adaptatif':<17}")
+    print("-" * 52)
+    for decalage in (0.0, 1e6, 1e9):
+        quadruplets = quadruplets_cocirculaires(5000, rng, decalage)
+        erreurs_flottant = erreurs_adaptatif = 0
+        for q in quadruplets:
+            attendu = incircle_exact(*q) > 0
+            erreurs_flottant += dans_cercle_flottant(*q) != attendu
+            erreurs_adaptatif += (incircle(*q) > 0) != attendu
+        print(f"{decalage:<10.0e} | {erreurs_flottant:<18} | {erreurs_adaptatif:<17}")
+
+    print()
+    print("Triangulation de Delaunay (bowyer_watson)")
+    for taille in (10000, 100000):
+        points = [(rng.uniform(0, 1000), rng.uniform(0, 1000)) for _ in range(taille)]
+        debut = time.perf_counter()
+        triangles = bowyer_watson(points)
+        print(f"{taille} points aléatoires : {len(triangles)} triangles en "
+              f"{time.perf_counter() - debut:.2f} s")
+    grille = [(1e9 + x, 1e9 + y) for x in range(12) for y in range(12)]
+    debut = time.perf_counter()
+    triangles = bowyer_watson(grille)
+    print(f"grille 12 x 12 décalée de 1e9 : {len(triangles)} triangles (242 attendus) en "
+          f"{time.perf_counter() - debut:.2f} s")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -3,12 +3,16 @@ import unittest
 from voronoi import (
     lire_points,
     circumcircle,
+    orientation,
+    incircle,
+    cercle_filtre,
     super_triangle,
     bowyer_watson,
+    Triangulation,
     calculer_bbox,
     clipper_segment,
     extraire_voronoi,
-    obtenir_cellules,
+    calculer_cellules,
     ordonner_polygone
 )
 
@@ -55,6 +59,29 @@ class TestLirePoints(unittest.TestCase):
         self.assertEqual(points[1], (0.0, -1.0))
 
 
+    def test_lecture_binaire(self):
+        """Un fichier binaire .vpts est reconnu et lu sans analyse du texte."""
+        import tempfile, os, struct
+        with tempfile.NamedTemporaryFile(suffix='.vpts', delete=False) as f:
+            f.write(struct.pack("<6sBcQ", b"VORPTS", 1, b"f", 2))
+            f.write(struct.pack("<4f", 2, 4, -3.5, 0.25))
+            nom = f.name
+        points = lire_points(nom)
+        os.unlink(nom)
+        self.assertEqual(points, [(2.0, 4.0), (-3.5, 0.25)])
+
+    def test_lecture_binaire_tronquee(self):
+        """Un fichier .vpts plus court que l'en-tête ne l'annonce est refusé."""
+        import tempfile, os, struct
+        with tempfile.NamedTemporaryFile(suffix='.vpts', delete=False) as f:
+            f.write(struct.pack("<6sBcQ", b"VORPTS", 1, b"d", 3))
+            f.write(struct.pack("<4d", 2, 4, -3.5, 0.25))
+            nom = f.name
+        with self.assertRaises(ValueError):
+            lire_points(nom)
+        os.unlink(nom)
+
+
 # ─────────────────────────────────────────────
 # 2. TESTS CERCLE CIRCONSCRIT
 # ─────────────────────────────────────────────
@@ -98,6 +125,76 @@ class TestCircumcircle(unittest.TestCase):
             self.assertAlmostEqual(dist, r, places=5)
 
 
+class TestPredicats(unittest.TestCase):
+
+    @staticmethod
+    def incircle_exact(a, b, c, d):
+        from fractions import Fraction
+        ax, ay, bx, by, cx, cy, dx, dy = map(Fraction, (*a, *b, *c, *d))
+        adx, ady, bdx, bdy, cdx, cdy = ax - dx, ay - dy, bx - dx, by - dy, cx - dx, cy - dy
+        return ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+                + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+                + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+
+    def test_orientation_signe(self):
+        self.assertGreater(orientation((0, 0), (1, 0), (0, 1)), 0)
+        self.assertLess(orientation((0, 0), (0, 1), (1, 0)), 0)
+        self.assertEqual(orientation((0, 0), (1, 1), (2, 2)), 0)
+
+    def test_orientation_presque_alignes(self):
+        """Le calcul flottant se trompe de signe ici ; le résultat doit être exact."""
+        a, b = (0.5, 0.5), (12.0, 12.0)
+        self.assertEqual(orientation(a, b, (24.0, 24.0)), 0)
+        c = (0.5 + 2.0 ** -52, 0.5)
+        self.assertLess(orientation(a, b, c), 0)
+        self.assertGreater(orientation(b, a, c), 0)
+
+    def test_incircle_signe(self):
+        a, b, c = (0, 0), (4, 0), (0, 4)
+        self.assertGreater(incircle(a, b, c, (1, 1)), 0)
+        self.assertLess(incircle(a, b, c, (5, 5)), 0)
+        self.assertEqual(incircle(a, b, c, (4, 4)), 0)
+
+    def test_incircle_grille_decalee(self):
+        """Quadruplets d'une grille entière décalée de 1e9 : signe exact,
+        y compris pour les points cocirculaires."""
+        import random
+        rng = random.Random(3)
+        zeros = 0
+        for _ in range(2000):
+            a, b, c, d = [(1e9 + rng.randrange(6), 1e9 + rng.randrange(6)) for _ in range(4)]
+            if orientation(a, b, c) == 0:
+                continue
+            attendu = self.incircle_exact(a, b, c, d)
+            obtenu = incircle(a, b, c, d)
+            self.assertEqual((obtenu > 0) - (obtenu < 0), (attendu > 0) - (attendu < 0))
+            zeros += attendu == 0
+        self.assertGreater(zeros, 0)
+        self.assertEqual(incircle((1e9, 1e9), (1e9 + 3, 1e9), (1e9 + 3, 1e9 + 2), (1e9, 1e9 + 2)), 0)
+
+    def test_cercle_filtre(self):
+        """Le filtre du test de cavité ne tranche que quand il a raison."""
+        import random
+        rng = random.Random(5)
+        tranches = 0
+        for decalage, tirer in ((0.0, lambda: rng.uniform(0, 100)), (1e9, lambda: rng.randrange(6))):
+            for _ in range(2000):
+                a, b, c, d = [(decalage + tirer(), decalage + tirer()) for _ in range(4)]
+                o = orientation(a, b, c)
+                if o == 0:
+                    self.assertIsNone(cercle_filtre(a, b, c))
+                    continue
+                if o < 0:
+                    b, c = c, b
+                ax, ay, ux, uy, bas, haut = cercle_filtre(a, b, c)
+                dx, dy = d[0] - ax - ux, d[1] - ay - uy
+                d2 = dx * dx + dy * dy
+                if d2 < bas or d2 > haut:
+                    tranches += 1
+                    self.assertEqual(d2 < bas, self.incircle_exact(a, b, c, d) > 0)
+        self.assertGreater(tranches, 2000)
+
+
 # ─────────────────────────────────────────────
 # 3. TESTS SUPER TRIANGLE
 # ─────────────────────────────────────────────
@@ -179,6 +276,69 @@ class TestBowyerWatson(unittest.TestCase):
             for sommet in tri:
                 self.assertNotIn(sommet, st)
 
+    def test_delaunay_sur_nuage_aleatoire(self):
+        """Nuage plus grand avec doublons : chaque point est un sommet et
+        aucun point n'est dans un cercle circonscrit."""
+        import random
+        rng = random.Random(7)
+        points = [(round(rng.uniform(0, 100), 1), round(rng.uniform(0, 100), 1))
+                  for _ in range(300)]
+        points += points[:10]
+        triangles = bowyer_watson(points)
+        self.assertEqual({p for tri in triangles for p in tri}, set(points))
+        for tri in triangles:
+            cx, cy, r = circumcircle(*tri)
+            for p in points:
+                if p not in tri:
+                    self.assertGreaterEqual(math.hypot(p[0]-cx, p[1]-cy), r - 1e-9)
+
+
+    def test_grille_decalee_de_1e9(self):
+        """Grille 12 x 12 loin de l'origine : 2n - h - 2 = 242 triangles."""
+        grille = [(1e9 + x, 1e9 + y) for x in range(12) for y in range(12)]
+        triangles = bowyer_watson(grille)
+        self.assertEqual(len(triangles), 242)
+        self.assertEqual({p for tri in triangles for p in tri}, set(grille))
+
+
+class TestTriangulationIncrementale(unittest.TestCase):
+
+    def setUp(self):
+        import random
+        rng = random.Random(11)
+        self.points = [(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(80)]
+
+    @staticmethod
+    def normaliser(triangles):
+        return sorted(tuple(sorted(t)) for t in triangles)
+
+    def test_insertion_puis_suppression_rend_la_meme_triangulation(self):
+        tri = Triangulation(self.points[:60])
+        avant = self.normaliser(tri.triangles())
+        ajoutes = [tri.inserer(p) for p in self.points[60:]]
+        self.assertEqual(self.normaliser(tri.triangles()),
+                         self.normaliser(bowyer_watson(self.points)))
+        for i in reversed(ajoutes):
+            tri.supprimer(i)
+        self.assertEqual(self.normaliser(tri.triangles()), avant)
+
+    def test_sites_modifies_sont_les_voisins(self):
+        tri = Triangulation(self.points)
+        i = tri.inserer((50.5, 49.5))
+        voisins = {j for t, a, b in tri.eventail(i) for j in (a, b) if j > 2}
+        self.assertEqual(tri.modifies, voisins | {i})
+        tri.supprimer(i)
+        self.assertEqual(tri.modifies, voisins)
+
+    def test_cellule_identique_au_calcul_global(self):
+        tri = Triangulation(self.points)
+        bbox = calculer_bbox(self.points)
+        sommets, debuts = calculer_cellules(self.points, tri.triangles(), bbox)
+        for k, i in enumerate(tri.indices):
+            attendu = {tuple(round(c, 9) for c in s) for s in sommets[debuts[k]:debuts[k + 1]]}
+            obtenu = {tuple(round(c, 9) for c in s) for s in tri.cellule(i, bbox)}
+            self.assertEqual(obtenu, attendu)
+
 
 # ─────────────────────────────────────────────
 # 5. TESTS BOUNDING BOX ET CLIPPING
@@ -214,6 +374,93 @@ class TestBboxEtClipping(unittest.TestCase):
         self.assertAlmostEqual(seg[1][1], 5)
 
 
+class TestExtraireVoronoi(unittest.TestCase):
+
+    def test_un_triangle_trois_aretes_semi_infinies(self):
+        """Un seul triangle : trois demi-droites issues du circumcentre."""
+        points = [(0, 0), (4, 0), (2, 3)]
+        triangles = bowyer_watson(points)
+        aretes, circumcentres = extraire_voronoi(points, triangles)
+        centre = circumcentres[triangles[0]]
+        self.assertEqual(len(aretes), 3)
+        for debut, _ in aretes:
+            self.assertAlmostEqual(debut[0], centre[0])
+            self.assertAlmostEqual(debut[1], centre[1])
+
+    def test_aretes_interieures_entre_triangles_voisins(self):
+        """Chaque arête intérieure relie les circumcentres de deux triangles adjacents."""
+        points = [(0, 0), (4, 0), (4, 4), (0, 5), (2, 2)]
+        triangles = bowyer_watson(points)
+        aretes, circumcentres = extraire_voronoi(points, triangles)
+        interieures = sum(
+            1 for i, t1 in enumerate(triangles) for t2 in triangles[i+1:]
+            if len(set(t1) & set(t2)) == 2)
+        centres = set(circumcentres.values())
+        relient = [a for a in aretes if a[0] in centres and a[1] in centres]
+        self.assertEqual(len(relient), interieures)
+
+
+class TestCellules(unittest.TestCase):
+
+    def test_cellules_pavent_la_bbox(self):
+        """Les cellules clippées recouvrent exactement la bbox, sans chevauchement."""
+        import random
+        rng = random.Random(3)
+        points = [(rng.uniform(0, 50), rng.uniform(0, 50)) for _ in range(40)]
+        bbox = calculer_bbox(points)
+        sommets, debuts = calculer_cellules(points, bowyer_watson(points), bbox)
+        self.assertEqual(len(debuts), len(points) + 1)
+        aire = 0.0
+        for k in range(len(points)):
+            poly = sommets[debuts[k]:debuts[k + 1]]
+            self.assertGreaterEqual(len(poly), 3)
+            aire += 0.5 * abs(sum(poly[i - 1][0] * poly[i][1] - poly[i][0] * poly[i - 1][1]
+                                  for i in range(len(poly))))
+        self.assertAlmostEqual(aire, (bbox[1] - bbox[0]) * (bbox[3] - bbox[2]), places=6)
+
+    def test_sites_repetes(self):
+        """Les copies d'un site ont une cellule vide : les aires somment à la bbox."""
+        import random
+        rng = random.Random(4)
+        points = [(rng.randint(0, 20), rng.randint(0, 20)) for _ in range(60)]
+        points += points[:15]
+        bbox = calculer_bbox(points)
+        sommets, debuts = calculer_cellules(points, bowyer_watson(points), bbox)
+        aire = 0.0
+        vus = set()
+        for k, p in enumerate(points):
+            poly = sommets[debuts[k]:debuts[k + 1]]
+            if p in vus:
+                self.assertEqual(len(poly), 0)
+            vus.add(p)
+            aire += 0.5 * abs(sum(poly[i - 1][0] * poly[i][1] - poly[i][0] * poly[i - 1][1]
+                                  for i in range(len(poly))))
+        self.assertAlmostEqual(aire, (bbox[1] - bbox[0]) * (bbox[3] - bbox[2]), places=6)
+
+    def test_sommets_equidistants_des_sites_voisins(self):
+        """Les sommets intérieurs d'une cellule sont plus proches de son site que des autres."""
+        points = [(0, 0), (4, 0), (4, 4), (0, 5), (2, 2)]
+        bbox = calculer_bbox(points)
+        sommets, debuts = calculer_cellules(points, bowyer_watson(points), bbox)
+        for k, site in enumerate(points):
+            for s in sommets[debuts[k]:debuts[k + 1]]:
+                d_site = math.dist(s, site)
+                self.assertTrue(all(math.dist(s, p) >= d_site - 1e-9 for p in points))
+
+    def test_sommets_precis_loin_de_l_origine(self):
+        """Décalés de 1e6, les sommets intérieurs restent équidistants de
+        leurs trois sites les plus proches."""
+        import random
+        rng = random.Random(8)
+        points = [(1e6 + rng.uniform(0, 100), 1e6 + rng.uniform(0, 100)) for _ in range(150)]
+        bbox = calculer_bbox(points)
+        sommets, _ = calculer_cellules(points, bowyer_watson(points), bbox)
+        for s in sommets:
+            if bbox[0] < s[0] < bbox[1] and bbox[2] < s[1] < bbox[3]:
+                d = sorted(math.dist(s, p) for p in points)[:3]
+                self.assertLess(d[2] - d[0], 1e-7)
+
+
 # ─────────────────────────────────────────────
 # 6. TESTS ORDONNER POLYGONE
 # ─────────────────────────────────────────────
@@ -1,13 +1,48 @@
 import math
+import os
+import random
+import struct
+import sys
+from array import array
+from fractions import Fraction
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import matplotlib.colors as mcolors
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.path import Path
 
 # ─────────────────────────────────────────────
 # 1. LECTURE DU FICHIER
 # ─────────────────────────────────────────────
  
+# Fichiers binaires .vpts : format décrit dans Phase_1/Diagramme/PointsBinaires.py
+MAGIQUE_VPTS = b"VORPTS"
+ENTETE_VPTS = struct.Struct("<6sBcQ")
+
+def est_fichier_binaire(fichier):
+    with open(fichier, 'rb') as f:
+        return f.read(len(MAGIQUE_VPTS)) == MAGIQUE_VPTS
+
+def lire_points_binaires(fichier):
+    with open(fichier, 'rb') as f:
+        entete = f.read(ENTETE_VPTS.size)
+        if len(entete) < ENTETE_VPTS.size:
+            raise ValueError(f"En-tête binaire tronqué : {fichier}")
+        magique, version, code, n = ENTETE_VPTS.unpack(entete)
+        if magique != MAGIQUE_VPTS or version != 1 or code not in (b'd', b'f'):
+            raise ValueError(f"En-tête binaire invalide : {fichier}")
+        coords = array(code.decode())
+        if os.fstat(f.fileno()).st_size != ENTETE_VPTS.size + 2 * coords.itemsize * n:
+            raise ValueError(f"Taille incohérente avec les {n} points annoncés : {fichier}")
+        coords.fromfile(f, 2 * n)
+    if sys.byteorder == 'big':
+        coords.byteswap()
+    return list(zip(coords[0::2], coords[1::2]))
+
 def lire_points(fichier):
+    if est_fichier_binaire(fichier):
+        return lire_points_binaires(fichier)
     points = []
     with open(fichier, 'r') as f:
         for ligne in f:
@@ -23,15 +58,114 @@ def lire_points(fichier):
 
 
 # ─────────────────────────────────────────────
-# 2. CERCLE CIRCONSCRIT
+# 2. PRÉDICATS GÉOMÉTRIQUES ET CERCLE CIRCONSCRIT
 # ─────────────────────────────────────────────
 
+# Prédicats adaptatifs à la Shewchuk : le déterminant est d'abord calculé en
+# flottants, et son signe n'est accepté que s'il dépasse la borne d'erreur
+# d'arrondi (proportionnelle à la somme des valeurs absolues des termes).
+# Sinon, il est recalculé exactement en rationnels : les flottants sont des
+# fractions dyadiques, donc Fraction ne fait aucune approximation.
+EPSILON = 2.0 ** -53
+BORNE_ORIENTATION = (3.0 + 16.0 * EPSILON) * EPSILON
+BORNE_CERCLE = (10.0 + 96.0 * EPSILON) * EPSILON
+
+def orientation(a, b, c):
+    """> 0 si a, b, c tournent dans le sens trigonométrique, < 0 dans le sens
+    horaire, 0 s'ils sont alignés (signe exact)."""
+    gauche = (a[0] - c[0]) * (b[1] - c[1])
+    droite = (a[1] - c[1]) * (b[0] - c[0])
+    det = gauche - droite
+    if gauche > 0:
+        if droite <= 0:
+            return det
+        somme = gauche + droite
+    elif gauche < 0:
+        if droite >= 0:
+            return det
+        somme = -gauche - droite
+    else:
+        return det
+    if det > BORNE_ORIENTATION * somme or -det > BORNE_ORIENTATION * somme:
+        return det
+    ax, ay, bx, by, cx, cy = map(Fraction, (a[0], a[1], b[0], b[1], c[0], c[1]))
+    return (ax - cx) * (by - cy) - (ay - cy) * (bx - cx)
+
+def incircle(a, b, c, d):
+    """> 0 si d est strictement dans le cercle circonscrit de a, b, c (sens
+    trigonométrique), < 0 s'il est dehors, 0 s'il est dessus (signe exact)."""
+    adx, ady = a[0] - d[0], a[1] - d[1]
+    bdx, bdy = b[0] - d[0], b[1] - d[1]
+    cdx, cdy = c[0] - d[0], c[1] - d[1]
+    bdxcdy, cdxbdy = bdx * cdy, cdx * bdy
+    cdxady, adxcdy = cdx * ady, adx * cdy
+    adxbdy, bdxady = adx * bdy, bdx * ady
+    alift = adx * adx + ady * ady
+    blift = bdx * bdx + bdy * bdy
+    clift = cdx * cdx + cdy * cdy
+    det = alift * (bdxcdy - cdxbdy) + blift * (cdxady - adxcdy) + clift * (adxbdy - bdxady)
+    permanent = ((abs(bdxcdy) + abs(cdxbdy)) * alift
+                 + (abs(cdxady) + abs(adxcdy)) * blift
+                 + (abs(adxbdy) + abs(bdxady)) * clift)
+    if abs(det) > BORNE_CERCLE * permanent:
+        return det
+    ax, ay, bx, by, cx, cy, dx, dy = map(Fraction, (a[0], a[1], b[0], b[1], c[0], c[1], d[0], d[1]))
+    adx, ady, bdx, bdy, cdx, cdy = ax - dx, ay - dy, bx - dx, by - dy, cx - dx, cy - dy
+    return ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+            + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+            + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+
+def dans_cercle(a, b, c, d):
+    """Vrai si d est strictement dans le cercle circonscrit de a, b, c (sens trigo)."""
+    return incircle(a, b, c, d) > 0
+
+# Filtre du test de cavité : le cercle est calculé relativement au sommet a,
+# l'erreur sur son centre majorée par FILTRE_CENTRE x conditionnement x
+# EPSILON x rayon, celle sur le carré de la distance d'un point au centre
+# par FILTRE_DISTANCE x EPSILON x (d² + r²). Seuls les points dont la
+# distance au centre tombe dans cette marge passent par incircle.
+FILTRE_CENTRE = 32.0
+FILTRE_DISTANCE = 32.0
+
+def cercle_filtre(a, b, c):
+    """(ax, ay, ux, uy, bas, haut) pour le cercle circonscrit de a, b, c :
+    un point p dont le carré de la distance au centre (ax + ux, ay + uy)
+    est sous bas est sûrement dedans, au-dessus de haut sûrement dehors.
+    None si a, b, c sont exactement alignés ou si le calcul flottant est
+    dégénéré (incircle décide alors seul)."""
+    bx, by = b[0] - a[0], b[1] - a[1]
+    cx, cy = c[0] - a[0], c[1] - a[1]
+    det = bx * cy - by * cx
+    # Au-delà de cette borne, les différences arrondies ne peuvent pas venir
+    # de points alignés : l'orientation exacte n'est demandée qu'en deçà
+    if abs(det) <= 8.0 * EPSILON * (abs(bx * cy) + abs(by * cx)) and (det == 0 or orientation(a, b, c) == 0):
+        return None
+    b2, c2 = bx * bx + by * by, cx * cx + cy * cy
+    ux = (cy * b2 - by * c2) / (2 * det)
+    uy = (bx * c2 - cx * b2) / (2 * det)
+    r2 = ux * ux + uy * uy
+    conditionnement = (b2 + c2) / abs(det)
+    # Marge 4 e sqrt(d² + r²) + FILTRE_DISTANCE EPSILON (d² + r²), e l'erreur
+    # sur le centre, majorée sans racine (sqrt(s) <= (s / r + r) / 2) par
+    # k1 (d² + r²) + k0 : les seuils s'en déduisent une fois pour toutes.
+    k1 = (2 * FILTRE_CENTRE * conditionnement + FILTRE_DISTANCE) * EPSILON
+    k0 = 2 * FILTRE_CENTRE * conditionnement * EPSILON * r2
+    bas = (r2 * (1 - k1) - k0) / (1 + k1)
+    haut = (r2 * (1 + k1) + k0) / (1 - k1) if k1 < 1 else math.inf
+    return (a[0], a[1], ux, uy, bas, haut)
+
+def centre_circonscrit(a, b, c):
+    """Centre du cercle circonscrit calculé relativement à a, comme celui
+    de Triangulation.centres ; None si a, b, c sont alignés."""
+    cercle = cercle_filtre(a, b, c)
+    return (cercle[0] + cercle[2], cercle[1] + cercle[3]) if cercle else None
+
 def circumcircle(p1, p2, p3):
     ax, ay = p1
     bx, by = p2
     cx, cy = p3
     D = 2 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
-    if abs(D) < 1e-10:
+    if D == 0 or orientation(p1, p2, p3) == 0:
         return None
     ux = ((ax**2 + ay**2) * (by - cy) +
           (bx**2 + by**2) * (cy - ay) +
@@ -59,41 +193,323 @@ def super_triangle(points):
         (min_x - delta,     min_y + 2 * delta)
     )
 
-def bowyer_watson(points):
-    st1, st2, st3 = super_triangle(points)
-    triangles = [(st1, st2, st3)]
-
-    for point in points:
-        invalides = []
-        for tri in triangles:
-            cc = circumcircle(*tri)
-            if cc is None:
-                continue
-            cx, cy, r = cc
-            if ((point[0] - cx)**2 + (point[1] - cy)**2) ** 0.5 < r - 1e-10:
-                invalides.append(tri)
+def cle_hilbert(x, y, ordre=16):
+    """Position du point entier (x, y) sur la courbe de Hilbert 2^ordre x 2^ordre."""
+    d = 0
+    s = 1 << (ordre - 1)
+    while s:
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        d += s * s * ((3 * rx) ^ ry)
+        if ry == 0:
+            if rx == 1:
+                x, y = s - 1 - x, s - 1 - y
+            x, y = y, x
+        s >>= 1
+    return d
+
+def ordre_insertion(points, graine=0):
+    """
+    Ordre BRIO : les points sont mélangés puis répartis en tours de tailles
+    doublantes, chaque tour étant trié le long d'une courbe de Hilbert.
+    Le hasard garantit un coût moyen O(n log n), la courbe de Hilbert que
+    chaque point tombe près du précédent pour la localisation par marche.
+    """
+    indices = list(range(len(points)))
+    random.Random(graine).shuffle(indices)
+    if not indices:
+        return indices
+    xs = [points[i][0] for i in indices]
+    ys = [points[i][1] for i in indices]
+    min_x, min_y = min(xs), min(ys)
+    echelle = ((1 << 16) - 1) / max(max(xs) - min_x, max(ys) - min_y, 1e-300)
+
+    def cle(i):
+        return cle_hilbert(int((points[i][0] - min_x) * echelle), int((points[i][1] - min_y) * echelle))
+
+    # Tours : les n/2^k premiers points, puis jusqu'à n/2^(k-1), ..., puis tous
+    bornes = [len(indices)]
+    while bornes[-1] > 64:
+        bornes.append(bornes[-1] // 2)
+    bornes.append(0)
+    bornes.reverse()
+    ordre = []
+    for debut, fin in zip(bornes, bornes[1:]):
+        ordre += sorted(indices[debut:fin], key=cle)
+    return ordre
+
+
+class Triangulation:
+    """
+    Triangulation de Delaunay incrémentale (Bowyer-Watson) avec adjacence.
+
+    Les triangles sont rangés dans des listes parallèles : sommets[t] donne
+    les indices (a, b, c) des trois sommets dans le sens trigonométrique,
+    voisins[t][k] le triangle qui partage l'arête opposée au sommet k
+    (-1 s'il n'y en a pas) et centres[t] le centre du cercle circonscrit,
+    calculé une seule fois ; cercles[t] (cf. cercle_filtre) tranche en
+    flottants le test de cavité, sauf près du cercle où incircle donne le
+    signe exact. Un point est localisé par marche depuis le dernier
+    triangle créé, puis la cavité est parcourue en profondeur (pile) de
+    voisin en voisin : une insertion ne touche que les triangles voisins
+    du point.
+
+    Les indices 0 à 2 sont les sommets du super-triangle ; indices[k] est
+    l'indice du k-ième point donné au constructeur (None pour un doublon).
+    Après chaque inserer() ou supprimer(), modifies contient les sites
+    dont la cellule a changé.
+    """
 
-        aretes = []
-        for tri in invalides:
-            p1, p2, p3 = tri
-            aretes += [(p1, p2), (p2, p3), (p3, p1)]
+    def __init__(self, points=()):
+        points = list(points)
+        self.points = []
+        self.sommets = []
+        self.voisins = []
+        self.centres = []
+        self.cercles = []
+        self.vivant = []
+        self.libres = []
+        self.dernier = 0
+        self.deja_vus = set()
+        self.triangle_de = []
+        self.modifies = set()
+        self.indices = [None] * len(points)
+        if points:
+            for p in super_triangle(points):
+                self.points.append(p)
+                self.triangle_de.append(0)
+            self._creer(0, 1, 2)
+            for i in ordre_insertion(points):
+                self.indices[i] = self.inserer(points[i])
+
+    def _creer(self, a, b, c):
+        pa, pb, pc = self.points[a], self.points[b], self.points[c]
+        # Centre calculé relativement à a (plus précis que circumcircle loin
+        # de l'origine) ; aucun cercle pour un triangle exactement plat
+        cercle = cercle_filtre(pa, pb, pc)
+        centre = (cercle[0] + cercle[2], cercle[1] + cercle[3]) if cercle else None
+        if self.libres:
+            t = self.libres.pop()
+            self.sommets[t] = (a, b, c)
+            self.voisins[t] = [-1, -1, -1]
+            self.centres[t] = centre
+            self.cercles[t] = cercle
+            self.vivant[t] = True
+        else:
+            t = len(self.sommets)
+            self.sommets.append((a, b, c))
+            self.voisins.append([-1, -1, -1])
+            self.centres.append(centre)
+            self.cercles.append(cercle)
+            self.vivant.append(True)
+        self.triangle_de[a] = self.triangle_de[b] = self.triangle_de[c] = t
+        return t
+
+    def _dans_cercle(self, t, p):
+        cercle = self.cercles[t]
+        if cercle is not None:
+            ax, ay, ux, uy, bas, haut = cercle
+            dx, dy = p[0] - ax - ux, p[1] - ay - uy
+            d2 = dx * dx + dy * dy
+            if d2 < bas:
+                return True
+            if d2 > haut:
+                return False
+        a, b, c = self.sommets[t]
+        return incircle(self.points[a], self.points[b], self.points[c], p) > 0
+
+    def localiser(self, p):
+        """Triangle contenant p, trouvé par marche depuis le dernier triangle créé."""
+        t = self.dernier
+        if not self.vivant[t]:
+            t = self.vivant.index(True)
+        depart = 0
+        while True:
+            sommets = self.sommets[t]
+            for k in range(3):
+                # Arête opposée à k parcourue en commençant par une arête variable
+                # pour que la marche ne tourne pas en rond.
+                k = (k + depart) % 3
+                a = self.points[sommets[(k + 1) % 3]]
+                b = self.points[sommets[(k + 2) % 3]]
+                # Première étape d'orientation() en ligne : l'appel n'a lieu
+                # que si le signe flottant n'est pas garanti
+                gauche = (a[0] - p[0]) * (b[1] - p[1])
+                droite = (a[1] - p[1]) * (b[0] - p[0])
+                det = gauche - droite
+                if abs(det) <= BORNE_ORIENTATION * (abs(gauche) + abs(droite)):
+                    det = orientation(a, b, p)
+                if det < 0 and self.voisins[t][k] >= 0:
+                    t = self.voisins[t][k]
+                    depart += 1
+                    break
+            else:
+                return t
 
-        aretes_ext = []
-        for i, (a, b) in enumerate(aretes):
-            dupliquee = any(
-                i != j and ((a == c and b == d) or (a == d and b == c))
-                for j, (c, d) in enumerate(aretes)
-            )
-            if not dupliquee:
-                aretes_ext.append((a, b))
+    def inserer(self, p):
+        """Ajoute le point p ; renvoie son indice, ou None s'il est déjà présent."""
+        self.modifies = set()
+        cle = (p[0], p[1])
+        if cle in self.deja_vus:
+            return None
+        self.deja_vus.add(cle)
+        i = len(self.points)
+        self.points.append(p)
+        self.triangle_de.append(-1)
+
+        # Cavité : triangles dont le cercle circonscrit contient p, connexes
+        # au triangle qui contient p.
+        depart = self.localiser(p)
+        cavite = {depart}
+        file = [depart]
+        while file:
+            t = file.pop()
+            for n in self.voisins[t]:
+                if n >= 0 and n not in cavite and self._dans_cercle(n, p):
+                    cavite.add(n)
+                    file.append(n)
+
+        # Chaque arête du bord de la cavité forme un nouveau triangle avec p.
+        par_debut = {}
+        par_fin = {}
+        nouveaux = []
+        for t in cavite:
+            sommets = self.sommets[t]
+            for k in range(3):
+                n = self.voisins[t][k]
+                if n in cavite:
+                    continue
+                a, b = sommets[(k + 1) % 3], sommets[(k + 2) % 3]
+                nouveau = self._creer(a, b, i)
+                self.voisins[nouveau][2] = n
+                if n >= 0:
+                    self.voisins[n][self.voisins[n].index(t)] = nouveau
+                par_debut[a] = nouveau
+                par_fin[b] = nouveau
+                nouveaux.append(nouveau)
+        for t in cavite:
+            self.vivant[t] = False
+            self.libres.append(t)
+        for nouveau in nouveaux:
+            a, b, _ = self.sommets[nouveau]
+            self.voisins[nouveau][0] = par_debut[b]
+            self.voisins[nouveau][1] = par_fin[a]
+        self.dernier = nouveaux[0]
+        self.modifies = {j for j in par_debut if j > 2}
+        self.modifies.add(i)
+        return i
+
+    def eventail(self, i):
+        """Triangles (t, a, b) autour du site i dans le sens trigonométrique,
+        (i, a, b) étant les sommets de t dans cet ordre."""
+        depart = t = self.triangle_de[i]
+        eventail = []
+        while True:
+            sommets = self.sommets[t]
+            k = sommets.index(i)
+            eventail.append((t, sommets[(k + 1) % 3], sommets[(k + 2) % 3]))
+            # Triangle suivant : celui qui partage l'arête (i, b), opposée à a
+            t = self.voisins[t][(k + 1) % 3]
+            if t == depart:
+                return eventail
+
+    def supprimer(self, i):
+        """
+        Retire le site i. Le trou laissé par son éventail est un polygone
+        étoilé, re-triangulé par oreilles successives : une oreille convexe
+        dont le cercle circonscrit ne contient aucun autre sommet du trou
+        est un triangle de Delaunay.
+        """
+        eventail = self.eventail(i)
+        bord = [a for _, a, _ in eventail]
+        exterieurs = {}
+        for t, a, b in eventail:
+            exterieurs[(a, b)] = (self.voisins[t][self.sommets[t].index(i)], t)
+
+        nouveaux = []
+        polygone = list(bord)
+        while len(polygone) > 3:
+            oreille = None
+            for j in range(len(polygone)):
+                a, b, c = polygone[j - 2], polygone[j - 1], polygone[j]
+                pa, pb, pc = self.points[a], self.points[b], self.points[c]
+                if orientation(pa, pb, pc) <= 0:
+                    continue
+                if oreille is None:
+                    oreille = j
+                if not any(dans_cercle(pa, pb, pc, self.points[d])
+                           for d in polygone if d not in (a, b, c)):
+                    oreille = j
+                    break
+            a, b, c = polygone[oreille - 2], polygone[oreille - 1], polygone[oreille]
+            nouveaux.append(self._creer(a, b, c))
+            del polygone[oreille - 1]
+        nouveaux.append(self._creer(*polygone))
+
+        # Adjacence : entre nouveaux triangles par arête opposée, et vers
+        # l'extérieur par les arêtes du bord.
+        par_arete = {}
+        for t in nouveaux:
+            sommets = self.sommets[t]
+            for k in range(3):
+                par_arete[(sommets[(k + 1) % 3], sommets[(k + 2) % 3])] = (t, k)
+        for (a, b), (t, k) in par_arete.items():
+            if (a, b) in exterieurs:
+                n, ancien = exterieurs[(a, b)]
+                self.voisins[t][k] = n
+                if n >= 0:
+                    self.voisins[n][self.voisins[n].index(ancien)] = t
+            else:
+                self.voisins[t][k] = par_arete[(b, a)][0]
+        # Libérés seulement maintenant, pour qu'aucun nouveau triangle ne
+        # reprenne l'indice d'un ancien encore référencé par ses voisins.
+        for t, _, _ in eventail:
+            self.vivant[t] = False
+            self.libres.append(t)
+
+        p = self.points[i]
+        self.deja_vus.discard((p[0], p[1]))
+        self.triangle_de[i] = -1
+        self.dernier = nouveaux[0]
+        self.modifies = {j for j in bord if j > 2}
+
+    def cellule(self, i, bbox):
+        """Polygone clippé de la cellule du site i, lu sur l'adjacence."""
+        eventail = self.eventail(i)
+        # Les triangles touchant le super-triangle sont hors de l'enveloppe :
+        # on commence juste après eux pour obtenir l'éventail ouvert.
+        reels = [min(self.sommets[t]) > 2 for t, _, _ in eventail]
+        if not any(reels):
+            return []
+        ouvert = not all(reels)
+        if ouvert:
+            debut = next(k for k in range(len(eventail)) if reels[k] and not reels[k - 1])
+            eventail = eventail[debut:] + eventail[:debut]
+            reels = reels[debut:] + reels[:debut]
+            eventail = eventail[:reels.index(False)]
+        centres = []
+        for t, a, b in eventail:
+            centre = self.centres[t]
+            if centre is None:
+                pa, pb = self.points[a], self.points[b]
+                p = self.points[i]
+                centre = ((p[0] + pa[0] + pb[0]) / 3, (p[1] + pa[1] + pb[1]) / 3)
+            centres.append(centre)
+        site = self.points[i]
+        if not ouvert:
+            return polygone_cellule(site, centres, bbox)
+        return polygone_cellule(site, centres, bbox,
+                                self.points[eventail[0][1]], self.points[eventail[-1][2]])
+
+    def triangles(self):
+        """Triangles sans sommet du super-triangle, au format de bowyer_watson."""
+        return [tuple(self.points[i] for i in sommets)
+                for sommets, vivant in zip(self.sommets, self.vivant)
+                if vivant and min(sommets) > 2]
 
-        for t in invalides:
-            triangles.remove(t)
-        for arete in aretes_ext:
-            triangles.append((arete[0], arete[1], point))
 
-    st_pts = {st1, st2, st3}
-    return [t for t in triangles if not any(p in st_pts for p in t)]
+def bowyer_watson(points):
+    return Triangulation(points).triangles()
 
 
 # ─────────────────────────────────────────────
@@ -139,59 +555,67 @@ def clipper_segment(p1, p2, bbox):
             else:
                 x2, y2, c2 = x, y, code((x, y))
 
+def cle_arete(a, b):
+    return (a, b) if a <= b else (b, a)
+
 def extraire_voronoi(points, triangles):
     bbox = calculer_bbox(points)
     min_x, max_x, min_y, max_y = bbox
 
+    # Centres relatifs au premier sommet, identiques à ceux de la
+    # triangulation : précis même loin de l'origine
     circumcentres = {}
     for tri in triangles:
-        cc = circumcircle(*tri)
-        if cc is not None:
-            circumcentres[tri] = (cc[0], cc[1])
+        centre = centre_circonscrit(*tri)
+        if centre is not None:
+            circumcentres[tri] = centre
+
+    # Table arête -> triangles qui la portent : chaque arête intérieure est
+    # partagée par exactement deux triangles, une arête de l'enveloppe par un seul.
+    par_arete = {}
+    for i, tri in enumerate(triangles):
+        p1, p2, p3 = tri
+        for a, b in ((p1, p2), (p2, p3), (p3, p1)):
+            par_arete.setdefault(cle_arete(a, b), []).append(i)
 
     aretes = []
 
-    # Arêtes intérieures
+    # Arêtes intérieures, dans l'ordre des paires (i, j) avec i < j
     for i, t1 in enumerate(triangles):
-        for j, t2 in enumerate(triangles):
-            if j <= i:
-                continue
-            communs = [p for p in t1 if p in t2]
-            if len(communs) == 2 and t1 in circumcentres and t2 in circumcentres:
+        p1, p2, p3 = t1
+        voisins = set()
+        for a, b in ((p1, p2), (p2, p3), (p3, p1)):
+            voisins.update(j for j in par_arete[cle_arete(a, b)] if j > i)
+        for j in sorted(voisins):
+            t2 = triangles[j]
+            if t1 in circumcentres and t2 in circumcentres:
                 seg = clipper_segment(circumcentres[t1], circumcentres[t2], bbox)
                 if seg:
                     aretes.append(seg)
 
     # Arêtes semi-infinies
-    toutes = []
     for tri in triangles:
         p1, p2, p3 = tri
-        toutes += [(p1, p2, tri), (p2, p3, tri), (p3, p1, tri)]
-
-    for i, (a, b, tri) in enumerate(toutes):
-        frontiere = all(
-            not ((a == c and b == d) or (a == d and b == c))
-            for j, (c, d, _) in enumerate(toutes) if i != j
-        )
-        if not frontiere or tri not in circumcentres:
-            continue
-        cx, cy = circumcentres[tri]
-        if not (min_x <= cx <= max_x and min_y <= cy <= max_y):
-            continue
+        for a, b in ((p1, p2), (p2, p3), (p3, p1)):
+            if len(par_arete[cle_arete(a, b)]) != 1 or tri not in circumcentres:
+                continue
+            cx, cy = circumcentres[tri]
+            if not (min_x <= cx <= max_x and min_y <= cy <= max_y):
+                continue
 
-        dx, dy = b[0] - a[0], b[1] - a[1]
-        longueur = (dx**2 + dy**2) ** 0.5
-        perp_x, perp_y = -dy / longueur, dx / longueur
+            dx, dy = b[0] - a[0], b[1] - a[1]
+            longueur = (dx**2 + dy**2) ** 0.5
+            perp_x, perp_y = -dy / longueur, dx / longueur
 
-        troisieme = [p for p in tri if p != a and p != b][0]
-        vers_x, vers_y = troisieme[0] - cx, troisieme[1] - cy
-        if perp_x * vers_x + perp_y * vers_y > 0:
-            perp_x, perp_y = -perp_x, -perp_y
+            troisieme = [p for p in tri if p != a and p != b][0]
+            vers_x, vers_y = troisieme[0] - cx, troisieme[1] - cy
+            if perp_x * vers_x + perp_y * vers_y > 0:
+                perp_x, perp_y = -perp_x, -perp_y
 
-        p_loin = (cx + perp_x * 1000, cy + perp_y * 1000)
-        seg = clipper_segment((cx, cy), p_loin, bbox)
-        if seg:
-            aretes.append(seg)
+            p_loin = (cx + perp_x * 1000, cy + perp_y * 1000)
+            seg = clipper_segment((cx, cy), p_loin, bbox)
+            if seg:
+                aretes.append(seg)
 
     return aretes, circumcentres
 
@@ -200,36 +624,136 @@ def extraire_voronoi(points, triangles):
 # 5. CELLULES VORONOÏ CLIPPÉES À LA BBOX
 # ─────────────────────────────────────────────
 
-def obtenir_cellules(points, aretes, bbox):
+def clipper_polygone(polygone, bbox):
+    """Algorithme de Sutherland-Hodgman : découpe un polygone convexe par la bbox."""
+    min_x, max_x, min_y, max_y = bbox
+    bords = (
+        (lambda p: p[0] >= min_x, lambda p, q: (min_x, p[1] + (q[1] - p[1]) * (min_x - p[0]) / (q[0] - p[0]))),
+        (lambda p: p[0] <= max_x, lambda p, q: (max_x, p[1] + (q[1] - p[1]) * (max_x - p[0]) / (q[0] - p[0]))),
+        (lambda p: p[1] >= min_y, lambda p, q: (p[0] + (q[0] - p[0]) * (min_y - p[1]) / (q[1] - p[1]), min_y)),
+        (lambda p: p[1] <= max_y, lambda p, q: (p[0] + (q[0] - p[0]) * (max_y - p[1]) / (q[1] - p[1]), max_y)),
+    )
+    for dedans, intersection in bords:
+        if not polygone:
+            break
+        entree, polygone = polygone, []
+        precedent = entree[-1]
+        for courant in entree:
+            if dedans(courant):
+                if not dedans(precedent):
+                    polygone.append(intersection(precedent, courant))
+                polygone.append(courant)
+            elif dedans(precedent):
+                polygone.append(intersection(precedent, courant))
+            precedent = courant
+    return polygone
+
+def calculer_cellules(points, triangles, bbox):
     """
-    Pour chaque point, collecter les sommets des arêtes de Voronoï
-    qui forment sa cellule, en cherchant les arêtes dont les deux
-    extrémités sont équidistantes à ce point.
+    Cellule de Voronoï de chaque point, clippée à la bbox.
+
+    La cellule d'un site est formée des circumcentres de l'éventail de
+    triangles qui l'entoure, parcouru de voisin en voisin dans le sens
+    trigonométrique : aucun tri n'est nécessaire. Pour un site de
+    l'enveloppe convexe, l'éventail est ouvert et la cellule est fermée
+    par les deux demi-droites de Voronoï, prolongées au-delà de la bbox.
+
+    Renvoie (sommets, debuts) : sommets est un tableau (m, 2) et la cellule
+    de points[k] est sommets[debuts[k]:debuts[k + 1]] (vide si le point
+    n'appartient à aucun triangle ou répète un point précédent).
     """
-    min_x, max_x, min_y, max_y = bbox
-    coins = [(min_x, min_y), (max_x, min_y), (max_x, max_y), (min_x, max_y)]
+    # Pour chaque site s et chaque triangle (s, u, v) dans le sens trigo,
+    # suivant[s][u] = (v, circumcentre) : le triangle suivant autour de s
+    # commence par l'arête (s, v).
+    suivant = {}
+    for tri in triangles:
+        a, b, c = tri
+        # Calculé avant l'éventuel échange, dans l'ordre où Triangulation le
+        # calcule : même centre, relatif à a, que Triangulation.centres
+        centre = centre_circonscrit(a, b, c)
+        if orientation(a, b, c) < 0:
+            b, c = c, b
+        if centre is None:
+            centre = ((a[0] + b[0] + c[0]) / 3, (a[1] + b[1] + c[1]) / 3)
+        for s_, u, v in ((a, b, c), (b, c, a), (c, a, b)):
+            suivant.setdefault(s_, {})[u] = (v, centre)
+
+    sommets = []
+    debuts = [0]
+    vus = set()
+    for s_ in points:
+        cle = tuple(s_)
+        # Seule la première copie d'un site répété reçoit la cellule
+        eventail = suivant.get(cle) if cle not in vus else None
+        vus.add(cle)
+        if not eventail:
+            debuts.append(len(sommets))
+            continue
+        # Un éventail ouvert commence à l'arête (s, u) dont u n'est la fin d'aucun triangle
+        fins = {v for v, _ in eventail.values()}
+        ouverts = [u for u in eventail if u not in fins]
+        premier = ouverts[0] if ouverts else next(iter(eventail))
+
+        centres = []
+        u = premier
+        while True:
+            v, centre = eventail[u]
+            centres.append(centre)
+            u = v
+            if u == premier or u not in eventail:
+                break
+
+        if ouverts:
+            sommets += polygone_cellule(s_, centres, bbox, premier, u)
+        else:
+            sommets += polygone_cellule(s_, centres, bbox)
+        debuts.append(len(sommets))
 
-    cellules = {p: set() for p in points}
+    return np.array(sommets, dtype=np.float64).reshape(-1, 2), np.array(debuts, dtype=np.int64)
 
-    for seg in aretes:
-        s1, s2 = seg
-        # Trouver les deux points de Voronoï les plus proches de ce segment
-        # = les deux points dont cette arête est la frontière
-        mid = ((s1[0]+s2[0])/2, (s1[1]+s2[1])/2)
-        distances = sorted(points, key=lambda p: (p[0]-mid[0])**2 + (p[1]-mid[1])**2)
-        # Les deux points les plus proches du milieu de l'arête
-        p1, p2 = distances[0], distances[1]
-        cellules[p1].add(s1)
-        cellules[p1].add(s2)
-        cellules[p2].add(s1)
-        cellules[p2].add(s2)
-
-    # Ajouter les coins de bbox au point le plus proche
-    for coin in coins:
-        pt = min(points, key=lambda p: (p[0]-coin[0])**2 + (p[1]-coin[1])**2)
-        cellules[pt].add(coin)
-
-    return {p: list(s) for p, s in cellules.items()}
+def polygone_cellule(site, centres, bbox, premier=None, dernier=None):
+    """
+    Polygone clippé de la cellule de site, à partir des circumcentres de son
+    éventail dans le sens trigonométrique. Pour un éventail ouvert, premier
+    et dernier sont les voisins de site sur l'enveloppe convexe : la cellule
+    est fermée par les deux demi-droites de Voronoï, perpendiculaires aux
+    arêtes (site, premier) et (dernier, site), à droite de leur sens de
+    parcours, et prolongées bien au-delà de la bbox.
+    """
+    min_x, max_x, min_y, max_y = bbox
+    if premier is not None:
+        r1 = _normaliser(premier[1] - site[1], site[0] - premier[0])
+        r2 = _normaliser(site[1] - dernier[1], dernier[0] - site[0])
+        # L'angle entre r1 et r2 est inférieur à 180° : leur bissectrice
+        # ferme la cellule au-delà de la bbox.
+        milieu = _normaliser(r1[0] + r2[0], r1[1] + r2[1])
+        cx, cy = (min_x + max_x) / 2, (min_y + max_y) / 2
+        loin = 10 * (math.hypot(max_x - min_x, max_y - min_y) / 2 + max(
+            math.hypot(c[0] - cx, c[1] - cy) for c in centres)) + 1.0
+        debut, fin = centres[0], centres[-1]
+        loin1 = (debut[0] + r1[0] * loin, debut[1] + r1[1] * loin)
+        loin2 = (fin[0] + r2[0] * loin, fin[1] + r2[1] * loin)
+        centres = [loin1] + centres + [loin2,
+                   ((loin1[0] + loin2[0]) / 2 + milieu[0] * loin,
+                    (loin1[1] + loin2[1]) / 2 + milieu[1] * loin)]
+    if all(min_x <= c[0] <= max_x and min_y <= c[1] <= max_y for c in centres):
+        return centres
+    return clipper_polygone(centres, bbox)
+
+def _normaliser(dx, dy):
+    longueur = math.hypot(dx, dy)
+    return (dx / longueur, dy / longueur) if longueur else (0.0, 0.0)
+
+def collection_cellules(points, triangles, bbox, alpha):
+    """PolyCollection des cellules, colorées comme les points correspondants."""
+    couleurs = list(mcolors.TABLEAU_COLORS.values())
+    sommets, debuts = calculer_cellules(points, triangles, bbox)
+    polygones, faces = [], []
+    for k in range(len(points)):
+        if debuts[k + 1] - debuts[k] >= 3:
+            polygones.append(sommets[debuts[k]:debuts[k + 1]])
+            faces.append(couleurs[k % len(couleurs)])
+    return PolyCollection(polygones, facecolors=faces, alpha=alpha, edgecolors='none')
 
 def ordonner_polygone(sommets):
     cx = sum(s[0] for s in sommets) / len(sommets)
@@ -249,14 +773,7 @@ def visualiser(points, triangles, aretes, circumcentres):
     fig, ax = plt.subplots(figsize=(12, 10))
 
     # Cellules coloriées et clippées
-    cellules = obtenir_cellules(points, aretes, bbox)
-    for idx, (pt, sommets) in enumerate(cellules.items()):
-        if len(sommets) >= 3:
-            poly = ordonner_polygone(sommets)
-            patch = mpatches.Polygon(poly, closed=True,
-                                     facecolor=couleurs[idx % len(couleurs)],
-                                     alpha=0.3, edgecolor='none')
-            ax.add_patch(patch)
+    ax.add_collection(collection_cellules(points, triangles, bbox, alpha=0.3))
 
     # Triangulation Delaunay (très transparente)
     for tri in triangles:
@@ -297,79 +814,176 @@ def visualiser(points, triangles, aretes, circumcentres):
 # 7. VISUALISATION INTERACTIVE
 # ─────────────────────────────────────────────
 
+# Au-delà, la triangulation et les étiquettes ne sont plus dessinées et un
+# clic ne redessine que les cellules touchées (blitting) : un rendu complet
+# de dizaines de milliers de polygones prend plusieurs secondes.
+SEUIL_DETAILS = 2000
+
 def visualiser_interactif(points_initiaux, fichier):
+    """
+    Clic gauche : ajoute un point, clic droit : retire le dernier.
+
+    La triangulation est mise à jour localement (insertion ou suppression
+    d'un seul site) et seules les cellules des sites touchés sont
+    recalculées et remplacées dans les collections matplotlib. Tout est
+    reconstruit seulement si un point sort de la bbox courante.
+    """
     points = list(points_initiaux)
-    couleurs = list(mcolors.TABLEAU_COLORS.values())
+    couleurs = mcolors.to_rgba_array(list(mcolors.TABLEAU_COLORS.values()))
+    # Couleurs des cellules : alpha 0.3 sur fond blanc, mais opaques pour
+    # qu'une cellule redessinée recouvre exactement l'ancienne.
+    fonds = couleurs * 0.3 + 0.7
+    etat = {'tailles': []}
 
-    def rafraichir(ax):
+    def polygone(i):
+        polygone = etat['tri'].cellule(i, etat['bbox']) if i is not None else []
+        return np.array(polygone) if len(polygone) >= 3 else np.zeros((1, 2))
+
+    def reconstruire():
         ax.clear()
-        if len(points) < 3:
-            for p in points:
-                ax.plot(p[0], p[1], 'ko', markersize=8)
-            ax.set_title("Ajoutez au moins 3 points (clic gauche)")
-            ax.grid(True, alpha=0.3)
-            fig.canvas.draw()
-            return
+        etat['tri'] = tri = Triangulation(points)
+        etat['ids'] = list(tri.indices)
+        etat['position'] = {i: k for k, i in enumerate(etat['ids']) if i is not None}
+        etat['bbox'] = bbox = calculer_bbox(points) if points else (0, 1, 0, 1)
+        etat['coords'] = np.array(points, dtype=np.float64).reshape(-1, 2)
+        etat['etiquettes'] = []
+
+        rang = np.arange(len(points)) % len(couleurs)
+        polygones = [polygone(i) for i in etat['ids']]
+        etat['cellules'] = PolyCollection(polygones, facecolors=fonds[rang], edgecolors='none')
+        etat['contours'] = PolyCollection(polygones, facecolors='none', edgecolors='r',
+                                          linewidths=1.8, zorder=3)
+        etat['delaunay'] = LineCollection([], colors='b', linewidths=0.5, alpha=0.15)
+        for collection in (etat['cellules'], etat['contours'], etat['delaunay']):
+            ax.add_collection(collection)
+        etat['points'] = ax.scatter(etat['coords'][:, 0], etat['coords'][:, 1], s=100, c=couleurs[rang],
+                                    edgecolors='black', linewidths=1.2, zorder=5)
+        if len(points) <= SEUIL_DETAILS:
+            for k in range(len(points)):
+                etiqueter(k)
 
-        tris = bowyer_watson(points)
-        aretes, ccs = extraire_voronoi(points, tris)
-        bbox = calculer_bbox(points)
         min_x, max_x, min_y, max_y = bbox
-
-        cellules = obtenir_cellules(points, aretes, bbox)
-        for idx, (pt, sommets) in enumerate(cellules.items()):
-            if len(sommets) >= 3:
-                poly = ordonner_polygone(sommets)
-                patch = mpatches.Polygon(poly, closed=True,
-                                         facecolor=couleurs[idx % len(couleurs)],
-                                         alpha=0.3, edgecolor='none')
-                ax.add_patch(patch)
-
-        for tri in tris:
-            p1, p2, p3 = tri
-            ax.plot([p1[0], p2[0], p3[0], p1[0]],
-                    [p1[1], p2[1], p3[1], p1[1]],
-                    'b-', linewidth=0.5, alpha=0.15)
-
-        for seg in aretes:
-            ax.plot([seg[0][0], seg[1][0]], [seg[0][1], seg[1][1]],
-                    'r-', linewidth=1.8, zorder=3)
-
-        for idx, p in enumerate(points):
-            c = couleurs[idx % len(couleurs)]
-            ax.plot(p[0], p[1], 'o', color=c, markersize=10, zorder=5,
-                    markeredgecolor='black', markeredgewidth=1.2)
-            ax.annotate(f"P{idx+1}", xy=p, xytext=(6, 6),
-                        textcoords='offset points', fontsize=9, fontweight='bold')
-
         ax.set_xlim(min_x, max_x); ax.set_ylim(min_y, max_y)
         ax.set_aspect('equal'); ax.grid(True, alpha=0.3)
-        ax.set_title(f"Voronoï — {len(points)} points  |  "
-                     f"clic gauche = ajouter  |  clic droit = supprimer dernier")
-        fig.canvas.draw()
+        titrer()
+        fig.canvas.draw_idle()
 
-    def on_click(event):
-        if event.inaxes != ax:
+    def etiqueter(k):
+        etat['etiquettes'].append(ax.annotate(
+            f"P{k+1}", xy=points[k], xytext=(6, 6), textcoords='offset points',
+            fontsize=9, fontweight='bold'))
+
+    def titrer():
+        if len(points) < 3:
+            ax.set_title("Ajoutez au moins 3 points (clic gauche)")
+        else:
+            ax.set_title(f"Voronoï — {len(points)} points  |  "
+                         f"clic gauche = ajouter  |  clic droit = supprimer dernier")
+
+    def actualiser(modifies):
+        # Remplace sur place les chemins des seules cellules modifiées
+        n = len(points)
+        rang = np.arange(n) % len(couleurs)
+        for collection in (etat['cellules'], etat['contours']):
+            chemins = collection.get_paths()
+            while len(chemins) < n:
+                chemins.append(Path(np.zeros((1, 2))))
+            del chemins[n:]
+            for i in modifies:
+                sommets = polygone(i)
+                # closed=True remplace le dernier sommet par CLOSEPOLY : on répète le premier
+                chemins[etat['position'][i]] = Path(np.vstack((sommets, sommets[:1])), closed=True)
+            collection.stale = True
+        etat['cellules'].set_facecolor(fonds[rang])
+        etat['points'].set_offsets(etat['coords'])
+        etat['points'].set_facecolor(couleurs[rang])
+        titrer()
+
+        if n <= SEUIL_DETAILS or not fig.canvas.supports_blit:
+            etat['delaunay'].set_segments([[a, b, c, a] for a, b, c in etat['tri'].triangles()])
+            fig.canvas.draw_idle()
             return
-        if event.button == 1:
-            points.append((round(event.xdata, 2), round(event.ydata, 2)))
+        # Les cellules modifiées recouvrent exactement les anciennes : il suffit
+        # de les peindre par-dessus l'image courante, avec leurs sites.
+        etat['delaunay'].set_segments([])
+        ks = [etat['position'][i] for i in modifies]
+        polygones = [etat['cellules'].get_paths()[k].vertices[:-1] for k in ks]
+        calques = [
+            PolyCollection(polygones, facecolors=fonds[rang[ks]], edgecolors='none'),
+            PolyCollection(polygones, facecolors='none', edgecolors='r', linewidths=1.8),
+        ]
+        for calque in calques:
+            ax.add_collection(calque, autolim=False)
+        calques.append(ax.scatter(etat['coords'][ks, 0], etat['coords'][ks, 1], s=100,
+                                  c=couleurs[rang[ks]], edgecolors='black', linewidths=1.2))
+        for calque in calques:
+            ax.draw_artist(calque)
+            calque.remove()
+        fig.canvas.blit(ax.bbox)
+
+    def ajouter(p):
+        min_x, max_x, min_y, max_y = etat['bbox']
+        points.append(p)
+        with open(fichier, 'ab+') as f:
+            taille = f.tell()
+            f.seek(max(0, taille - 1))
+            saut = b"" if taille == 0 or f.read(1) == b"\n" else b"\n"
+            f.write(saut + f"{p[0]},{p[1]}\n".encode())
+        etat['tailles'].append(taille)
+        if len(points) <= 3 or not (min_x <= p[0] <= max_x and min_y <= p[1] <= max_y):
+            reconstruire()
+            return
+        i = etat['tri'].inserer(p)
+        etat['ids'].append(i)
+        etat['coords'] = np.vstack((etat['coords'], p))
+        if i is not None:
+            etat['position'][i] = len(points) - 1
+        if len(points) <= SEUIL_DETAILS:
+            etiqueter(len(points) - 1)
+        actualiser(etat['tri'].modifies)
+
+    def retirer():
+        points.pop()
+        if etat['tailles']:
+            # Le dernier point a été ajouté en fin de fichier : on le coupe
+            with open(fichier, 'r+') as f:
+                f.truncate(etat['tailles'].pop())
+        else:
             with open(fichier, 'w') as f:
                 for p in points:
                     f.write(f"{p[0]},{p[1]}\n")
+        if len(points) < 3:
+            reconstruire()
+            return
+        i = etat['ids'].pop()
+        etat['coords'] = etat['coords'][:-1]
+        modifies = set()
+        if i is not None:
+            etat['tri'].supprimer(i)
+            del etat['position'][i]
+            modifies = etat['tri'].modifies
+        if len(etat['etiquettes']) > len(points):
+            etat['etiquettes'].pop().remove()
+        actualiser(modifies)
+
+    def on_click(event):
+        if event.inaxes != ax:
+            return
+        if event.button == 1:
+            ajouter((round(event.xdata, 2), round(event.ydata, 2)))
         elif event.button == 3 and points:
-            points.pop()
-        rafraichir(ax)
+            retirer()
 
     fig, ax = plt.subplots(figsize=(12, 10))
     fig.canvas.mpl_connect('button_press_event', on_click)
-    rafraichir(ax)
+    reconstruire()
     plt.show()
 
 # ─────────────────────────────────────────────
 # EXPORT SVG
 # ─────────────────────────────────────────────
 
-def exporter_svg(points, aretes, fichier_svg='resultats/phase 2/voronoi_claude.svg'):
+def exporter_svg(points, aretes, fichier_svg='resultats/phase 2/voronoi_claude.svg', triangles=None):
     bbox = calculer_bbox(points)
     min_x, max_x, min_y, max_y = bbox
     largeur = max_x - min_x
@@ -377,7 +991,9 @@ def exporter_svg(points, aretes, fichier_svg='resultats/phase 2/voronoi_claude.s
     marge = 20  # marge en pixels
 
     couleurs = list(mcolors.TABLEAU_COLORS.values())
-    cellules = obtenir_cellules(points, aretes, bbox)
+    if triangles is None:
+        triangles = bowyer_watson(points)
+    sommets, debuts = calculer_cellules(points, triangles, bbox)
 
     # Fonction pour convertir coordonnées → pixels SVG (y inversé)
     def to_svg(x, y):
@@ -390,12 +1006,11 @@ def exporter_svg(points, aretes, fichier_svg='resultats/phase 2/voronoi_claude.s
                   f'width="{800 + 2*marge}" height="{600 + 2*marge}">')
 
     # Cellules colorées
-    for idx, (pt, sommets) in enumerate(cellules.items()):
-        if len(sommets) >= 3:
-            poly = ordonner_polygone(sommets)
+    for idx in range(len(points)):
+        if debuts[idx + 1] - debuts[idx] >= 3:
             couleur = couleurs[idx % len(couleurs)]
             pts_svg = " ".join(f"{to_svg(s[0], s[1])[0]:.2f},{to_svg(s[0], s[1])[1]:.2f}"
-                               for s in poly)
+                               for s in sommets[debuts[idx]:debuts[idx + 1]])
             lignes.append(f'  <polygon points="{pts_svg}" '
                           f'fill="{couleur}" fill-opacity="0.4" stroke="none"/>')
 
@@ -434,7 +1049,7 @@ if __name__ == "__main__":
     triangles = bowyer_watson(points)
     aretes, circumcentres = extraire_voronoi(points, triangles)
 
-    exporter_svg(points, aretes, 'resultats/phase 2/voronoi_claude.svg')
+    exporter_svg(points, aretes, 'resultats/phase 2/voronoi_claude.svg', triangles)
 
     # Visualisation statique
     visualiser(points, triangles, aretes, circumcentres)
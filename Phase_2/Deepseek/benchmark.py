@@ -3,6 +3,8 @@ import numpy as np
 from scipy.spatial import Voronoi
 import matplotlib.pyplot as plt
 import pandas as pd
+from plotter import compute_labels
+from jump_flooding import error_rate
 
 # ---------- Méthode manuelle ----------
 def plus_proche(coin_x, coin_y, points_list):
@@ -91,8 +93,102 @@ def benchmark():
 
     return results
 
+# ---------- Jump flooding ----------
+def benchmark_jfa():
+    """
+    Compare le jump flooding (avec et sans correction) au calcul exact :
+    temps et proportion de pixels mal étiquetés.
+    """
+    nb_points_list = [10, 100, 1000]
+    resolutions = [100, 250, 500]
+    results = []
+    for nb_points in nb_points_list:
+        points = np.random.uniform(0, 20, (nb_points, 2))
+        for resolution in resolutions:
+            x = np.linspace(-5, 25, resolution)
+            y = np.linspace(-5, 25, resolution)
+            timings = {}
+            labels = {}
+            for name, engine, fix in (("exact", "exact", False), ("jfa", "jfa", False), ("jfa_fix", "jfa", True)):
+                start = time.perf_counter()
+                labels[name] = compute_labels(points, x, y, engine, fix)
+                timings[name] = time.perf_counter() - start
+            results.append({
+                'nb_points': nb_points,
+                'resolution': resolution,
+                'exact_time': timings['exact'],
+                'jfa_time': timings['jfa'],
+                'jfa_fix_time': timings['jfa_fix'],
+                'jfa_error': error_rate(labels['jfa'], labels['exact']),
+                'jfa_fix_error': error_rate(labels['jfa_fix'], labels['exact']),
+            })
+            r = results[-1]
+            print(f"Points: {nb_points:4d}, res={resolution:3d} -> Exact: {r['exact_time']:.4f}s, "
+                  f"JFA: {r['jfa_time']:.4f}s (erreur {r['jfa_error']:.4%}), "
+                  f"JFA corrigé: {r['jfa_fix_time']:.4f}s (erreur {r['jfa_fix_error']:.4%})")
+    return results
+
+# ---------- Raster exact ----------
+def benchmark_raster():
+    """
+    Étiquetage exact d'une grille 500 x 500 : tuiles bornées en mémoire
+    (distances au carré) contre KD-tree, avec le pic d'allocation de chacun.
+    """
+    import tracemalloc
+    x = np.linspace(-5, 25, 500)
+    y = np.linspace(-5, 25, 500)
+    results = []
+    for nb_points in [10, 100, 1000, 10000]:
+        points = np.random.uniform(0, 20, (nb_points, 2))
+        for engine in ("exact", "kdtree"):
+            tracemalloc.start()
+            start = time.perf_counter()
+            compute_labels(points, x, y, engine)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results.append({'nb_points': nb_points, 'engine': engine, 'time': elapsed, 'peak_mb': peak / 2**20})
+            print(f"Points: {nb_points:5d}, {engine:6s} -> {elapsed:.3f}s, pic mémoire {peak / 2**20:.1f} Mo")
+    return results
+
+# ---------- Export SVG ----------
+def benchmark_svg(sizes=(10000, 100000, 1000000)):
+    """
+    Export vectoriel (un <path> par cellule) en .svg et en .svgz : durée
+    de l'écriture seule (le diagramme est calculé avant) et taille du fichier.
+    """
+    import os
+    import tempfile
+    from model import VoronoiModel
+    from exporters import SVGExporter
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for nb_points in sizes:
+            model = VoronoiModel()
+            model.set_points(np.random.uniform(0, 1000, (nb_points, 2)))
+            for ext in ("svg", "svgz"):
+                path = os.path.join(directory, f"diagramme.{ext}")
+                start = time.perf_counter()
+                SVGExporter().export(model, path)
+                elapsed = time.perf_counter() - start
+                size = os.path.getsize(path) / 2**20
+                results.append({'nb_points': nb_points, 'format': ext, 'time': elapsed, 'size_mb': size})
+                print(f"Points: {nb_points:7d}, {ext:4s} -> {elapsed:.2f}s, {size:.1f} Mo")
+    return results
+
 # ---------- Exécution et visualisation ----------
 if __name__ == "__main__":
+    import sys
+    if sys.argv[1:] == ["jfa"]:
+        print(pd.DataFrame(benchmark_jfa()).to_string(index=False))
+        sys.exit()
+    if sys.argv[1:] == ["raster"]:
+        print(pd.DataFrame(benchmark_raster()).to_string(index=False))
+        sys.exit()
+    if sys.argv[1:] == ["svg"]:
+        print(pd.DataFrame(benchmark_svg()).to_string(index=False))
+        sys.exit()
+
     results = benchmark()
     df = pd.DataFrame(results)
     print("\n--- Tableau récapitulatif ---")
@@ -0,0 +1,100 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+class ResultCache:
+    """
+    Cache de résultats adressé par contenu : la clé est l'empreinte SHA-256
+    des points et des paramètres du calcul, si bien que recharger le même
+    fichier ou exporter plusieurs fois retrouve le résultat déjà calculé.
+
+    Les max_entries derniers résultats utilisés restent en mémoire (LRU) ;
+    avec directory, chaque résultat est aussi écrit sur disque (pickle) et
+    survit à la fermeture de l'application. Le cache peut être partagé
+    entre threads : deux calculs simultanés d'une même clé sont possibles,
+    le dernier arrivé l'emporte.
+    """
+
+    def __init__(self, max_entries=8, directory=None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def digest(array):
+        """Empreinte d'un tableau de coordonnées (forme et valeurs en float64)."""
+        array = np.ascontiguousarray(array, dtype=np.float64)
+        digest = hashlib.sha256(repr(array.shape).encode())
+        digest.update(array.tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def key(kind, **params):
+        """Clé d'un calcul : son nom et ses paramètres, les tableaux par empreinte."""
+        digest = hashlib.sha256(kind.encode())
+        for name in sorted(params):
+            value = params[name]
+            if isinstance(value, np.ndarray):
+                value = ResultCache.digest(value)
+            digest.update(f"|{name}={value!r}".encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+        path = self._path(key)
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            with self.lock:
+                self.disk_hits += 1
+            self._remember(key, value)
+            return value
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._remember(key, value)
+        path = self._path(key)
+        if path:
+            # Écriture atomique : un fichier partiel n'est jamais relu
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def _remember(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pkl") if self.directory else None
@@ -1,32 +1,100 @@
 import os
+import queue
+import threading
 from model import VoronoiModel
 from point_loader import PointLoader, PointLoadError
 from exporters import SVGExporter, ImageExporter
+from plotter import prepare_display
+
+# Période (ms) de relève des messages du thread de calcul par la boucle Tk
+POLL_MS = 50
+
+class LoadJob:
+    """Chargement d'un fichier ; cancelled est levé quand un autre fichier est choisi."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.name = os.path.basename(file_path)
+        self.cancelled = False
 
 class VoronoiController:
     def __init__(self, model: VoronoiModel, view):
         self.model = model
         self.view = view
+        self.job = None
+        self.messages = queue.Queue()
+        self.polling = False
 
     def on_load_points(self):
         file_path = self.view.ask_open_filename()
         if not file_path:
             return
+        if self.job:
+            self.job.cancelled = True
+        self.job = LoadJob(file_path)
+        self.view.set_status(f"Lecture de {self.job.name}...")
+        # Lecture, calcul et préparation du rendu hors du thread de Tk ;
+        # seuls les messages relevés par _poll touchent à l'interface.
+        threading.Thread(target=self._load, args=(self.job,), daemon=True).start()
+        if not self.polling:
+            self.polling = True
+            self.view.schedule(POLL_MS, self._poll)
+
+    def _load(self, job):
         try:
-            points = PointLoader.load(file_path)
+            points = PointLoader.load_array(job.file_path)
+            if job.cancelled:
+                return
             if len(points) < 2:
-                self.view.show_warning("Attention", "Au moins deux points sont nécessaires.")
+                self._post(job, "warning", ("Attention", "Au moins deux points sont nécessaires."))
                 return
-            self.model.set_points(points)
-            self.view.update_display(self.model)
-            self.view.set_status(f"Fichier chargé: {os.path.basename(file_path)} - {len(points)} points")
+            self._post(job, "progress", f"Calcul du diagramme de {job.name} ({len(points)} points)...")
+            # Nouveau modèle : l'ancien reste affiché et exportable pendant le calcul
+            model = VoronoiModel(self.model.cache)
+            model.set_points(points)
+            if job.cancelled:
+                return
+            self._post(job, "progress", f"Rendu de {job.name}...")
+            prepare_display(model)
+            self._post(job, "done", model)
         except PointLoadError as e:
-            self.view.show_error("Erreur de chargement", str(e))
+            self._post(job, "error", ("Erreur de chargement", str(e)))
         except Exception as e:
-            self.view.show_error("Erreur inattendue", str(e))
+            self._post(job, "error", ("Erreur inattendue", str(e)))
+
+    def _post(self, job, kind, payload):
+        if not job.cancelled:
+            self.messages.put((job, kind, payload))
+
+    def _poll(self):
+        while True:
+            try:
+                job, kind, payload = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if job is not self.job:
+                continue  # travail remplacé par un chargement plus récent
+            if kind == "progress":
+                self.view.set_status(payload)
+                continue
+            self.job = None
+            if kind == "done":
+                self.model = payload
+                self.view.update_display(self.model)
+                self.view.set_status(f"Fichier chargé: {job.name} - {len(self.model.points)} points")
+            elif kind == "warning":
+                self.view.set_status("Aucun fichier chargé")
+                self.view.show_warning(*payload)
+            else:
+                self.view.set_status(f"Échec du chargement de {job.name}")
+                self.view.show_error(*payload)
+        if self.job is not None:
+            self.view.schedule(POLL_MS, self._poll)
+        else:
+            self.polling = False
 
     def on_export_svg(self):
-        self._export(SVGExporter(), "svg", [("SVG files", "*.svg")])
+        self._export(SVGExporter(), "svg", [("SVG files", "*.svg"), ("SVGZ files", "*.svgz")])
 
     def on_export_image(self):
         self._export(ImageExporter(), "png", [("PNG files", "*.png"), ("JPEG files", "*.jpg")])
@@ -41,4 +109,4 @@ class VoronoiController:
                 exporter.export(self.model, file_path)
                 self.view.show_info("Succès", f"Exporté vers {file_path}")
             except Exception as e:
-                self.view.show_error("Erreur d'export", str(e))
\ No newline at end of file
+                self.view.show_error("Erreur d'export", str(e))
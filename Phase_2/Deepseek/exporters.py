@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
+import gzip
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_hex
 from plotter import plot_diagram
 
 class Exporter(ABC):
@@ -8,11 +10,79 @@ class Exporter(ABC):
         pass
 
 class SVGExporter(Exporter):
+    """
+    Export vectoriel : un <path> par cellule découpée (model.cell_vertices,
+    model.cell_offsets), écrit par paquets de chunk cellules, sans passer
+    par matplotlib. Un nom en .svgz (ou compress=True) donne un fichier gzip.
+    La palette ne sert qu'à choisir les couleurs des classes CSS c0, c1, ...
+    """
+
+    def __init__(self, cmap='tab20', precision=3, sites=True, chunk=8192, compress=None, compresslevel=1):
+        self.cmap = cmap
+        self.precision = precision
+        self.sites = sites
+        self.chunk = chunk
+        self.compress = compress
+        self.compresslevel = compresslevel
+
     def export(self, model, filename):
-        fig, ax = plt.subplots()
-        plot_diagram(ax, model)
-        plt.savefig(filename, format='svg')
-        plt.close(fig)
+        compress = filename.lower().endswith(".svgz") if self.compress is None else self.compress
+        if compress:
+            f = gzip.open(filename, 'wt', compresslevel=self.compresslevel, encoding='utf-8')
+        else:
+            f = open(filename, 'w', encoding='utf-8', buffering=2**20)
+        with f:
+            self.write(model, f)
+
+    def write(self, model, f):
+        x_min, x_max, y_min, y_max = map(float, model.bbox)
+        cmap = plt.get_cmap(self.cmap)
+        colors = [to_hex(cmap(k)) for k in range(cmap.N)]
+        # Axe y vers le haut comme dans la vue : le groupe est retourné
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{x_min!r} {-y_max!r} '
+                f'{x_max - x_min!r} {y_max - y_min!r}">\n<style>\n'
+                + "".join(f".c{k}{{fill:{c}}}\n" for k, c in enumerate(colors))
+                + '</style>\n<g transform="scale(1,-1)" fill-opacity="0.5">\n')
+        self._write_cells(model.cell_vertices, model.cell_offsets, len(colors), f)
+        f.write('</g>\n')
+        if self.sites:
+            self._write_sites(model.points, model.bbox, f)
+        f.write('</svg>\n')
+
+    def _write_cells(self, vertices, offsets, ncolors, f):
+        coord = f"%.{self.precision}f %.{self.precision}f"
+        templates = {}
+        for c0 in range(0, len(offsets) - 1, self.chunk):
+            c1 = min(c0 + self.chunk, len(offsets) - 1)
+            base = int(offsets[c0])
+            bounds = (offsets[c0:c1 + 1] - base).tolist()
+            # Conversion en flottants Python une fois par paquet ; chaque cellule
+            # est ensuite formatée d'un seul % avec un gabarit par nombre de sommets
+            flat = vertices[base:int(offsets[c1])].ravel().tolist()
+            lines = []
+            for k in range(c1 - c0):
+                a, b = bounds[k], bounds[k + 1]
+                if b - a < 3:
+                    continue
+                template = templates.get(b - a)
+                if template is None:
+                    template = templates[b - a] = '<path class="c%d" d="M' + "L".join([coord] * (b - a)) + 'Z"/>\n'
+                lines.append(template % ((c0 + k) % ncolors, *flat[2 * a:2 * b]))
+            f.write("".join(lines))
+
+    def _write_sites(self, points, bbox, f):
+        # Un seul chemin : un segment nul par site, rendu en disque par le
+        # bout arrondi du trait
+        x_min, x_max, y_min, y_max = map(float, bbox)
+        width = 0.004 * max(x_max - x_min, y_max - y_min)
+        f.write(f'<path transform="scale(1,-1)" stroke="red" stroke-width="{width!r}" '
+                'stroke-linecap="round" d="')
+        coord = f"M%.{self.precision}f %.{self.precision}fh0"
+        for p0 in range(0, len(points), self.chunk):
+            flat = points[p0:p0 + self.chunk].ravel().tolist()
+            f.write((coord * (len(flat) // 2)) % tuple(flat))
+        f.write('"/>\n')
 
 class ImageExporter(Exporter):
     def __init__(self, dpi=100):
@@ -22,4 +92,4 @@ class ImageExporter(Exporter):
         fig, ax = plt.subplots()
         plot_diagram(ax, model)
         plt.savefig(filename, dpi=self.dpi)
-        plt.close(fig)
\ No newline at end of file
+        plt.close(fig)
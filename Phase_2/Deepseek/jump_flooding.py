@@ -0,0 +1,120 @@
+import numpy as np
+
+# Les 8 voisins testés à chaque pas du jump flooding
+OFFSETS = [(dj, di) for dj in (-1, 0, 1) for di in (-1, 0, 1) if dj or di]
+
+
+def jump_flooding(points, x, y):
+    """
+    Approximation du diagramme de Voronoi sur la grille y x x par jump flooding.
+    Chaque site est déposé sur le pixel le plus proche, puis les étiquettes se
+    propagent par pas de N/2, N/4, ..., 1 (plus un pas de 1 final) :
+    O(P log P) pour P pixels, indépendamment du nombre de sites.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    height, width = len(y), len(x)
+    if len(points) == 0 or height == 0 or width == 0:
+        return np.zeros((height, width), dtype=np.int32)
+    px, py = points[:, 0], points[:, 1]
+
+    # Dépôt des sites : sur un même pixel, le plus proche (puis le plus petit indice) gagne
+    cols = _nearest_index(px, x)
+    rows = _nearest_index(py, y)
+    seed_dist = (x[cols] - px) ** 2 + (y[rows] - py) ** 2
+    order = np.lexsort((np.arange(len(points)), seed_dist))
+    cells = (rows * width + cols)[order]
+    _, first = np.unique(cells, return_index=True)
+    labels = np.full((height, width), -1, dtype=np.int32)
+    labels.ravel()[cells[first]] = order[first]
+
+    xx = x[np.newaxis, :]
+    yy = y[:, np.newaxis]
+    dist = np.where(labels >= 0, (xx - px[labels]) ** 2 + (yy - py[labels]) ** 2, np.inf)
+
+    step = 1 << max(0, (max(height, width) - 1).bit_length() - 1)
+    steps = []
+    while step >= 1:
+        steps.append(step)
+        step //= 2
+    for step in steps + [1]:
+        for dj, di in OFFSETS:
+            candidate = _shift(labels, dj * step, di * step)
+            valid = candidate >= 0
+            d = np.where(valid, (xx - px[candidate]) ** 2 + (yy - py[candidate]) ** 2, np.inf)
+            better = (d < dist) | ((d == dist) & valid & (candidate < labels))
+            labels = np.where(better, candidate, labels)
+            dist = np.where(better, d, dist)
+    return labels
+
+
+def fix_labels(labels, points, x, y, exact):
+    """
+    Corrige exactement les pixels mal étiquetés par le jump flooding.
+    exact(qx, qy) doit renvoyer le site le plus proche de chaque point.
+    On vérifie les pixels de frontière et le pixel de chaque site absent,
+    puis les voisins des pixels corrigés jusqu'à stabilisation.
+    Renvoie le nombre de pixels vérifiés.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    checked = np.zeros(labels.shape, dtype=bool)
+    pending = _boundaries(labels)
+    missing = np.setdiff1d(np.arange(len(points)), labels)
+    pending[_nearest_index(points[missing, 1], y), _nearest_index(points[missing, 0], x)] = True
+    while pending.any():
+        rows, cols = np.nonzero(pending)
+        exact_labels = exact(x[cols], y[rows])
+        changed = exact_labels != labels[rows, cols]
+        labels[rows, cols] = exact_labels
+        checked[rows, cols] = True
+
+        modified = np.zeros(labels.shape, dtype=bool)
+        modified[rows[changed], cols[changed]] = True
+        pending = _dilate(modified) & ~checked
+    return int(checked.sum())
+
+
+def error_rate(labels, reference):
+    """Proportion de pixels dont l'étiquette diffère de la référence exacte."""
+    return float(np.mean(labels != reference)) if reference.size else 0.0
+
+
+def _nearest_index(values, grid):
+    if len(grid) == 1:
+        return np.zeros(len(values), dtype=np.int64)
+    step = (grid[-1] - grid[0]) / (len(grid) - 1)
+    return np.clip(np.rint((values - grid[0]) / step), 0, len(grid) - 1).astype(np.int64)
+
+
+def _shift(array, dj, di):
+    # shifted[j, i] = array[j + dj, i + di], -1 hors de la grille
+    height, width = array.shape
+    shifted = np.full_like(array, -1)
+    if abs(dj) >= height or abs(di) >= width:
+        return shifted
+    shifted[max(0, -dj):height - max(0, dj), max(0, -di):width - max(0, di)] = \
+        array[max(0, dj):height - max(0, -dj), max(0, di):width - max(0, -di)]
+    return shifted
+
+
+def _boundaries(labels):
+    boundary = np.zeros(labels.shape, dtype=bool)
+    rows_diff = labels[1:] != labels[:-1]
+    cols_diff = labels[:, 1:] != labels[:, :-1]
+    boundary[1:] |= rows_diff
+    boundary[:-1] |= rows_diff
+    boundary[:, 1:] |= cols_diff
+    boundary[:, :-1] |= cols_diff
+    return boundary
+
+
+def _dilate(mask):
+    dilated = mask.copy()
+    dilated[1:] |= mask[:-1]
+    dilated[:-1] |= mask[1:]
+    dilated[:, 1:] |= mask[:, :-1]
+    dilated[:, :-1] |= mask[:, 1:]
+    return dilated
@@ -1,33 +1,152 @@
 import numpy as np
 from scipy.spatial import Voronoi
+from cache import ResultCache
+from plotter import compute_labels, MAX_BYTES
+
+# Marge (en unités des points) entre les sites extrêmes et la boîte de découpage
+MARGIN = 5.0
+
+def clip_halfplane(polygon, a, b, c):
+    """Sutherland-Hodgman : partie du polygone [(x, y), ...] où a x + b y <= c."""
+    result = []
+    for k in range(len(polygon)):
+        p, q = polygon[k - 1], polygon[k]
+        fp, fq = a * p[0] + b * p[1] - c, a * q[0] + b * q[1] - c
+        if fq <= 0:
+            if fp > 0:
+                t = fp / (fp - fq)
+                result.append((p[0] + t * (q[0] - p[0]), p[1] + t * (q[1] - p[1])))
+            result.append(q)
+        elif fp <= 0:
+            t = fp / (fp - fq)
+            result.append((p[0] + t * (q[0] - p[0]), p[1] + t * (q[1] - p[1])))
+    return result
+
+def clip_box(polygon, bbox):
+    x_min, x_max, y_min, y_max = bbox
+    for a, b, c in ((-1, 0, -x_min), (1, 0, x_max), (0, -1, -y_min), (0, 1, y_max)):
+        polygon = clip_halfplane(polygon, a, b, c)
+    return polygon
+
+def bounded_cells(voronoi, bbox):
+    """
+    Cellules de tous les sites découpées par bbox = (x_min, x_max, y_min, y_max),
+    en tableaux plats : les sommets de la cellule i sont
+    vertices[offsets[i]:offsets[i + 1]].
+
+    Les cellules finies entièrement dans la boîte (presque toutes) sont
+    reprises telles quelles par des opérations vectorisées ; les autres
+    finies sont découpées par Sutherland-Hodgman. Une cellule infinie est
+    la boîte découpée par les demi-plans médiateurs de ses voisins. Un site
+    répété n'a de cellule qu'à sa première occurrence : les copies
+    suivantes ont une cellule vide (offsets[i] == offsets[i + 1]).
+    """
+    points, vertices = voronoi.points, voronoi.vertices
+    x_min, x_max, y_min, y_max = bbox
+    ridges = np.asarray(voronoi.ridge_points)
+    # qhull n'associe d'arêtes qu'à une copie d'un site répété : les autres
+    # passeraient pour des cellules infinies sans voisin (toute la boîte).
+    # Par groupe de sites égaux, la cellule revient à la copie qui a des
+    # arêtes, à défaut à la première.
+    group = np.unique(points, axis=0, return_inverse=True)[1].ravel()
+    has_ridge = np.zeros(len(points), dtype=bool)
+    has_ridge[ridges.ravel()] = True
+    order = np.lexsort((np.arange(len(points)), ~has_ridge, group))
+    duplicate = np.ones(len(points), dtype=bool)
+    duplicate[order[np.r_[True, group[order][1:] != group[order][:-1]]]] = False
+    regions = [[] if d else voronoi.regions[r] for r, d in zip(voronoi.point_region, duplicate)]
+    lengths = np.fromiter((len(r) for r in regions), dtype=np.int64, count=len(regions))
+    flat = np.fromiter((v for r in regions for v in r), dtype=np.int64, count=int(lengths.sum()))
+    starts = np.concatenate(([0], np.cumsum(lengths)))
+
+    inside = (flat >= 0)
+    xy = vertices[np.where(inside, flat, 0)]
+    inside &= (xy[:, 0] >= x_min) & (xy[:, 0] <= x_max) & (xy[:, 1] >= y_min) & (xy[:, 1] <= y_max)
+    kept = lengths > 0
+    kept[kept] = np.logical_and.reduceat(inside, starts[:-1][kept])
+
+    # Voisins des cellules infinies, par les arêtes de Voronoi qui les bordent
+    infinite = (lengths == 0) & ~duplicate
+    infinite[lengths > 0] = np.logical_or.reduceat(flat < 0, starts[:-1][lengths > 0])
+    neighbors = {i: [] for i in np.flatnonzero(infinite)}
+    for p, q in ridges[infinite[ridges[:, 0]] | infinite[ridges[:, 1]]].tolist():
+        if p in neighbors: neighbors[p].append(q)
+        if q in neighbors: neighbors[q].append(p)
+
+    box = [(x_min, y_min), (x_max, y_min), (x_max, y_max), (x_min, y_max)]
+    clipped = {}
+    for i in np.flatnonzero(~kept & ~duplicate):
+        if infinite[i]:
+            polygon = box
+            sx, sy = points[i]
+            for j in neighbors[i]:
+                # Côté de i de la médiatrice : (s_j - s_i) . p <= (|s_j|² - |s_i|²) / 2
+                tx, ty = points[j]
+                polygon = clip_halfplane(polygon, tx - sx, ty - sy, (tx * tx + ty * ty - sx * sx - sy * sy) / 2)
+        else:
+            polygon = clip_box([tuple(v) for v in vertices[regions[i]]], bbox)
+        clipped[i] = np.array(polygon, dtype=np.float64).reshape(-1, 2)
+
+    # Assemblage : cellules gardées par copie vectorisée, les autres insérées
+    sizes = np.where(kept, lengths, 0)
+    for i, polygon in clipped.items():
+        sizes[i] = len(polygon)
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    cells = np.empty((offsets[-1], 2), dtype=np.float64)
+    kept_rows = np.repeat(kept, lengths)
+    cells[np.repeat(kept, sizes)] = xy[kept_rows]
+    for i, polygon in clipped.items():
+        cells[offsets[i]:offsets[i + 1]] = polygon
+    return cells, offsets
 
 class VoronoiModel:
-    def __init__(self):
+    def __init__(self, cache=None):
         self.points = []
+        self.points_hash = None
         self.voronoi = None
+        self.bbox = None
+        self.cell_vertices = np.empty((0, 2))
+        self.cell_offsets = np.zeros(1, dtype=np.int64)
+        self.cache = cache if cache is not None else ResultCache()
 
-    def set_points(self, points):
+    def set_points(self, points, margin=MARGIN):
         self.points = np.array(points)
+        self.points_hash = ResultCache.digest(self.points)
         if len(self.points) >= 2:
-            self.voronoi = Voronoi(self.points)
+            key = ResultCache.key("voronoi", points=self.points_hash)
+            self.voronoi = self.cache.get_or_compute(key, lambda: Voronoi(self.points))
+            (x_min, y_min), (x_max, y_max) = self.points.min(axis=0) - margin, self.points.max(axis=0) + margin
+            self.bbox = (x_min, x_max, y_min, y_max)
+            key = ResultCache.key("cells", points=self.points_hash, bbox=self.bbox)
+            self.cell_vertices, self.cell_offsets = self.cache.get_or_compute(
+                key, lambda: bounded_cells(self.voronoi, self.bbox))
         else:
             self.voronoi = None
+            self.bbox = None
+            self.cell_vertices = np.empty((0, 2))
+            self.cell_offsets = np.zeros(len(self.points) + 1, dtype=np.int64)
 
     def get_points(self):
         return self.points.tolist() if len(self.points) > 0 else []
 
     def get_polygons(self):
+        """Cellule de chaque site, découpée par self.bbox : tableaux (k, 2)
+        qui sont des vues sur cell_vertices."""
         if self.voronoi is None:
             return []
-        polygons = []
-        for point_index, region_index in enumerate(self.voronoi.point_region):
-            region = self.voronoi.regions[region_index]
-            if not region or -1 in region:
-                polygons.append(None)
-            else:
-                polygon = self.voronoi.vertices[region]
-                polygons.append(polygon.tolist())
-        return polygons
+        return np.split(self.cell_vertices, self.cell_offsets[1:-1])
+
+    def get_labels(self, x, y, engine="auto", fix=False, max_bytes=MAX_BYTES):
+        """Raster des sites les plus proches sur la grille y x x (cf. compute_labels),
+        conservé dans le cache : plusieurs exports du même diagramme le réutilisent."""
+        key = ResultCache.key("labels", points=self.points_hash, x=np.asarray(x), y=np.asarray(y),
+                              engine=engine, fix=fix)
+        return self.cache.get_or_compute(key, lambda: self._compute_labels(x, y, engine, fix, max_bytes))
+
+    def _compute_labels(self, x, y, engine, fix, max_bytes):
+        labels = compute_labels(self.points, x, y, engine, fix, max_bytes)
+        labels.setflags(write=False)  # partagé par tous les lecteurs du cache
+        return labels
 
     def get_vertices(self):
         return self.voronoi.vertices.tolist() if self.voronoi is not None else []
@@ -1,47 +1,178 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import PolyCollection
+from jump_flooding import jump_flooding, fix_labels
 
-def plot_diagram(ax, model):
+ENGINES = ("auto", "exact", "kdtree", "jfa")
+
+# Plafond mémoire du tenseur de distances (octets) d'un paquet de calcul
+MAX_BYTES = 64 * 2**20
+# Avec le moteur "auto", au-delà de ce nombre de sites le KD-tree l'emporte
+# sur le calcul exhaustif par tuiles
+AUTO_KDTREE_SITES = 64
+
+def nearest_site(points, qx, qy, max_bytes=MAX_BYTES):
+    """
+    Indice du site le plus proche de chaque point (qx[k], qy[k]), calculé
+    par paquets de requêtes dont la matrice de distances tient dans max_bytes.
+    """
+    qx = np.asarray(qx, dtype=np.float64).ravel()
+    qy = np.asarray(qy, dtype=np.float64).ravel()
+    px, py = points[:, 0], points[:, 1]
+    chunk = max(1, max_bytes // (8 * len(points)))
+    labels = np.empty(len(qx), dtype=np.int32)
+    for start in range(0, len(qx), chunk):
+        sx = qx[start:start + chunk, np.newaxis]
+        sy = qy[start:start + chunk, np.newaxis]
+        labels[start:start + chunk] = np.argmin((sx - px) ** 2 + (sy - py) ** 2, axis=1)
+    return labels
+
+def nearest_site_grid(points, x, y, max_bytes=MAX_BYTES):
+    """
+    Étiquetage exact de la grille y x x par tuiles de lignes (et de colonnes
+    si une ligne dépasse le plafond) : la distance au carré se décompose en
+    (x - px)² + (y - py)², précalculés par colonne et par ligne, si bien que
+    chaque tuile ne coûte qu'une addition et un argmin, sans racine carrée.
+    Le tenseur d'une tuile (lignes, colonnes, n) tient dans max_bytes.
+    """
+    height, width, n = len(y), len(x), len(points)
+    px, py = points[:, 0], points[:, 1]
+    labels = np.empty((height, width), dtype=np.int32)
+    cols = int(max(1, min(width, max_bytes // (8 * n))))
+    rows = int(max(1, min(height, max_bytes // (8 * n * cols))))
+    for i0 in range(0, width, cols):
+        dx = (x[i0:i0 + cols, np.newaxis] - px) ** 2
+        for j0 in range(0, height, rows):
+            dy = (y[j0:j0 + rows, np.newaxis] - py) ** 2
+            labels[j0:j0 + rows, i0:i0 + cols] = np.argmin(dy[:, np.newaxis, :] + dx[np.newaxis, :, :], axis=2)
+    return labels
+
+def nearest_site_kdtree(points, x, y, max_bytes=MAX_BYTES):
+    """Étiquetage de la grille par requêtes dans un KD-tree, par paquets de lignes."""
+    from scipy.spatial import cKDTree
+    tree = cKDTree(points)
+    height, width = len(y), len(x)
+    labels = np.empty((height, width), dtype=np.int32)
+    # Requêtes (2 coordonnées) puis distances et indices : ~32 octets par pixel
+    rows = int(max(1, min(height, max_bytes // (32 * max(width, 1)))))
+    for j0 in range(0, height, rows):
+        xx, yy = np.meshgrid(x, y[j0:j0 + rows])
+        _, nearest = tree.query(np.column_stack((xx.ravel(), yy.ravel())), workers=-1)
+        labels[j0:j0 + rows] = nearest.reshape(xx.shape)
+    return labels
+
+def compute_labels(points, x, y, engine="exact", fix=False, max_bytes=MAX_BYTES):
+    """
+    Étiquette la grille y x x : labels[j, i] est le site le plus proche de (x[i], y[j]).
+    engine="exact" compare chaque pixel à tous les sites, par tuiles bornées
+    par max_bytes ; "kdtree" interroge un KD-tree ; "auto" choisit selon le
+    nombre de sites. engine="jfa" donne une approximation rapide ; fix=True
+    corrige ensuite exactement les pixels mal étiquetés.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Moteur inconnu : {engine}")
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if engine == "auto":
+        engine = "kdtree" if len(points) > AUTO_KDTREE_SITES else "exact"
+    if engine == "jfa":
+        labels = jump_flooding(points, x, y)
+        if fix:
+            fix_labels(labels, points, x, y, lambda qx, qy: nearest_site(points, qx, qy, max_bytes))
+        return labels
+    if engine == "kdtree":
+        return nearest_site_kdtree(points, x, y, max_bytes)
+    return nearest_site_grid(points, x, y, max_bytes)
+
+# Au-delà de ce nombre de sites, les cellules font moins d'un pixel à
+# l'écran : la vue affiche le raster des étiquettes plutôt que les polygones
+POLYGON_MAX_SITES = 20000
+# Côté de la grille des rasters affichés ou exportés
+RESOLUTION = 500
+
+def raster_grid(bbox, resolution=RESOLUTION):
+    x_min, x_max, y_min, y_max = bbox
+    return np.linspace(x_min, x_max, resolution), np.linspace(y_min, y_max, resolution)
+
+def display_engine(model):
+    """Moteur de la vue : polygones, ou raster quand les cellules sont trop petites."""
+    return "polygons" if len(model.points) <= POLYGON_MAX_SITES else "auto"
+
+def prepare_display(model, engine=None):
+    """Calcule à l'avance (dans le cache du modèle) ce que DiagramPlot.update
+    affichera avec ce moteur ; sans danger hors du thread de l'interface."""
+    engine = engine or display_engine(model)
+    if engine != "polygons" and model.has_valid_diagram():
+        model.get_labels(*raster_grid(model.bbox), engine)
+
+class DiagramPlot:
+    """
+    Artistes d'un diagramme dans un Axes, créés une fois puis mis à jour :
+    une PolyCollection pour les cellules, une image pour le raster des
+    étiquettes (l'un ou l'autre est visible) et un nuage de points pour les
+    sites. update() change les données, recolor() seulement la palette.
+    """
+
+    def __init__(self, ax, cmap='tab20'):
+        self.ax = ax
+        self.cmap = plt.get_cmap(cmap)
+        self.count = 0
+        self.labels = None
+        self.cells = PolyCollection([], edgecolors='none', alpha=0.5)
+        ax.add_collection(self.cells)
+        self.image = ax.imshow(np.zeros((1, 1), dtype=np.int32), origin='lower', cmap=self.cmap,
+                               vmin=0, vmax=self.cmap.N - 1, alpha=0.5, interpolation='nearest')
+        self.image.set_visible(False)
+        self.sites = ax.scatter([], [], c='r', s=25, linewidths=0, zorder=3)
+        ax.set_aspect('equal')
+        ax.set_title("Diagramme de Voronoi")
+
+    @property
+    def artists(self):
+        return self.cells, self.image, self.sites
+
+    def update(self, model, engine="polygons", fix=False, max_bytes=MAX_BYTES):
+        """
+        Affiche le diagramme du modèle. Avec engine="polygons", les cellules
+        précalculées par le modèle ; les autres moteurs colorient chaque pixel
+        selon le site le plus proche (cf. compute_labels).
+        """
+        points = np.asarray(model.points)
+        if not model.has_valid_diagram() or len(points) < 2:
+            return False
+        self.count = len(points)
+        x_min, x_max, y_min, y_max = model.bbox
+        if engine == "polygons":
+            self.cells.set_verts(model.get_polygons())
+        else:
+            x, y = raster_grid(model.bbox)
+            self.labels = model.get_labels(x, y, engine, fix, max_bytes)
+            self.image.set_extent((x_min, x_max, y_min, y_max))
+        self.cells.set_visible(engine == "polygons")
+        self.image.set_visible(engine != "polygons")
+        self.recolor(self.cmap)
+
+        # Tracer les points par-dessus, plus petits quand ils sont nombreux
+        self.sites.set_offsets(points)
+        self.sites.set_sizes([25 if len(points) <= POLYGON_MAX_SITES else 4])
+        self.ax.set_xlim(x_min, x_max)
+        self.ax.set_ylim(y_min, y_max)
+        return True
+
+    def recolor(self, cmap):
+        self.cmap = plt.get_cmap(cmap)
+        self.cells.set_facecolor(self.cmap(np.arange(self.count) % self.cmap.N))
+        if self.labels is not None:
+            self.image.set_data(self.labels % self.cmap.N)
+        self.image.set_cmap(self.cmap)
+        self.image.set_clim(0, self.cmap.N - 1)
+
+def plot_diagram(ax, model, engine="polygons", fix=False, max_bytes=MAX_BYTES):
     """
-    Trace le diagramme de Voronoi en coloriant chaque pixel selon le site le plus proche.
+    Trace le diagramme de Voronoi dans ax (cf. DiagramPlot.update).
     Les points sont superposés en rouge.
     """
-    if not model.has_valid_diagram():
-        return
-
-    points = np.array(model.get_points())
-    if len(points) < 2:
-        return
-
-    # Déterminer les limites de la zone à afficher (avec une marge)
-    margin = 5.0
-    x_min, y_min = points.min(axis=0) - margin
-    x_max, y_max = points.max(axis=0) + margin
-
-    # Créer une grille de résolution (ajuster pour plus de précision / performance)
-    resolution = 500
-    x = np.linspace(x_min, x_max, resolution)
-    y = np.linspace(y_min, y_max, resolution)
-    xx, yy = np.meshgrid(x, y)
-    grid = np.stack((xx, yy), axis=-1)  # shape (res, res, 2)
-
-    # Calculer pour chaque point de la grille la distance à tous les sites
-    # et trouver l'index du site le plus proche
-    # (dimensions : grid (res,res,2) - points (n,2) -> distances (res,res,n))
-    distances = np.linalg.norm(grid[:, :, np.newaxis, :] - points[np.newaxis, np.newaxis, :, :], axis=-1)
-    labels = np.argmin(distances, axis=-1)  # (res, res)
-
-    # Afficher l'image avec une palette de couleurs
-    cmap = plt.get_cmap('tab20')
-    # Normaliser les labels pour qu'ils correspondent aux indices de la colormap
-    im = ax.imshow(labels, extent=(x_min, x_max, y_min, y_max), origin='lower',
-                   cmap=cmap, alpha=0.5, interpolation='nearest')
-
-    # Tracer les points par-dessus
-    ax.plot(points[:, 0], points[:, 1], 'ro', markersize=5, zorder=3)
-
-    # Ajuster l'aspect
-    ax.set_aspect('equal')
-    ax.set_xlim(x_min, x_max)
-    ax.set_ylim(y_min, y_max)
-    ax.set_title("Diagramme de Voronoi")
\ No newline at end of file
+    plot = DiagramPlot(ax)
+    plot.update(model, engine, fix, max_bytes)
+    return plot
@@ -1,11 +1,22 @@
+import os
+import struct
 from typing import List, Tuple
 
+import numpy as np
+
+# Fichiers binaires .vpts : format décrit dans Phase_1/Diagramme/PointsBinaires.py
+VPTS_MAGIC = b"VORPTS"
+VPTS_HEADER = struct.Struct("<6sBcQ")
+VPTS_DTYPES = {b"d": np.dtype("<f8"), b"f": np.dtype("<f4")}
+
 class PointLoadError(Exception):
     pass
 
 class PointLoader:
     @staticmethod
     def load(file_path: str) -> List[Tuple[float, float]]:
+        if PointLoader.is_binary(file_path):
+            return [tuple(p) for p in PointLoader.load_binary(file_path).tolist()]
         points = []
         with open(file_path, 'r') as f:
             lines = f.readlines()
@@ -22,4 +33,32 @@ class PointLoader:
             except ValueError:
                 raise PointLoadError(f"Coordonnées non numériques à la ligne {line_num} : {line}")
             points.append((x, y))
-        return points
\ No newline at end of file
+        return points
+
+    @staticmethod
+    def load_array(file_path: str) -> np.ndarray:
+        """Charge les points en tableau (n, 2) ; un fichier .vpts est projeté en mémoire sans copie."""
+        if PointLoader.is_binary(file_path):
+            return PointLoader.load_binary(file_path)
+        return np.array(PointLoader.load(file_path), dtype=np.float64).reshape(-1, 2)
+
+    @staticmethod
+    def is_binary(file_path: str) -> bool:
+        with open(file_path, 'rb') as f:
+            return f.read(len(VPTS_MAGIC)) == VPTS_MAGIC
+
+    @staticmethod
+    def load_binary(file_path: str) -> np.ndarray:
+        with open(file_path, 'rb') as f:
+            header = f.read(VPTS_HEADER.size)
+        if len(header) < VPTS_HEADER.size:
+            raise PointLoadError(f"En-tête binaire tronqué : {file_path}")
+        magic, version, code, count = VPTS_HEADER.unpack(header)
+        if magic != VPTS_MAGIC or version != 1 or code not in VPTS_DTYPES:
+            raise PointLoadError(f"En-tête binaire invalide : {file_path}")
+        if os.path.getsize(file_path) != VPTS_HEADER.size + 2 * VPTS_DTYPES[code].itemsize * count:
+            raise PointLoadError(f"Taille incohérente avec les {count} points annoncés : {file_path}")
+        if count == 0:
+            return np.empty((0, 2), dtype=VPTS_DTYPES[code])
+        return np.memmap(file_path, dtype=VPTS_DTYPES[code], mode='r',
+                         offset=VPTS_HEADER.size, shape=(count, 2))
@@ -2,8 +2,13 @@ import unittest
 import tempfile
 import os
 from model import VoronoiModel
+from cache import ResultCache
 from point_loader import PointLoader, PointLoadError
 from exporters import SVGExporter, ImageExporter
+from plotter import compute_labels, DiagramPlot
+from controller import VoronoiController
+from jump_flooding import error_rate
+import numpy as np
 
 class TestVoronoiModel(unittest.TestCase):
     def setUp(self):
@@ -19,12 +24,73 @@ class TestVoronoiModel(unittest.TestCase):
         polygons = self.model.get_polygons()
         self.assertEqual(len(polygons), 4)
 
+    def test_cells_tile_bounding_box(self):
+        # Toutes les cellules ici sont infinies : découpées, elles pavent la boîte
+        x_min, x_max, y_min, y_max = self.model.bbox
+        total = 0.0
+        for site, polygon in zip(self.points, self.model.get_polygons()):
+            self.assertGreaterEqual(len(polygon), 3)
+            x, y = polygon[:, 0], polygon[:, 1]
+            total += abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2
+            # Chaque sommet est au plus près de son site (à égalité sur les bords)
+            distances = np.linalg.norm(polygon[:, np.newaxis] - np.array(self.points), axis=-1)
+            np.testing.assert_allclose(np.linalg.norm(polygon - site, axis=1), distances.min(axis=1), atol=1e-9)
+        self.assertAlmostEqual(total, (x_max - x_min) * (y_max - y_min))
+        self.assertEqual(len(self.model.cell_offsets), 5)
+
+    def test_duplicate_sites_have_empty_cells(self):
+        points = [(1, 1), (1, 1), (5, 5), (3, 8), (9, 2), (5, 5)]
+        self.model.set_points(points)
+        x_min, x_max, y_min, y_max = self.model.bbox
+        polygons = self.model.get_polygons()
+        self.assertEqual(len(polygons), 6)
+        self.assertEqual([len(p) == 0 for p in polygons], [False, True, False, False, False, True])
+        area = sum(abs(np.dot(p[:, 0], np.roll(p[:, 1], -1)) - np.dot(p[:, 1], np.roll(p[:, 0], -1))) / 2
+                   for p in polygons if len(p))
+        self.assertAlmostEqual(area, (x_max - x_min) * (y_max - y_min))
+
     def test_invalid_points(self):
         # Tester avec un seul point : le diagramme ne doit pas être valide
         self.model.set_points([(1,2)])
         self.assertFalse(self.model.has_valid_diagram())
         self.assertEqual(len(self.model.get_points()), 1)
 
+class TestResultCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache = ResultCache(max_entries=2)
+        for name in "abc":
+            cache.put(name, name.upper())
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), "B")
+        cache.put("d", "D")
+        self.assertEqual(list(cache.entries), ["b", "d"])
+
+    def test_key_depends_on_content(self):
+        a = np.array([[0.0, 1.0], [2.0, 3.0]])
+        key = ResultCache.key("labels", points=ResultCache.digest(a), engine="exact")
+        self.assertEqual(key, ResultCache.key("labels", engine="exact", points=ResultCache.digest(a.copy())))
+        self.assertNotEqual(key, ResultCache.key("labels", points=ResultCache.digest(a), engine="jfa"))
+        self.assertNotEqual(key, ResultCache.key("labels", points=ResultCache.digest(a[::-1]), engine="exact"))
+
+    def test_model_reuses_results(self):
+        with tempfile.TemporaryDirectory() as directory:
+            points = [(2, 4), (5.3, 4.5), (18, 29), (12.5, 23.7)]
+            model = VoronoiModel(ResultCache(directory=directory))
+            model.set_points(points)
+            voronoi = model.voronoi
+            x = y = np.linspace(0, 30, 20)
+            labels = model.get_labels(x, y)
+            model.set_points(list(points))
+            self.assertIs(model.voronoi, voronoi)
+            self.assertIs(model.get_labels(x, y), labels)
+
+            # Nouveau modèle, même dossier : résultats relus sur disque
+            other = VoronoiModel(ResultCache(directory=directory))
+            other.set_points(points)
+            np.testing.assert_array_equal(other.get_labels(x, y), labels)
+            self.assertEqual(other.cache.misses, 0)
+            self.assertEqual(other.cache.disk_hits, 3)  # Voronoi, cellules, raster
+
 class TestPointLoader(unittest.TestCase):
     def test_load_valid(self):
         with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
@@ -42,6 +108,152 @@ class TestPointLoader(unittest.TestCase):
             PointLoader.load(tmpname)
         os.unlink(tmpname)
 
+    def test_load_binary(self):
+        import struct
+        with tempfile.NamedTemporaryFile(suffix=".vpts", delete=False) as f:
+            f.write(struct.pack("<6sBcQ", b"VORPTS", 1, b"d", 2))
+            f.write(struct.pack("<4d", 2, 4, 5.3, 4.5))
+            tmpname = f.name
+        self.assertEqual(PointLoader.load(tmpname), [(2.0, 4.0), (5.3, 4.5)])
+        array = PointLoader.load_array(tmpname)
+        self.assertEqual(array.shape, (2, 2))
+        self.assertEqual(array.tolist(), [[2.0, 4.0], [5.3, 4.5]])
+        del array
+        os.unlink(tmpname)
+
+    def test_load_truncated_binary(self):
+        import struct
+        with tempfile.NamedTemporaryFile(suffix=".vpts", delete=False) as f:
+            f.write(struct.pack("<6sBcQ", b"VORPTS", 1, b"d", 3))
+            f.write(struct.pack("<4d", 2, 4, 5.3, 4.5))
+            tmpname = f.name
+        with self.assertRaises(PointLoadError):
+            PointLoader.load(tmpname)
+        os.unlink(tmpname)
+
+class TestJumpFlooding(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.points = rng.uniform(0, 20, (300, 2))
+        self.x = np.linspace(-5, 25, 120)
+        self.y = np.linspace(-5, 25, 100)
+        self.exact = compute_labels(self.points, self.x, self.y)
+
+    def test_jfa_error_rate(self):
+        labels = compute_labels(self.points, self.x, self.y, engine="jfa")
+        self.assertEqual(labels.shape, (100, 120))
+        self.assertLess(error_rate(labels, self.exact), 0.05)
+
+    def test_jfa_fix(self):
+        labels = compute_labels(self.points, self.x, self.y, engine="jfa", fix=True)
+        self.assertEqual(error_rate(labels, self.exact), 0.0)
+
+class TestRaster(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.points = rng.uniform(0, 20, (200, 2))
+        self.x = np.linspace(-5, 25, 90)
+        self.y = np.linspace(-5, 25, 70)
+        # Référence : tenseur de distances complet
+        xx, yy = np.meshgrid(self.x, self.y)
+        d = (xx[..., np.newaxis] - self.points[:, 0]) ** 2 + (yy[..., np.newaxis] - self.points[:, 1]) ** 2
+        self.reference = np.argmin(d, axis=-1)
+
+    def test_tiles_under_memory_ceiling(self):
+        for max_bytes in (1, 8 * 200 * 7, 2**30):
+            labels = compute_labels(self.points, self.x, self.y, max_bytes=max_bytes)
+            self.assertEqual(labels.shape, (70, 90))
+            self.assertEqual(error_rate(labels, self.reference), 0.0)
+
+    def test_kdtree_engine(self):
+        labels = compute_labels(self.points, self.x, self.y, engine="kdtree", max_bytes=4096)
+        self.assertEqual(error_rate(labels, self.reference), 0.0)
+
+class TestDiagramPlot(unittest.TestCase):
+    def test_update_and_recolor_reuse_artists(self):
+        import matplotlib.pyplot as plt
+        figure = plt.Figure()
+        plot = DiagramPlot(figure.add_subplot(111))
+        artists = plot.artists
+        model = VoronoiModel()
+        for n in (30, 50):
+            model.set_points(np.random.default_rng(n).uniform(0, 20, (n, 2)))
+            self.assertTrue(plot.update(model))
+            self.assertEqual(len(plot.cells.get_paths()), n)
+            self.assertEqual(len(plot.sites.get_offsets()), n)
+        plot.update(model, engine="kdtree")
+        self.assertTrue(plot.image.get_visible())
+        self.assertFalse(plot.cells.get_visible())
+        plot.recolor("tab10")
+        self.assertLess(plot.image.get_array().max(), 10)
+        self.assertEqual(plot.artists, artists)
+        self.assertEqual(len(figure.axes[0].collections), 2)
+
+class FakeView:
+    """Vue sans Tk : les rappels planifiés sont exécutés à la main."""
+    def __init__(self, files):
+        self.files = list(files)
+        self.pending = []
+        self.statuses = []
+        self.displayed = []
+        self.errors = []
+
+    def ask_open_filename(self):
+        return self.files.pop(0)
+
+    def schedule(self, delay_ms, callback):
+        self.pending.append(callback)
+
+    def set_status(self, message):
+        self.statuses.append(message)
+
+    def update_display(self, model):
+        self.displayed.append(model)
+
+    def show_warning(self, title, message):
+        self.errors.append(title)
+
+    show_error = show_warning
+
+class TestController(unittest.TestCase):
+    def _run_until_idle(self, controller, view):
+        import time
+        deadline = time.time() + 30
+        while view.pending and time.time() < deadline:
+            view.pending.pop(0)()
+            time.sleep(0.01)
+        self.assertFalse(view.pending)
+
+    def test_background_load_keeps_latest_file(self):
+        paths = []
+        for n in (5, 7):
+            with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as tmp:
+                tmp.write("\n".join(f"{k},{(k * k) % n}" for k in range(n)))
+            paths.append(tmp.name)
+        view = FakeView(paths)
+        controller = VoronoiController(VoronoiModel(), view)
+        controller.on_load_points()
+        controller.on_load_points()  # remplace le premier chargement
+        self._run_until_idle(controller, view)
+        for path in paths:
+            os.unlink(path)
+        self.assertEqual(len(view.displayed), 1)
+        self.assertIs(controller.model, view.displayed[0])
+        self.assertEqual(len(controller.model.points), 7)
+        self.assertTrue(view.statuses[-1].startswith("Fichier chargé"))
+        self.assertFalse(view.errors)
+
+    def test_background_load_reports_errors(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as tmp:
+            tmp.write("pas un point")
+        view = FakeView([tmp.name])
+        controller = VoronoiController(VoronoiModel(), view)
+        controller.on_load_points()
+        self._run_until_idle(controller, view)
+        os.unlink(tmp.name)
+        self.assertEqual(view.errors, ["Erreur de chargement"])
+        self.assertFalse(view.displayed)
+
 class TestExporters(unittest.TestCase):
     def setUp(self):
         self.model = VoronoiModel()
@@ -55,6 +267,29 @@ class TestExporters(unittest.TestCase):
             self.assertTrue(os.path.exists(tmp.name))
             os.unlink(tmp.name)
 
+    def test_svg_paths_and_gzip(self):
+        import gzip
+        import xml.etree.ElementTree as ET
+        model = VoronoiModel()
+        model.set_points(np.random.default_rng(3).uniform(0, 10, (50, 2)))
+        with tempfile.TemporaryDirectory() as directory:
+            svg = os.path.join(directory, "d.svg")
+            svgz = os.path.join(directory, "d.svgz")
+            SVGExporter(chunk=16).export(model, svg)
+            SVGExporter(chunk=16).export(model, svgz)
+            with open(svg, 'rb') as f, gzip.open(svgz) as g:
+                data = f.read()
+                self.assertEqual(g.read(), data)
+            self.assertLess(os.path.getsize(svgz), len(data))
+        ns = "{http://www.w3.org/2000/svg}"
+        root = ET.fromstring(data)
+        cells = root.findall(f"{ns}g/{ns}path")
+        self.assertEqual(len(cells), 50)
+        self.assertEqual(cells[21].get("class"), "c1")
+        x, y = map(float, cells[0].get("d")[1:].split("L")[0].split())
+        self.assertEqual((x, y), tuple(np.round(model.cell_vertices[0], 3)))
+        self.assertNotIn(b"image", data)
+
     def test_image_export(self):
         with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
             tmp.close()
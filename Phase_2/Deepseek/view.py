@@ -2,7 +2,9 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from plotter import plot_diagram
+from plotter import DiagramPlot, display_engine
+
+PALETTES = ("tab20", "tab10", "Set3", "Pastel1")
 
 class MainView:
     def __init__(self, root):
@@ -18,13 +20,26 @@ class MainView:
         self.file_menu.add_separator()
         self.file_menu.add_command(label="Quitter", command=root.quit)
         self.menubar.add_cascade(label="Fichier", menu=self.file_menu)
+        self.palette_menu = tk.Menu(self.menubar, tearoff=0)
+        for name in PALETTES:
+            self.palette_menu.add_command(label=name, command=lambda name=name: self.recolor(name))
+        self.menubar.add_cascade(label="Palette", menu=self.palette_menu)
         root.config(menu=self.menubar)
 
         self.figure_frame = tk.Frame(root)
         self.figure_frame.pack(fill=tk.BOTH, expand=True)
 
-        self.figure = None
-        self.canvas = None
+        # Figure, canevas et artistes créés une seule fois puis mis à jour ;
+        # les artistes du diagramme sont animés : un changement de palette
+        # les redessine seuls sur le fond mémorisé (blitting).
+        self.figure = plt.Figure(figsize=(6, 5), dpi=100)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.figure_frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.plot = DiagramPlot(self.figure.add_subplot(111))
+        for artist in self.plot.artists:
+            artist.set_animated(True)
+        self.background = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
 
         self.status_label = tk.Label(root, text="Aucun fichier chargé", bd=1, relief=tk.SUNKEN, anchor=tk.W)
         self.status_label.pack(side=tk.BOTTOM, fill=tk.X)
@@ -36,23 +51,41 @@ class MainView:
         self.file_menu.entryconfig(2, command=controller.on_export_image)
 
     def update_display(self, model):
-        if self.figure:
-            self.figure.clear()
-        else:
-            self.figure = plt.Figure(figsize=(6, 5), dpi=100)
-        ax = self.figure.add_subplot(111)
-        plot_diagram(ax, model)
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-        self.canvas = FigureCanvasTkAgg(self.figure, master=self.figure_frame)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        if self.plot.update(model, display_engine(model)):
+            # Les axes changent : redessin complet, le fond est repris dans _on_draw
+            self.canvas.draw_idle()
+
+    def recolor(self, cmap):
+        self.plot.recolor(cmap)
+        self._blit()
+
+    def _on_draw(self, event):
+        ax = self.plot.ax
+        self.background = self.canvas.copy_from_bbox(ax.bbox)
+        self._draw_artists()
+
+    def _blit(self):
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_artists()
+        self.canvas.blit(self.plot.ax.bbox)
+
+    def _draw_artists(self):
+        for artist in self.plot.artists:
+            if artist.get_visible():
+                self.plot.ax.draw_artist(artist)
+
+    def schedule(self, delay_ms, callback):
+        """Exécute callback dans le thread de Tk après delay_ms."""
+        self.root.after(delay_ms, callback)
 
     def set_status(self, message):
         self.status_label.config(text=message)
 
     def ask_open_filename(self):
-        return filedialog.askopenfilename(filetypes=[("Fichiers texte", "*.txt"), ("Tous les fichiers", "*.*")])
+        return filedialog.askopenfilename(filetypes=[("Fichiers texte", "*.txt"), ("Points binaires", "*.vpts"), ("Tous les fichiers", "*.*")])
 
     def ask_save_filename(self, extension, filetypes):
         return filedialog.asksaveasfilename(defaultextension=extension, filetypes=filetypes)
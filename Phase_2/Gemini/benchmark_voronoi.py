@@ -1,3 +1,4 @@
+import math
 import time
 import random
 import matplotlib.pyplot as plt
@@ -23,14 +24,7 @@ def run_manuel(points, N=100):
 
 # --- ALGO FORTUNE ---
 def run_fortune(points):
-    solver = VoronoiSolver(points)
-    import heapq
-    while solver.event_queue:
-        event = heapq.heappop(solver.event_queue)
-        if event.site:
-            solver.handle_site_event(event.site, event.y)
-        else:
-            solver.handle_circle_event(event, event.y)
+    return VoronoiSolver(points).solve().diagram()
 
 # --- BENCHMARK ---
 def benchmark():
@@ -67,5 +61,41 @@ def benchmark():
     plt.savefig("analyse_performance.png")
     plt.show()
 
+def benchmark_fortune(tailles=(1000, 10000, 100000)):
+    """Passage à l'échelle de Fortune seul : avec la ligne de plage en arbre,
+    le temps par germe doit croître comme log n."""
+    print(f"{'Germes':<10} | {'Fortune (s)':<12} | {'us / (n log2 n)':<15} | {'Tas max':<8} | {'Invalidés':<9}")
+    print("-" * 66)
+    for n in tailles:
+        pts = [Point(random.random(), random.random()) for _ in range(n)]
+        start = time.perf_counter()
+        solver = VoronoiSolver(pts).solve()
+        solver.diagram()
+        duree = time.perf_counter() - start
+        stats = solver.event_queue.stats()
+        print(f"{n:<10} | {duree:<12.3f} | {1e6 * duree / (n * math.log2(n)):<15.3f} | "
+              f"{stats['peak_size']:<8} | {stats['invalidation_ratio']:<9.1%}")
+
+def benchmark_memoire(n=20000):
+    """Octets alloués par germe (tracemalloc) : points seuls, après le
+    balayage, et au pic de la construction du diagramme."""
+    import tracemalloc
+    coords = [(random.random(), random.random()) for _ in range(n)]
+    tracemalloc.start()
+    pts = [Point(x, y) for x, y in coords]
+    points, _ = tracemalloc.get_traced_memory()
+    solver = VoronoiSolver(pts).solve()
+    apres_balayage, pic_balayage = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    solver.diagram()
+    _, pic_diagramme = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{n} germes, octets par germe :")
+    print(f"  points            {points / n:8.0f}")
+    print(f"  après balayage    {apres_balayage / n:8.0f} (pic {pic_balayage / n:.0f})")
+    print(f"  pic du diagramme  {pic_diagramme / n:8.0f}")
+
 if __name__ == "__main__":
-    benchmark()
\ No newline at end of file
+    benchmark()
+    benchmark_fortune()
+    benchmark_memoire()
\ No newline at end of file
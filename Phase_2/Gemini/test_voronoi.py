@@ -1,6 +1,6 @@
 import unittest
 import math
-from voronoi_logic import Point, get_circumcircle, Event, VoronoiSolver
+from voronoi_logic import Point, get_circumcircle, Event, VoronoiSolver, load_points, load_binary_points, orient2d
 
 class TestVoronoi(unittest.TestCase):
 
@@ -17,6 +17,17 @@ class TestVoronoi(unittest.TestCase):
         self.assertAlmostEqual(center.y, 1.5)
         self.assertAlmostEqual(event_y, -1.0)
 
+    def test_orient2d_exact(self):
+        """Signe exact, même pour des points presque alignés ou loin de l'origine."""
+        self.assertGreater(orient2d(Point(0, 0), Point(1, 0), Point(0, 1)), 0)
+        self.assertLess(orient2d(Point(0, 0), Point(0, 1), Point(1, 0)), 0)
+        a, b = Point(0.5, 0.5), Point(12.0, 12.0)
+        self.assertEqual(orient2d(a, b, Point(24.0, 24.0)), 0)
+        self.assertLess(orient2d(a, b, Point(0.5 + 2.0 ** -52, 0.5)), 0)
+        far = [Point(1e9 + x, 1e9 + 2 * x) for x in range(3)]
+        self.assertEqual(orient2d(*far), 0)
+        self.assertGreater(orient2d(far[0], far[2], Point(1e9, 1e9 + 1)), 0)
+
     def test_event_priority(self):
         """Vérifie que la file d'attente traite les Y les plus hauts en premier."""
         e1 = Event(10, 50) # Plus haut
@@ -43,5 +54,119 @@ class TestVoronoi(unittest.TestCase):
         res = get_circumcircle(p1, p2, p3)
         self.assertIsNone(res)
 
+    def test_load_binary_points(self):
+        """Vérifie la lecture d'un fichier binaire .vpts."""
+        import os, struct, tempfile
+        with tempfile.NamedTemporaryFile(suffix='.vpts', delete=False) as f:
+            f.write(struct.pack("<6sBcQ", b"VORPTS", 1, b"d", 2))
+            f.write(struct.pack("<4d", 1.5, 2, 10, -4))
+            name = f.name
+        points = load_points(name)
+        os.unlink(name)
+        self.assertEqual([(p.x, p.y) for p in points], [(1.5, 2.0), (10.0, -4.0)])
+
+    def test_load_truncated_binary_points(self):
+        """Un fichier .vpts tronqué est refusé au lieu d'être lu à moitié."""
+        import os, struct, tempfile
+        with tempfile.NamedTemporaryFile(suffix='.vpts', delete=False) as f:
+            f.write(struct.pack("<6sBcQ", b"VORPTS", 1, b"d", 3))
+            f.write(struct.pack("<4d", 1.5, 2, 10, -4))
+            name = f.name
+        with self.assertRaises(ValueError):
+            load_binary_points(name)
+        os.unlink(name)
+
+    def test_fortune_vertices_and_beach_line(self):
+        """Chaque sommet est équidistant de trois germes sans germe plus proche,
+        et l'arbre de la ligne de plage reste cohérent avec la liste chaînée."""
+        import random
+        rng = random.Random(3)
+        points = [Point(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(300)]
+        solver = VoronoiSolver(points)
+        while solver.event_queue:
+            event = solver.event_queue.pop()
+            if event.site:
+                solver.handle_site_event(event.site, event.y)
+            else:
+                solver.handle_circle_event(event, event.y)
+            if len(solver.event_queue) % 50 == 0:
+                arcs = list(solver.beach_line)
+                self.assertEqual(len(arcs), len(solver.beach_line))
+                self.assertEqual(self._in_order(solver.beach_line.root), arcs)
+
+        self.assertGreater(len(solver.vertices), 500)
+        for v in solver.vertices:
+            d = sorted(math.hypot(p.x - v.x, p.y - v.y) for p in points)
+            self.assertAlmostEqual(d[0], d[2], places=6)
+
+    def test_diagram_cells_tile_the_box(self):
+        """Les cellules découpées pavent la boîte, sont orientées dans le sens
+        trigonométrique et chacun de leurs sommets est plus proche de leur germe."""
+        import random
+        rng = random.Random(7)
+        cases = [
+            ([Point(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(200)], (20, 80, 30, 70)),
+            ([Point(x, y) for x in range(8) for y in range(8)], None),
+            ([Point(0, 0), Point(1, 0), Point(2, 0)], None),
+            ([Point(3, 4)], None),
+        ]
+        for points, bbox in cases:
+            diagram = VoronoiSolver(points).solve().diagram(bbox)
+            xmin, xmax, ymin, ymax = diagram.bbox
+            total = 0.0
+            for i in range(len(diagram)):
+                polygon = diagram.cell(i)
+                area = 0.5 * sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(polygon, polygon[1:] + polygon[:1]))
+                self.assertGreaterEqual(area, -1e-9)
+                total += area
+                for x, y in polygon:
+                    d = math.hypot(points[i].x - x, points[i].y - y)
+                    self.assertLessEqual(d, min(math.hypot(p.x - x, p.y - y) for p in points) + 1e-6)
+            self.assertAlmostEqual(total, (xmax - xmin) * (ymax - ymin), places=6)
+            self.assertEqual(len(diagram.edges), len(diagram.edge_sites))
+
+    def test_duplicate_sites(self):
+        """Un germe répété ne garde qu'une cellule, à sa première occurrence."""
+        import random
+        rng = random.Random(11)
+        points = [Point(rng.randint(0, 12), rng.randint(0, 12)) for _ in range(150)]
+        diagram = VoronoiSolver(points).solve().diagram()
+        xmin, xmax, ymin, ymax = diagram.bbox
+        first = {}
+        total = 0.0
+        for i, p in enumerate(points):
+            polygon = diagram.cell(i)
+            if first.setdefault((p.x, p.y), i) != i:
+                self.assertEqual(polygon, [])
+                continue
+            self.assertGreaterEqual(len(polygon), 3)
+            total += 0.5 * sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(polygon, polygon[1:] + polygon[:1]))
+            for x, y in polygon:
+                d = math.hypot(p.x - x, p.y - y)
+                self.assertLessEqual(d, min(math.hypot(q.x - x, q.y - y) for q in points) + 1e-6)
+        self.assertLess(len(first), len(points))
+        self.assertAlmostEqual(total, (xmax - xmin) * (ymax - ymin), places=6)
+
+    def test_event_queue_lazy_deletion(self):
+        """Les événements invalidés sont sautés puis purgés du tas."""
+        from voronoi_logic import EventQueue, COMPACTION_MIN
+        queue = EventQueue([Point(0, 5), Point(1, -5)])
+        events = [Event(float(k), 1000.0 - k, is_circle=True) for k in range(2 * COMPACTION_MIN)]
+        for e in events:
+            queue.push(e)
+        for e in events[1:COMPACTION_MIN + 2]:
+            queue.invalidate(e)
+        self.assertEqual(queue.compactions, 1)
+        self.assertEqual(len(queue.heap), COMPACTION_MIN - 1)
+        self.assertEqual(queue.peak_size, 2 * COMPACTION_MIN)
+        self.assertIs(queue.pop(), events[0])
+        self.assertIs(queue.pop(), events[COMPACTION_MIN + 2])
+        self.assertEqual(len(queue), (COMPACTION_MIN - 3) + 2)
+
+    def _in_order(self, node):
+        if node is None:
+            return []
+        return self._in_order(node.child_left) + [node] + self._in_order(node.child_right)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,6 +1,5 @@
 import tkinter as tk
 from voronoi_logic import load_points, Point, VoronoiSolver
-import heapq
 
 class VoronoiApp:
     def __init__(self, root):
@@ -34,29 +33,22 @@ class VoronoiApp:
     def transform(self, px, py):
         return (px - self.offset_x) * self.scale, self.height - ((py - self.offset_y) * self.scale)
 
+    def view_bbox(self):
+        """Fenêtre visible en coordonnées mathématiques, pour découper les cellules."""
+        return (self.offset_x, self.offset_x + self.width / self.scale,
+                self.offset_y, self.offset_y + self.height / self.scale)
+
     def draw_final_diagram(self):
         """Calcule et affiche le diagramme complet."""
         self.canvas.delete("all")
         if not self.points: return
 
-        # 1. Rendu des zones (Pixel-based Voronoi pour le fond)
-        step = 3  # Précision
-        for x in range(0, self.width, step):
-            for y in range(0, self.height, step):
-                rx = (x / self.scale) + self.offset_x
-                ry = ((self.height - y) / self.scale) + self.offset_y
-                
-                best_dist = float('inf')
-                closest_idx = 0
-                for i, p in enumerate(self.points):
-                    d = (p.x - rx)**2 + (p.y - ry)**2
-                    if d < best_dist:
-                        best_dist = d
-                        closest_idx = i
-                
-                self.canvas.create_rectangle(x, y, x+step, y+step, 
-                                           fill=self.colors[closest_idx % len(self.colors)], 
-                                           outline="")
+        # 1. Cellules découpées par la fenêtre, issues directement du balayage
+        for i in range(len(self.diagram)):
+            polygon = self.diagram.cell(i)
+            if polygon:
+                coords = [c for x, y in polygon for c in self.transform(x, y)]
+                self.canvas.create_polygon(coords, fill=self.colors[i % len(self.colors)], outline="")
 
         # 2. Dessiner les germes par-dessus
         for p in self.points:
@@ -70,16 +62,9 @@ class VoronoiApp:
             self.points = pts
             self.calculate_scale()
             
-            # On initialise le solver juste pour valider la structure de données
-            self.solver = VoronoiSolver(self.points)
-            
-            # On vide la file d'événements (Simulation complète)
-            while self.solver.event_queue:
-                event = heapq.heappop(self.solver.event_queue)
-                if event.site:
-                    self.solver.handle_site_event(event.site, event.y)
-                else:
-                    self.solver.handle_circle_event(event, event.y)
+            # Balayage complet puis découpage des cellules par la fenêtre
+            self.solver = VoronoiSolver(self.points).solve()
+            self.diagram = self.solver.diagram(self.view_bbox())
             
             self.draw_final_diagram()
             self.status.config(text=f"Diagramme généré pour {len(self.points)} points.")
@@ -98,26 +83,15 @@ class VoronoiApp:
                 f.write(f'<svg width="{self.width}" height="{self.height}" xmlns="http://www.w3.org/2000/svg">\n')
                 f.write(f'  <rect width="100%" height="100%" fill="white" />\n')
 
-                # 2. Export des zones colorées (Regions)
-                # On utilise un step légèrement plus grand pour éviter un fichier trop lourd
-                step = 5 
+                # 2. Export des zones colorées (Regions) : un polygone par cellule
                 f.write('  <g id="regions">\n')
-                for x in range(0, self.width, step):
-                    for y in range(0, self.height, step):
-                        # On retrouve les coordonnées mathématiques pour chaque pixel SVG
-                        rx = (x / self.scale) + self.offset_x
-                        ry = ((self.height - y) / self.scale) + self.offset_y
-                        
-                        best_dist = float('inf')
-                        closest_idx = 0
-                        for i, p in enumerate(self.points):
-                            d = (p.x - rx)**2 + (p.y - ry)**2
-                            if d < best_dist:
-                                best_dist = d
-                                closest_idx = i
-                        
-                        color = self.colors[closest_idx % len(self.colors)]
-                        f.write(f'    <rect x="{x}" y="{y}" width="{step}" height="{step}" fill="{color}" />\n')
+                for i in range(len(self.diagram)):
+                    polygon = self.diagram.cell(i)
+                    if not polygon:
+                        continue
+                    coords = " ".join("%.2f,%.2f" % self.transform(x, y) for x, y in polygon)
+                    color = self.colors[i % len(self.colors)]
+                    f.write(f'    <polygon points="{coords}" fill="{color}" />\n')
                 f.write('  </g>\n')
 
                 # 3. Export des germes (Sites) uniquement
@@ -1,7 +1,17 @@
 import math
 import heapq
+import os
+import random
+import struct
+import sys
+from array import array
+from fractions import Fraction
 
+# Les classes du balayage déclarent __slots__ : sans dictionnaire par
+# instance, un million de germes tient en quelques centaines de Mo.
 class Point:
+    __slots__ = ('x', 'y')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -9,13 +19,24 @@ class Point:
         return f"Point({self.x}, {self.y})"
 
 class Arc:
+    __slots__ = ('site', 'left', 'right', 'event', 'edge_right',
+                 'parent', 'child_left', 'child_right', 'priority')
+
     def __init__(self, site, left=None, right=None):
         self.site = site
-        self.left = left
-        self.right = right
+        self.left = left    # Arc voisin à gauche sur la ligne de plage
+        self.right = right  # Arc voisin à droite
         self.event = None 
+        self.edge_right = None  # Arête tracée par le point de rupture avec self.right
+        # Noeud de l'arbre de recherche de BeachLine
+        self.parent = None
+        self.child_left = None
+        self.child_right = None
+        self.priority = random.random()
 
 class Event:
+    __slots__ = ('x', 'y', 'site', 'is_circle', 'center', 'arc', 'valid')
+
     def __init__(self, x, y, site=None, is_circle=False, center=None, arc=None):
         self.x = x
         self.y = y
@@ -30,10 +51,111 @@ class Event:
             return self.x < other.x
         return self.y > other.y
 
+# Compactage du tas des événements de cercle : dès que les événements
+# invalidés y sont majoritaires (et au moins COMPACTION_MIN)
+COMPACTION_MIN = 64
+
+class EventQueue:
+    """
+    File d'événements du balayage, du plus haut au plus bas (puis de gauche à
+    droite). Les germes sont triés une fois pour toutes ; seuls les
+    événements de cercle passent par un tas de tuples (-y, x, numéro, Event),
+    comparés sans appeler Event.__lt__.
+
+    Un événement invalidé reste dans le tas (suppression paresseuse) et est
+    sauté au moment de le dépiler ; le tas est reconstruit sans eux quand ils
+    deviennent majoritaires. Compteurs : pushed, invalidated, compactions et
+    peak_size (taille maximale du tas, événements invalides compris).
+    """
+
+    def __init__(self, sites):
+        self.sites = sorted(sites, key=lambda p: (-p.y, p.x))
+        self.next_site = 0
+        self.heap = []
+        self.invalid = 0
+        self.pushed = 0
+        self.invalidated = 0
+        self.compactions = 0
+        self.peak_size = 0
+
+    def __len__(self):
+        """Nombre d'événements encore valides."""
+        return len(self.sites) - self.next_site + len(self.heap) - self.invalid
+
+    def push(self, event):
+        heapq.heappush(self.heap, (-event.y, event.x, self.pushed, event))
+        self.pushed += 1
+        if len(self.heap) > self.peak_size:
+            self.peak_size = len(self.heap)
+
+    def invalidate(self, event):
+        event.valid = False
+        self.invalid += 1
+        self.invalidated += 1
+        if self.invalid >= COMPACTION_MIN and 2 * self.invalid > len(self.heap):
+            self.heap = [entry for entry in self.heap if entry[3].valid]
+            heapq.heapify(self.heap)
+            self.invalid = 0
+            self.compactions += 1
+
+    def pop(self):
+        """Prochain événement valide (un germe passe avant un cercle de même position)."""
+        heap = self.heap
+        while heap and not heap[0][3].valid:
+            heapq.heappop(heap)
+            self.invalid -= 1
+        if self.next_site < len(self.sites):
+            site = self.sites[self.next_site]
+            if not heap or (-site.y, site.x) <= heap[0][:2]:
+                self.next_site += 1
+                return Event(site.x, site.y, site=site)
+        return heapq.heappop(heap)[3]
+
+    @property
+    def invalidation_ratio(self):
+        """Part des événements de cercle invalidés avant d'être traités."""
+        return self.invalidated / self.pushed if self.pushed else 0.0
+
+    def stats(self):
+        return {
+            "pushed": self.pushed,
+            "invalidated": self.invalidated,
+            "invalidation_ratio": self.invalidation_ratio,
+            "compactions": self.compactions,
+            "peak_size": self.peak_size,
+        }
+
+# Fichiers binaires .vpts : format décrit dans Phase_1/Diagramme/PointsBinaires.py
+VPTS_MAGIC = b"VORPTS"
+VPTS_HEADER = struct.Struct("<6sBcQ")
+
+def is_binary_points_file(filename):
+    with open(filename, 'rb') as f:
+        return f.read(len(VPTS_MAGIC)) == VPTS_MAGIC
+
+def load_binary_points(filename):
+    """Charge les points d'un fichier binaire .vpts."""
+    with open(filename, 'rb') as f:
+        header = f.read(VPTS_HEADER.size)
+        if len(header) < VPTS_HEADER.size:
+            raise ValueError(f"En-tête binaire tronqué : {filename}")
+        magic, version, code, n = VPTS_HEADER.unpack(header)
+        if magic != VPTS_MAGIC or version != 1 or code not in (b'd', b'f'):
+            raise ValueError(f"En-tête binaire invalide : {filename}")
+        coords = array(code.decode())
+        if os.fstat(f.fileno()).st_size != VPTS_HEADER.size + 2 * coords.itemsize * n:
+            raise ValueError(f"Taille incohérente avec les {n} points annoncés : {filename}")
+        coords.fromfile(f, 2 * n)
+    if sys.byteorder == 'big':
+        coords.byteswap()
+    return [Point(x, y) for x, y in zip(coords[0::2], coords[1::2])]
+
 def load_points(filename):
-    """Charge les points depuis un fichier texte (format: x,y)."""
+    """Charge les points depuis un fichier texte (format: x,y) ou binaire (.vpts)."""
     points = []
     try:
+        if is_binary_points_file(filename):
+            return load_binary_points(filename)
         with open(filename, 'r') as f:
             for line in f:
                 line = line.strip()
@@ -44,77 +166,461 @@ def load_points(filename):
         print(f"Erreur de lecture : {e}")
     return points
 
+# Prédicat d'orientation adaptatif (Shewchuk) : le déterminant flottant n'est
+# accepté que s'il dépasse la borne d'erreur d'arrondi, sinon il est recalculé
+# exactement en rationnels (un flottant est une fraction dyadique exacte).
+EPSILON = 2.0 ** -53
+CCW_ERRBOUND = (3.0 + 16.0 * EPSILON) * EPSILON
+
+def orient2d(a, b, c):
+    """> 0 si a, b, c tournent dans le sens trigonométrique, < 0 dans le sens
+    horaire, 0 s'ils sont alignés. Le signe est toujours exact."""
+    detleft = (a.x - c.x) * (b.y - c.y)
+    detright = (a.y - c.y) * (b.x - c.x)
+    det = detleft - detright
+    if detleft > 0:
+        if detright <= 0:
+            return det
+        detsum = detleft + detright
+    elif detleft < 0:
+        if detright >= 0:
+            return det
+        detsum = -detleft - detright
+    else:
+        return det
+    if abs(det) > CCW_ERRBOUND * detsum:
+        return det
+    ax, ay, bx, by, cx, cy = map(Fraction, (a.x, a.y, b.x, b.y, c.x, c.y))
+    return (ax - cx) * (by - cy) - (ay - cy) * (bx - cx)
+
 def get_circumcircle(p1, p2, p3):
     x1, y1 = p1.x, p1.y
     x2, y2 = p2.x, p2.y
     x3, y3 = p3.x, p3.y
     d = 2 * (x1 * (y2 - y3) + x2 * (y3 - y1) + x3 * (y1 - y2))
-    if abs(d) < 1e-9: return None 
+    if d == 0 or orient2d(p1, p2, p3) == 0: return None
     cx = ((x1**2 + y1**2) * (y2 - y3) + (x2**2 + y2**2) * (y3 - y1) + (x3**2 + y3**2) * (y1 - y2)) / d
     cy = ((x1**2 + y1**2) * (x3 - x2) + (x2**2 + y2**2) * (x1 - x3) + (x3**2 + y3**2) * (x2 - x1)) / d
     radius = math.sqrt((x1 - cx)**2 + (y1 - cy)**2)
     return Point(cx, cy), cy - radius
 
+def get_breakpoint(left_site, right_site, sweep_y):
+    """Abscisse de l'intersection des paraboles de left_site et right_site
+    (dans cet ordre sur la ligne de plage) pour la ligne de balayage sweep_y."""
+    if abs(left_site.y - right_site.y) < 1e-9:
+        return (left_site.x + right_site.x) / 2.0
+    # Un site sur la ligne de balayage est une parabole dégénérée (demi-droite verticale)
+    if left_site.y == sweep_y: return left_site.x
+    if right_site.y == sweep_y: return right_site.x
+    h1, k1 = left_site.x, left_site.y
+    h2, k2 = right_site.x, right_site.y
+    a = 1.0/(2*(k1-sweep_y)) - 1.0/(2*(k2-sweep_y))
+    b = -h1/(k1-sweep_y) + h2/(k2-sweep_y)
+    c = (h1**2 + k1**2 - sweep_y**2)/(2*(k1-sweep_y)) - (h2**2 + k2**2 - sweep_y**2)/(2*(k2-sweep_y))
+    delta = b**2 - 4*a*c
+    return (-b + math.sqrt(max(0, delta))) / (2*a)
+
+class BeachLine:
+    """
+    Ligne de plage : liste doublement chaînée d'arcs (Arc.left / Arc.right)
+    doublée d'un arbre binaire de recherche équilibré (treap) dont l'ordre
+    infixe est l'ordre des arcs de gauche à droite.
+
+    Les clés ne sont pas stockées : les points de rupture dépendent de la
+    ligne de balayage, on les recalcule avec les voisins de chaque noeud
+    visité. La recherche, l'insertion et la suppression d'un arc coûtent
+    O(log n) en espérance (priorités aléatoires).
+    """
+
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        """Parcourt les arcs de gauche à droite."""
+        arc = self.root
+        while arc and arc.child_left:
+            arc = arc.child_left
+        while arc:
+            yield arc
+            arc = arc.right
+
+    def locate(self, x, sweep_y):
+        """Arc situé au-dessus de l'abscisse x (à gauche en cas d'égalité)."""
+        node = self.root
+        while node:
+            if node.left and x <= get_breakpoint(node.left.site, node.site, sweep_y):
+                child = node.child_left
+            elif node.right and x > get_breakpoint(node.site, node.right.site, sweep_y):
+                child = node.child_right
+            else:
+                return node
+            if child is None:
+                # Points de rupture incohérents à l'arrondi près : arc le plus proche
+                return node
+            node = child
+        return None
+
+    def insert_first(self, arc):
+        self.root = arc
+        self.size = 1
+
+    def insert_after(self, arc, new_arc):
+        """Insère new_arc juste à droite de arc, dans la liste et dans l'arbre."""
+        new_arc.left, new_arc.right = arc, arc.right
+        if arc.right: arc.right.left = new_arc
+        arc.right = new_arc
+        if arc.child_right is None:
+            arc.child_right = new_arc
+        else:
+            node = arc.child_right
+            while node.child_left:
+                node = node.child_left
+            node.child_left = new_arc
+            arc = node
+        new_arc.parent = arc
+        while new_arc.parent and new_arc.priority > new_arc.parent.priority:
+            self._rotate_up(new_arc)
+        self.size += 1
+
+    def remove(self, arc):
+        """Retire arc de la liste et de l'arbre."""
+        if arc.left: arc.left.right = arc.right
+        if arc.right: arc.right.left = arc.left
+        # On fait descendre l'arc jusqu'à une feuille en remontant son enfant prioritaire
+        while arc.child_left or arc.child_right:
+            if arc.child_right is None or (arc.child_left and arc.child_left.priority > arc.child_right.priority):
+                self._rotate_up(arc.child_left)
+            else:
+                self._rotate_up(arc.child_right)
+        self._replace(arc, None)
+        arc.parent = None
+        self.size -= 1
+
+    def _replace(self, node, child):
+        parent = node.parent
+        if parent is None:
+            self.root = child
+        elif parent.child_left is node:
+            parent.child_left = child
+        else:
+            parent.child_right = child
+        if child:
+            child.parent = parent
+
+    def _rotate_up(self, node):
+        parent = node.parent
+        self._replace(parent, node)
+        if parent.child_left is node:
+            parent.child_left = node.child_right
+            if node.child_right: node.child_right.parent = parent
+            node.child_right = parent
+        else:
+            parent.child_right = node.child_left
+            if node.child_left: node.child_left.parent = parent
+            node.child_left = parent
+        parent.parent = node
+
+# Marge de la boîte de découpage par défaut, en proportion de l'étendue des germes
+BBOX_MARGIN = 0.1
+
+def default_bbox(points):
+    """Boîte englobante des germes élargie de BBOX_MARGIN (au moins une unité)."""
+    if not points:
+        return 0.0, 1.0, 0.0, 1.0
+    xmin, xmax = min(p.x for p in points), max(p.x for p in points)
+    ymin, ymax = min(p.y for p in points), max(p.y for p in points)
+    mx = max((xmax - xmin) * BBOX_MARGIN, 1.0)
+    my = max((ymax - ymin) * BBOX_MARGIN, 1.0)
+    return xmin - mx, xmax + mx, ymin - my, ymax + my
+
+def clip_line(ox, oy, dx, dy, t0, t1, bbox):
+    """Découpage de Liang-Barsky du morceau (ox, oy) + t (dx, dy), t0 <= t <= t1
+    (bornes éventuellement infinies) par la boîte. Renvoie (t0, t1) ou None."""
+    xmin, xmax, ymin, ymax = bbox
+    for p, q in ((-dx, ox - xmin), (dx, xmax - ox), (-dy, oy - ymin), (dy, ymax - oy)):
+        if p == 0:
+            if q < 0: return None
+        elif p < 0:
+            t0 = max(t0, q / p)
+        else:
+            t1 = min(t1, q / p)
+    if t0 > t1 or math.isinf(t0) or math.isinf(t1):
+        return None
+    return t0, t1
+
+class VoronoiDiagram:
+    """
+    Diagramme de Voronoï découpé par une boîte, en tableaux plats (array) :
+
+    - vertices : x0, y0, x1, y1, ... (sommets de Voronoï dans la boîte,
+      points de sortie des arêtes et coins de la boîte) ;
+    - edges : début, fin de chaque arête (indices de sommets) et edge_sites :
+      germes à gauche et à droite de chaque arête ;
+    - cell_vertices[cell_offsets[i]:cell_offsets[i + 1]] : cycle de
+      demi-arêtes de la cellule du germe i, dans le sens trigonométrique ;
+      cell_neighbors donne, pour la demi-arête qui part de chaque sommet, le
+      germe voisin de l'autre côté (-1 le long de la boîte).
+
+    Une cellule qui ne rencontre pas la boîte est vide, de même que celle
+    de chaque copie d'un germe répété (seule la première a une cellule).
+    """
+
+    def __init__(self, bbox, vertices, edges, edge_sites, cell_offsets, cell_vertices, cell_neighbors):
+        self.bbox = bbox
+        self.vertices = vertices
+        self.edges = edges
+        self.edge_sites = edge_sites
+        self.cell_offsets = cell_offsets
+        self.cell_vertices = cell_vertices
+        self.cell_neighbors = cell_neighbors
+
+    def __len__(self):
+        return len(self.cell_offsets) - 1
+
+    def cell(self, i):
+        """Polygone de la cellule i : liste de (x, y)."""
+        v = self.vertices
+        return [(v[2 * k], v[2 * k + 1])
+                for k in self.cell_vertices[self.cell_offsets[i]:self.cell_offsets[i + 1]]]
+
 class VoronoiSolver:
     def __init__(self, points):
-        self.event_queue = []
-        for p in points:
-            heapq.heappush(self.event_queue, Event(p.x, p.y, site=p))
-        self.root = None
+        self.sites = list(points)
+        # Un germe répété ne passe qu'une fois dans le balayage : les copies
+        # suivantes auront une cellule vide dans diagram()
+        distinct = {}
+        for p in self.sites:
+            distinct.setdefault((p.x, p.y), p)
+        self.event_queue = EventQueue(list(distinct.values()))
+        self.beach_line = BeachLine()
         self.vertices = [] 
+        self.edges = []
+
+    def solve(self):
+        """Vide la file d'événements (balayage complet)."""
+        while self.event_queue:
+            event = self.event_queue.pop()
+            if event.site:
+                self.handle_site_event(event.site, event.y)
+            else:
+                self.handle_circle_event(event, event.y)
+        return self
 
     def check_circle_event(self, arc, sweep_y):
-        if arc.event: arc.event.valid = False
+        if arc.event:
+            self.event_queue.invalidate(arc.event)
+            arc.event = None
         if not arc.left or not arc.right: return
+        # L'arc ne disparaît que si ses deux points de rupture convergent,
+        # c'est-à-dire si (gauche, arc, droite) tourne dans le sens horaire.
+        if orient2d(arc.left.site, arc.site, arc.right.site) >= 0: return
         res = get_circumcircle(arc.left.site, arc.site, arc.right.site)
         if res:
             center, event_y = res
             if event_y <= sweep_y:
                 new_event = Event(center.x, event_y, is_circle=True, center=center, arc=arc)
                 arc.event = new_event
-                heapq.heappush(self.event_queue, new_event)
+                self.event_queue.push(new_event)
 
     def handle_site_event(self, site, sweep_y):
-        if not self.root:
-            self.root = Arc(site)
+        if not self.beach_line.root:
+            self.beach_line.insert_first(Arc(site))
+            return
+        curr = self.beach_line.locate(site.x, sweep_y)
+        new_arc = Arc(site)
+        if curr.site.y == sweep_y:
+            # Germes de même ordonnée en haut du diagramme (traités de gauche à
+            # droite) : l'arc rencontré est une demi-droite verticale, le
+            # nouvel arc se place à sa droite sans le couper.
+            self.beach_line.insert_after(curr, new_arc)
+            new_arc.edge_right = curr.edge_right
+            curr.edge_right = self._new_edge(None, curr.site, site)
             return
-        curr = self.root
-        while curr.right:
-            x_inter = self.get_breakpoint(curr.site, curr.right.site, sweep_y)
-            if site.x > x_inter: curr = curr.right
-            else: break
-        old_right = curr.right
-        new_arc = Arc(site, left=curr)
-        split_arc = Arc(curr.site, left=new_arc, right=old_right)
-        new_arc.right = split_arc
-        curr.right = new_arc
-        if old_right: old_right.left = split_arc
+        split_arc = Arc(curr.site)
+        self.beach_line.insert_after(curr, new_arc)
+        self.beach_line.insert_after(new_arc, split_arc)
+        # Les deux points de rupture tracent la même arête dans des sens
+        # opposés : (curr, new_arc) finit en p2, (new_arc, split_arc) en p1.
+        split_arc.edge_right = curr.edge_right
+        curr.edge_right = new_arc.edge_right = self._new_edge(None, curr.site, site)
         self.check_circle_event(curr, sweep_y)
         self.check_circle_event(split_arc, sweep_y)
 
     def handle_circle_event(self, event, sweep_y):
         if not event.valid: return
-        self.vertices.append(event.center)
+        center = event.center
+        self.vertices.append(center)
         arc = event.arc
-        if arc.left: arc.left.right = arc.right
-        if arc.right: arc.right.left = arc.left
+        self.beach_line.remove(arc)
+        left, right = arc.left, arc.right
+        self._finish_edge(left.edge_right, left.site, center)
+        self._finish_edge(arc.edge_right, arc.site, center)
+        left.edge_right = self._new_edge(center, left.site, right.site)
         if arc.left: self.check_circle_event(arc.left, sweep_y)
         if arc.right: self.check_circle_event(arc.right, sweep_y)
 
+    def _new_edge(self, start, site_left, site_right):
+        edge = Edge(start, None, site_left, site_right)
+        self.edges.append(edge)
+        return edge
+
+    def _finish_edge(self, edge, left_site, vertex):
+        # Le point de rupture dont l'arc gauche porte site_left avance vers p2
+        if left_site is edge.site_left:
+            edge.p2 = vertex
+        else:
+            edge.p1 = vertex
+
     def get_breakpoint(self, left_site, right_site, sweep_y):
-        if abs(left_site.y - right_site.y) < 1e-9:
-            return (left_site.x + right_site.x) / 2.0
-        h1, k1 = left_site.x, left_site.y
-        h2, k2 = right_site.x, right_site.y
-        a = 1.0/(2*(k1-sweep_y)) - 1.0/(2*(k2-sweep_y))
-        b = -h1/(k1-sweep_y) + h2/(k2-sweep_y)
-        c = (h1**2 + k1**2 - sweep_y**2)/(2*(k1-sweep_y)) - (h2**2 + k2**2 - sweep_y**2)/(2*(k2-sweep_y))
-        delta = b**2 - 4*a*c
-        return (-b + math.sqrt(max(0, delta))) / (2*a)
+        return get_breakpoint(left_site, right_site, sweep_y)
+
+    def diagram(self, bbox=None):
+        """
+        Diagramme complet découpé par bbox = (xmin, xmax, ymin, ymax), par
+        défaut default_bbox(germes). À appeler après solve().
+        """
+        bbox = bbox or default_bbox(self.sites)
+        xmin, xmax, ymin, ymax = bbox
+        index = {}
+        for i, p in enumerate(self.sites):
+            index.setdefault(id(p), i)
+        vertices = array('d')
+        vertex_ids = {}
+
+        def add_vertex(x, y):
+            vertices.append(x)
+            vertices.append(y)
+            return len(vertices) // 2 - 1
+
+        def vertex(p):
+            if id(p) not in vertex_ids:
+                vertex_ids[id(p)] = add_vertex(p.x, p.y)
+            return vertex_ids[id(p)]
+
+        # Arêtes découpées ; l'arête k donne la demi-arête 2k (début -> fin) à
+        # la cellule du germe droit et 2k + 1 (fin -> début) à celle du gauche
+        edges, edge_sites = array('q'), array('q')
+        for e in self.edges:
+            a, b = e.site_left, e.site_right
+            # Sens de parcours de p1 vers p2 : le germe droit est à gauche
+            dx, dy = b.y - a.y, a.x - b.x
+            if e.p1 and e.p2:
+                ox, oy, dx, dy, lo, hi = e.p1.x, e.p1.y, e.p2.x - e.p1.x, e.p2.y - e.p1.y, 0.0, 1.0
+            elif e.p1:
+                ox, oy, lo, hi = e.p1.x, e.p1.y, 0.0, math.inf
+            elif e.p2:
+                ox, oy, lo, hi = e.p2.x, e.p2.y, -math.inf, 0.0
+            else:
+                ox, oy, lo, hi = (a.x + b.x) / 2, (a.y + b.y) / 2, -math.inf, math.inf
+            clipped = clip_line(ox, oy, dx, dy, lo, hi, bbox)
+            if clipped is None:
+                continue
+            t0, t1 = clipped
+            start = vertex(e.p1) if e.p1 and t0 == lo else add_vertex(ox + t0 * dx, oy + t0 * dy)
+            end = vertex(e.p2) if e.p2 and t1 == hi else add_vertex(ox + t1 * dx, oy + t1 * dy)
+            edges.extend((start, end))
+            edge_sites.extend((index[id(a)], index[id(b)]))
+        del index, vertex_ids
+
+        # Regroupement des demi-arêtes par cellule (tableaux décalages + indices)
+        n = len(self.sites)
+        starts = array('q', [0]) * (n + 1)
+        for i in edge_sites:
+            starts[i + 1] += 1
+        for i in range(n):
+            starts[i + 1] += starts[i]
+        fill = array('q', starts)
+        by_cell = array('q', [0]) * len(edge_sites)
+        for h in range(len(edge_sites)):
+            cell = edge_sites[h ^ 1]
+            by_cell[fill[cell]] = h
+            fill[cell] += 1
+        del fill
+
+        corners = []
+
+        def corner(k):
+            if not corners:
+                corners.extend(add_vertex(x, y) for x, y in
+                               ((xmin, ymin), (xmax, ymin), (xmax, ymax), (xmin, ymax)))
+            return corners[k % 4]
+
+        def perimeter(k):
+            # Abscisse curviligne sur le bord de la boîte, dans le sens
+            # trigonométrique depuis (xmin, ymin), chaque côté valant 1
+            x, y = vertices[2 * k], vertices[2 * k + 1]
+            w, h = (xmax - xmin) or 1.0, (ymax - ymin) or 1.0
+            side = min((y - ymin, 0), (xmax - x, 1), (ymax - y, 2), (x - xmin, 3))[1]
+            return (((x - xmin) / w, 1 + (y - ymin) / h, 2 + (xmax - x) / w, 3 + (ymax - y) / h)[side]) % 4
+
+        cell_offsets, cell_vertices, cell_neighbors = array('q', [0]), array('q'), array('q')
+        owner = -1
+        if not edges and self.sites:
+            # Aucune arête dans la boîte : elle est entière dans une seule cellule
+            cx, cy = (xmin + xmax) / 2, (ymin + ymax) / 2
+            owner = min(range(n), key=lambda i: (self.sites[i].x - cx)**2 + (self.sites[i].y - cy)**2)
+        for i in range(n):
+            if i == owner:
+                cell_vertices.extend(corner(k) for k in range(4))
+                cell_neighbors.extend([-1] * 4)
+            elif starts[i] < starts[i + 1]:
+                # Demi-arête h : de edges[h] à edges[h ^ 1], voisin edge_sites[h]
+                hes = [(edges[h], edges[h ^ 1], edge_sites[h])
+                       for h in by_cell[starts[i]:starts[i + 1]]]
+                cycle = self._cell_cycle(hes, perimeter, corner)
+                cell_vertices.extend(v for v, _ in cycle)
+                cell_neighbors.extend(nb for _, nb in cycle)
+            cell_offsets.append(len(cell_vertices))
+        return VoronoiDiagram(bbox, vertices, edges, edge_sites, cell_offsets, cell_vertices, cell_neighbors)
+
+    def _cell_cycle(self, half_edges, perimeter, corner):
+        """Enchaîne les demi-arêtes d'une cellule en un cycle [(sommet, voisin)].
+        Les chaînes coupées par la boîte sont reliées en longeant son bord."""
+        succ = {origin: (end, nb) for origin, end, nb in half_edges}
+        ends = {end for _, end, _ in half_edges}
+        heads = [origin for origin in succ if origin not in ends]
+        if not heads:
+            heads = [half_edges[0][0]]
+        chains = []
+        for head in heads:
+            chain, v = [], head
+            while v in succ:
+                end, nb = succ.pop(v)
+                chain.append((v, nb))
+                v = end
+            chains.append((chain, v))
+        if len(chains) == 1 and chains[0][1] == heads[0]:
+            return chains[0][0]
+
+        cycle = []
+        remaining = chains[1:]
+        chain, tail = chains[0]
+        first_head = perimeter(heads[0])
+        while True:
+            cycle.extend(chain)
+            t_tail = perimeter(tail)
+            candidates = [((perimeter(c[0][0][0]) - t_tail) % 4, k) for k, c in enumerate(remaining)]
+            gap_first = (first_head - t_tail) % 4
+            best = min(candidates) if candidates else None
+            gap = best[0] if best and best[0] < gap_first else gap_first
+            cycle.append((tail, -1))
+            k = 1
+            while math.floor(t_tail) + k - t_tail < gap:
+                cycle.append((corner(math.floor(t_tail) + k), -1))
+                k += 1
+            if gap == gap_first:
+                return cycle
+            chain, tail = remaining.pop(best[1])
     
 class Edge:
+    __slots__ = ('p1', 'p2', 'site_left', 'site_right')
+
     def __init__(self, p1, p2, site_left, site_right):
         self.p1 = p1  # Sommet de départ
         self.p2 = p2  # Sommet d'arrivée (None si infini au début)
         self.site_left = site_left
-        self.site_right = site_right
\ No newline at end of file
+        self.site_right = site_right